@@ -0,0 +1,6 @@
+"""Antel scraper core shared by the integration and the add-on.
+
+This directory is the single source of truth. The add-on image is built from
+antel_addon/ only, so antel_addon/antel_pkg is a verbatim copy kept in sync
+by scripts/sync_antel_pkg.py; edit the files here, never the copy.
+"""
@@ -5,15 +5,59 @@ import asyncio
 import logging
 import re
 import time
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Any
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field, fields, replace
+from datetime import date
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from . import backends
+from .artifacts import ArtifactStore
+from .auth import HttpAuthenticator
+from .backends import PersistentProfileBackend, PlaywrightBackend, ScraperBackend
+from .cache import ResponseCache, content_hash
+from .const import (
+    ANTEL_BASE_URL,
+    ANTEL_CONSUMO_INTERNET_URL,
+    ANTEL_HOME_URL,
+    ANTEL_LOGIN_URL,
+    BROWSER_CLOSE_TIMEOUT,
+)
+from .dates import parse_cycle, parse_date
+from .deadline import DEFAULT_SCRAPE_DEADLINE, Deadline
+from .exceptions import (
+    AntelAuthError,
+    AntelConnectionError,
+    AntelScraperError,
+)
+from .instrumentation import Instrumentation
+from .memory import MemoryGovernor
+from .parsing import (
+    extract_from_text,
+    html_to_text,
+    list_services,
+    parse_data_value,
+    provenance,
+    select_service_card_html,
+)
+from .profile import HttpCacheStats
+from .session import SessionStore
+from .singleflight import SingleFlight
+from .sniffer import NetworkSniffer
+from .topups import TopupStore, TopupSync
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Frame, Locator, Page, Route
 
-from playwright.async_api import async_playwright, Browser, Page, Playwright, TimeoutError as PlaywrightTimeout
+_LOGGER = logging.getLogger(__name__)
 
-from .const import ANTEL_BASE_URL, ANTEL_CONSUMO_INTERNET_URL, ANTEL_LOGIN_URL
+# Results younger than this are served to new callers without a scrape
+DEFAULT_FRESHNESS = 30
+# Past the deadline, calls time out within ms; only a hung driver needs more
+_WATCHDOG_GRACE = 15
 
-_LOGGER = logging.getLogger(__name__)
+# Never needed to read the values; skipped when resource blocking is on
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
 
 
 @dataclass
@@ -28,75 +72,241 @@ class AntelConsumoData:
     billing_period: str | None = None
     topup_balance_gb: float | None = None
     topup_expiration_date: str | None = None
-    raw_data: dict[str, Any] | None = None
-
-
-class AntelScraperError(Exception):
-    """Base exception for Antel scraper."""
-
-
-class AntelAuthError(AntelScraperError):
-    """Authentication error."""
-
+    # Active top-ups from the recargas view, soonest expiry first
+    topups: list[dict[str, Any]] | None = None
+    # ISO dates parsed from the texts above
+    billing_period_start: str | None = None
+    billing_period_end: str | None = None
+    topup_expires_on: str | None = None
+    # Excluded from equality: a refresh returning the same values compares equal
+    raw_data: dict[str, Any] | None = field(default=None, compare=False)
+    fetched_at: float | None = field(default=None, compare=False)
+    content_hash: str | None = field(default=None, compare=False)
+    # Field name -> {"source", "matcher", "confidence"}
+    provenance: dict[str, dict[str, Any]] | None = field(default=None, compare=False)
+
+    # Fields a scrape must produce; the rest are legitimately absent at times
+    CORE_FIELDS: ClassVar[tuple[str, ...]] = ("used_data_gb", "total_data_gb", "remaining_data_gb")
+
+    @property
+    def confidence(self) -> float:
+        """Return the lowest confidence among the core fields (0 if missing)."""
+        sources = self.provenance or {}
+        return min(
+            sources.get(name, {}).get("confidence", 0.0) if getattr(self, name) is not None else 0.0
+            for name in self.CORE_FIELDS
+        )
 
-class AntelConnectionError(AntelScraperError):
-    """Connection error."""
+    def missing_fields(self) -> list[str]:
+        """Return the core fields that have no value."""
+        return [name for name in self.CORE_FIELDS if getattr(self, name) is None]
+
+    def merge(self, other: AntelConsumoData) -> list[str]:
+        """Fill fields missing here from other; return the names filled."""
+        filled = []
+        for item in fields(self):
+            if not item.compare or getattr(self, item.name) is not None:
+                continue
+            value = getattr(other, item.name)
+            source = (other.provenance or {}).get(item.name, {}).get("source")
+            # Derived values are recomputed from the merged inputs instead
+            if value is None or source == "derived":
+                continue
+            setattr(self, item.name, value)
+            filled.append(item.name)
+            if other.provenance and item.name in other.provenance:
+                self.provenance = self.provenance or {}
+                self.provenance[item.name] = other.provenance[item.name]
+        return filled
+
+    def changed_fields(self, other: AntelConsumoData | None) -> set[str]:
+        """Return the compared fields whose value differs from other's."""
+        return {
+            item.name
+            for item in fields(self)
+            if item.compare
+            and (other is None or getattr(self, item.name) != getattr(other, item.name))
+        }
+
+    def parse_dates(self, today: date | None = None) -> None:
+        """Fill the ISO date fields from billing_period and topup_expiration_date."""
+        if cycle := parse_cycle(self.billing_period, today):
+            self.billing_period_start, self.billing_period_end = (day.isoformat() for day in cycle)
+        if expires := parse_date(self.topup_expiration_date, today):
+            self.topup_expires_on = expires.isoformat()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> AntelConsumoData:
+        """Build an instance from as_dict() output, ignoring unknown keys."""
+        names = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
 
 
 class AntelScraper:
-    """Scraper for Antel consumption data using Playwright."""
-
-    def __init__(self, username: str, password: str, service_id: str | None = None) -> None:
-        """Initialize the scraper."""
+    """Scraper for Antel consumption data.
+
+    Scrapes are coalesced per account across all instances in the process:
+    the coordinator, a manual entity update and a config flow validating the
+    same credentials share one in-flight scrape (and its SSO login) instead
+    of each opening a browser context.
+    """
+
+    _flights: ClassVar[SingleFlight[AntelConsumoData]] = SingleFlight()
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        service_id: str | None = None,
+        artifact_store: ArtifactStore | None = None,
+        backend: ScraperBackend | None = None,
+        session_store: SessionStore | None = None,
+        instrumentation: Instrumentation | None = None,
+        memory_governor: MemoryGovernor | None = None,
+        http_login: bool = True,
+        response_cache: ResponseCache | None = None,
+        sniff_network: bool = True,
+        topup_store: TopupStore | None = None,
+        http_fetch: bool = True,
+        block_resources: bool = False,
+        reuse_browser: bool = True,
+        freshness: float = DEFAULT_FRESHNESS,
+        deadline: float = DEFAULT_SCRAPE_DEADLINE,
+        local_today: Callable[[], date] = date.today,
+    ) -> None:
+        """Initialize the scraper.
+
+        local_today returns the date in the user's timezone, which dates
+        without a year and top-up expiry are judged against.
+        """
         self._username = username
         self._password = password
-        self._service_id = service_id
-        self._browser: Browser | None = None
-        self._playwright: Playwright | None = None
-
-    async def _ensure_browser(self) -> Browser:
-        """Ensure browser is available."""
-        if self._browser is None or not self._browser.is_connected():
-            self._playwright = await async_playwright().start()
-            self._browser = await self._playwright.chromium.launch(
-                headless=True,
-                args=[
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-gpu",
-                ]
+        self._artifacts = artifact_store
+        self._backend = backend or PlaywrightBackend()
+        self._session = session_store or SessionStore()
+        self.metrics = instrumentation or Instrumentation()
+        self._governor = memory_governor or MemoryGovernor()
+        self._governor.bind(self.metrics)
+        self._http_login = http_login
+        self._freshness = freshness
+        self._local_today = local_today
+        self._deadline_budget = deadline
+        self._deadline: Deadline | None = None
+        # True while the account's flight runs this instance's scrape
+        self._owns_flight = False
+        self._cache = response_cache or ResponseCache()
+        self._cache.bind(self.metrics)
+        self._sniffer = (
+            NetworkSniffer(
+                self._session, self._extract_from_html, self.metrics, self._fill_derived
             )
-        return self._browser
+            if sniff_network
+            else None
+        )
+        self.topups = (
+            TopupSync(self._backend, topup_store, self.metrics) if topup_store else None
+        )
+        self._service_id: str | None = None
+        self.configure(
+            service_id=service_id,
+            http_fetch=http_fetch,
+            block_resources=block_resources,
+            reuse_browser=reuse_browser,
+        )
+
+    @property
+    def service_id(self) -> str | None:
+        """Return the service whose card is scraped (None: the first Fibra)."""
+        return self._service_id
+
+    def configure(
+        self,
+        service_id: str | None = None,
+        http_fetch: bool = True,
+        block_resources: bool = False,
+        reuse_browser: bool = True,
+    ) -> None:
+        """Change what to scrape and how; takes effect on the next scrape.
+
+        http_fetch tries the browser-free session fetch and login first;
+        block_resources skips images, media and fonts in the browser;
+        without reuse_browser Chromium is closed after every scrape.
+        """
+        if (service_id or None) != self._service_id:
+            # The cached result and its validators belong to the old card
+            self._cache.clear()
+            self._flights.forget(self._flight_key)
+            self._session.hints.pop("endpoints", None)
+        self._service_id = service_id or None
+        if self._sniffer is not None:
+            self._sniffer.service_id = self._service_id
+        self._http_fetch = http_fetch
+        self._block_resources = block_resources
+        self._reuse_browser = reuse_browser
+
+    def _ms(self, cap_ms: float) -> float:
+        """Return a Playwright timeout: cap_ms, or the scrape's time left if shorter."""
+        if self._deadline is None:
+            return cap_ms
+        return self._deadline.timeout_ms(cap_ms)
+
+    def _mark(self, step: str) -> None:
+        """Record the scrape step, for the watchdog's overrun report."""
+        if self._deadline is not None:
+            self._deadline.mark(step)
+
+    @asynccontextmanager
+    async def browser_context(self, **kwargs: Any) -> AsyncIterator[BrowserContext]:
+        """Yield a browser context of the backend, released on exit.
+
+        For scripts driving the page themselves; works with every backend,
+        including the persistent profile, which has no shared Browser.
+        """
+        context = await self._backend.new_context(**kwargs)
+        try:
+            yield context
+        finally:
+            await self._backend.release_context(context)
 
     async def close(self) -> None:
-        """Close browser and playwright runtime."""
-        if self._browser:
-            try:
-                await self._browser.close()
-            except Exception:
-                pass
-            self._browser = None
-        if self._playwright:
-            try:
-                await self._playwright.stop()
-            except Exception:
-                pass
-            self._playwright = None
+        """Close browser and playwright runtime.
+
+        A scrape of ours still running (its waiters timed out or were
+        cancelled) is cancelled and awaited first, so it never drives a
+        backend being torn down.
+        """
+        if self._owns_flight:
+            await self._flights.async_cancel(
+                self._flight_key, BROWSER_CLOSE_TIMEOUT + _WATCHDOG_GRACE
+            )
+        await self._backend.close()
+
+    async def _capture_artifacts(self, page: Page, error_type: str) -> None:
+        """Save failure artifacts if an artifact store is configured."""
+        if self._artifacts is None:
+            return
+        try:
+            await self._artifacts.async_capture(page, error_type)
+        except Exception as err:
+            _LOGGER.debug("Could not save %s artifacts: %s", error_type, err)
 
     async def _login(self, page: Page) -> bool:
         """Perform login on Antel page."""
         try:
             _LOGGER.debug("Navigating to Antel login page")
             try:
-                await page.goto(ANTEL_LOGIN_URL, wait_until="domcontentloaded", timeout=120000)
-            except PlaywrightTimeout:
-                await page.goto(ANTEL_LOGIN_URL, wait_until="commit", timeout=120000)
+                await page.goto(ANTEL_LOGIN_URL, wait_until="domcontentloaded", timeout=self._ms(120000))
+            except backends.PlaywrightTimeout:
+                await page.goto(ANTEL_LOGIN_URL, wait_until="commit", timeout=self._ms(120000))
 
             # Select TuID method: Usuario y contraseña
             try:
-                await page.get_by_role("link", name="Usuario y contraseña").click(timeout=30000)
-                await page.wait_for_load_state("domcontentloaded", timeout=30000)
+                await page.get_by_role("link", name="Usuario y contraseña").click(timeout=self._ms(30000))
+                await page.wait_for_load_state("domcontentloaded", timeout=self._ms(30000))
             except Exception:
                 pass
 
@@ -116,58 +326,20 @@ class AntelScraper:
                 ).first
 
             try:
-                await username_input.wait_for(state="visible", timeout=40000)
+                await username_input.wait_for(state="visible", timeout=self._ms(40000))
             except Exception as err:
                 raise AntelAuthError("Could not find username input field") from err
 
             await username_input.fill(self._username)
 
             try:
-                await page.get_by_role("button", name="Continuar").click(timeout=30000)
-                await page.wait_for_load_state("domcontentloaded", timeout=40000)
+                await page.get_by_role("button", name="Continuar").click(timeout=self._ms(30000))
+                await page.wait_for_load_state("domcontentloaded", timeout=self._ms(40000))
             except Exception as err:
                 raise AntelAuthError("Could not submit username") from err
 
             # Step 2: Password
-            password_input = None
-            timeout_ms = 60000
-            start = asyncio.get_event_loop().time()
-            while asyncio.get_event_loop().time() - start < timeout_ms / 1000:
-                try:
-                    password_input = page.get_by_role("textbox", name="Contraseña")
-                except Exception:
-                    password_input = None
-
-                if password_input is None:
-                    password_input = page.locator('input[type="password"]').first
-
-                try:
-                    await password_input.wait_for(state="visible", timeout=2000)
-                    break
-                except Exception:
-                    password_input = None
-
-                for frame in page.frames:
-                    try:
-                        candidate = frame.get_by_role("textbox", name="Contraseña")
-                        await candidate.wait_for(state="visible", timeout=1000)
-                        password_input = candidate
-                        break
-                    except Exception:
-                        pass
-
-                    try:
-                        candidate = frame.locator('input[type="password"]').first
-                        await candidate.wait_for(state="visible", timeout=1000)
-                        password_input = candidate
-                        break
-                    except Exception:
-                        pass
-
-                if password_input:
-                    break
-
-                await asyncio.sleep(0.5)
+            password_input = await self._find_password_input(page, timeout=self._ms(60000))
 
             if password_input is None:
                 raise AntelAuthError("Could not find password input field")
@@ -175,29 +347,21 @@ class AntelScraper:
             await password_input.fill(self._password)
 
             try:
-                await page.get_by_role("button", name="Continuar").click(timeout=30000)
+                await page.get_by_role("button", name="Continuar").click(timeout=self._ms(30000))
             except Exception as err:
                 raise AntelAuthError("Could not submit password") from err
 
             try:
-                await page.wait_for_load_state("networkidle", timeout=60000)
-            except PlaywrightTimeout:
+                await page.wait_for_load_state("networkidle", timeout=self._ms(60000))
+            except backends.PlaywrightTimeout:
                 pass
 
             _LOGGER.debug("Login successful")
             return True
 
-        except PlaywrightTimeout as err:
+        except backends.PlaywrightTimeout as err:
             _LOGGER.error("Timeout during login: %s", err)
-            try:
-                artifacts_dir = Path("/root/src/hacs-antel/artifacts")
-                artifacts_dir.mkdir(parents=True, exist_ok=True)
-                stamp = int(time.time())
-                await page.screenshot(path=str(artifacts_dir / f"antel_login_timeout_{stamp}.png"), full_page=True)
-                html = await page.content()
-                (artifacts_dir / f"antel_login_timeout_{stamp}.html").write_text(html, encoding="utf-8")
-            except Exception:
-                pass
+            await self._capture_artifacts(page, "login_timeout")
             raise AntelConnectionError("Timeout connecting to Antel") from err
         except AntelAuthError:
             raise
@@ -205,314 +369,801 @@ class AntelScraper:
             _LOGGER.error("Error during login: %s", err)
             raise AntelScraperError(f"Login error: {err}") from err
 
-    def _parse_data_value(self, text: str) -> float | None:
-        """Parse data value from text (e.g., '15.5 GB' -> 15.5)."""
-        if not text:
+    @staticmethod
+    def _password_candidates(frame: Frame) -> list[tuple[str, Locator]]:
+        """Return the locators that may match the password field in a frame."""
+        return [
+            ("role", frame.get_by_role("textbox", name="Contraseña")),
+            ("css", frame.locator('input[type="password"]').first),
+        ]
+
+    @staticmethod
+    def _frame_key(page: Page, frame: Frame) -> str:
+        """Identify a frame across runs (its URL without the query string)."""
+        if frame is page.main_frame:
+            return "main"
+        return frame.url.split("?", 1)[0]
+
+    async def _find_password_input(self, page: Page, timeout: float) -> Locator | None:
+        """Race every password locator in every frame and return the first visible.
+
+        Frames attached while waiting are probed as well. The winning frame and
+        selector are remembered so the next login tries them alone first.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+        hint = self._session.hints.get("password")
+
+        if hint:
+            for frame in page.frames:
+                if self._frame_key(page, frame) != hint.get("frame"):
+                    continue
+                for name, locator in self._password_candidates(frame):
+                    if name != hint.get("selector"):
+                        continue
+                    try:
+                        await locator.wait_for(state="visible", timeout=self._ms(5000))
+                    except Exception:
+                        break
+                    self.metrics.incr("password_hint_hit")
+                    return locator
+            self.metrics.incr("password_hint_miss")
+
+        probes: dict[asyncio.Future, tuple[str, str, Locator]] = {}
+        seen: set[Frame] = set()
+        frames_changed = asyncio.Event()
+
+        def probe(frame: Frame) -> None:
+            if frame in seen:
+                return
+            seen.add(frame)
+            # At least 1 ms: Playwright reads 0 as "no timeout"
+            remaining_ms = max(1.0, (deadline - loop.time()) * 1000)
+            for name, locator in self._password_candidates(frame):
+                task = asyncio.ensure_future(
+                    locator.wait_for(state="visible", timeout=remaining_ms)
+                )
+                probes[task] = (self._frame_key(page, frame), name, locator)
+            frames_changed.set()
+
+        for frame in page.frames:
+            probe(frame)
+        page.on("frameattached", probe)
+
+        try:
+            while probes:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                frames_changed.clear()
+                wakeup = asyncio.ensure_future(frames_changed.wait())
+                try:
+                    done, _ = await asyncio.wait(
+                        [*probes, wakeup],
+                        timeout=remaining,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                finally:
+                    wakeup.cancel()
+
+                for task in done:
+                    if task is wakeup:
+                        continue
+                    frame_key, name, locator = probes.pop(task)
+                    if task.exception() is None:
+                        _LOGGER.debug("Password field found in %s via %s", frame_key, name)
+                        self._session.hints["password"] = {"frame": frame_key, "selector": name}
+                        return locator
             return None
+        finally:
+            page.remove_listener("frameattached", probe)
+            for task in probes:
+                task.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
 
-        # Remove whitespace and normalize
-        text = text.strip().upper()
-
-        # Try to extract number and unit
-        match = re.search(r'([\d.,]+)\s*(GB|MB|TB|KB)?', text, re.IGNORECASE)
-        if match:
-            value = float(match.group(1).replace(',', '.'))
-            unit = match.group(2) or 'GB'
-
-            # Convert to GB
-            if unit == 'TB':
-                return value * 1024
-            elif unit == 'MB':
-                return value / 1024
-            elif unit == 'KB':
-                return value / (1024 * 1024)
-            else:  # GB
-                return value
+    def _parse_data_value(self, text: str) -> float | None:
+        """Parse data value from text (e.g., '15.5 GB' -> 15.5)."""
+        return parse_data_value(text)
+
+    @staticmethod
+    def _fill_derived(data: AntelConsumoData) -> None:
+        """Calculate remaining and percentage if needed."""
+        if data.used_data_gb is None or data.total_data_gb is None:
+            return
+        sources = data.provenance = data.provenance or {}
+        # A derived value is only as trustworthy as the values it came from
+        confidence = min(
+            sources.get(name, {}).get("confidence", 0.0)
+            for name in ("used_data_gb", "total_data_gb")
+        )
 
+        if data.remaining_data_gb is None:
+            data.remaining_data_gb = data.total_data_gb - data.used_data_gb
+            sources["remaining_data_gb"] = provenance("derived", "total - used", confidence)
+
+        if data.total_data_gb > 0:
+            data.percentage_used = (data.used_data_gb / data.total_data_gb) * 100
+            sources["percentage_used"] = provenance("derived", "used / total", confidence)
+
+    def _select_card_html(self, html: str) -> str:
+        """Return the service card's HTML, or the whole page if there is none."""
+        filter_text = self._service_id if self._service_id else "Fibra"
+        return select_service_card_html(html, filter_text) or html
+
+    def _extract_from_html(self, html: str) -> AntelConsumoData:
+        """Extract consumption data from page HTML without a browser."""
+        filter_text = self._service_id if self._service_id else "Fibra"
+        card_html = select_service_card_html(html, filter_text)
+        card_text = html_to_text(card_html) if card_html else None
+        body_text = html_to_text(html)
+
+        values, raw_data, sources = extract_from_text(card_text, body_text)
+        data = AntelConsumoData(**values, provenance=sources)
+        self._fill_derived(data)
+        raw_data["card_text_sample"] = card_text[:500] if card_text else None
+        raw_data["body_text_sample"] = body_text[:1000] if body_text else None
+        data.raw_data = raw_data
+        return data
+
+    @staticmethod
+    async def _text_of(locator: Locator, timeout: float = 5000) -> str | None:
+        """Return a locator's text, or None if it is absent or unreadable."""
+        try:
+            if await locator.count():
+                return await locator.text_content(timeout=timeout) or ""
+        except Exception as err:
+            _LOGGER.debug("Could not read locator text: %s", err)
         return None
 
     async def _extract_consumption_data(self, page: Page) -> AntelConsumoData:
-        """Extract consumption data from the page."""
-        data = AntelConsumoData()
+        """Extract consumption data from the page.
+
+        Each field is read independently and records its provenance, so a
+        failure only leaves that field missing for the retry planner.
+        """
+        data = AntelConsumoData(provenance={})
         raw_data: dict[str, Any] = {}
+        sources = data.provenance
 
         try:
-            await page.wait_for_load_state("networkidle", timeout=30000)
-            await asyncio.sleep(2)
+            await page.wait_for_load_state("networkidle", timeout=self._ms(30000))
+        except Exception:
+            pass
+        await asyncio.sleep(2)
 
-            filter_text = self._service_id if self._service_id else "Fibra"
-            service_cards = page.locator(".servicioBox")
+        filter_text = self._service_id if self._service_id else "Fibra"
+        service_cards = page.locator(".servicioBox")
+        try:
             cards_count = await service_cards.count()
             _LOGGER.info("Service cards found: %s (filter: %s)", cards_count, filter_text)
             service_card = service_cards.filter(
-                has_text=re.compile(filter_text, re.I)
+                has_text=re.compile(re.escape(filter_text), re.I)
             ).first
             if await service_card.count() == 0:
                 _LOGGER.warning("No service card matched '%s', using first available", filter_text)
                 service_card = service_cards.first
             else:
                 _LOGGER.info("Matched service card for '%s'", filter_text)
+        except Exception as err:
+            _LOGGER.error("Error locating service card: %s", err)
+            service_card = service_cards.first
+
+        # Remaining data ("Me quedan")
+        value_text = await self._text_of(service_card.locator("span.value-data").first)
+        if value_text is not None:
+            unit_text = await self._text_of(service_card.locator("span.value-data + small").first)
+            remaining_text = f"{value_text} {unit_text or ''}".strip()
+            raw_data["remaining_text"] = remaining_text
+            data.remaining_data_gb = self._parse_data_value(remaining_text)
+            if data.remaining_data_gb is not None:
+                sources["remaining_data_gb"] = provenance("selector", "span.value-data")
+
+        # Used and total data from progress labels
+        for name, label, raw_key in (
+            ("used_data_gb", "Consumidos", "used_label"),
+            ("total_data_gb", "Incluido", "total_label"),
+        ):
+            selector = f".progress-bar__label:has-text('{label}')"
+            text = await self._text_of(service_card.locator(selector).first)
+            if text is None:
+                continue
+            raw_data[raw_key] = text
+            setattr(data, name, self._parse_data_value(text))
+            if getattr(data, name) is not None:
+                sources[name] = provenance("progress_label", selector)
+
+        # Top-up balance, expiration and fallbacks from the card and body text
+        card_text = ""
+        try:
+            if await service_card.count():
+                card_text = await service_card.inner_text(timeout=self._ms(5000))
+            else:
+                _LOGGER.warning("Service card not found for top-up extraction")
+        except Exception as err:
+            _LOGGER.warning("Could not read service card text: %s", err)
+        raw_data["card_text_sample"] = card_text[:500] if card_text else None
+        if card_text:
+            _LOGGER.info("Card text sample: %s", card_text[:200])
+        else:
+            _LOGGER.warning("Service card text empty or unavailable")
+
+        body_text = ""
+        try:
+            body_text = await page.inner_text("body")
+        except Exception as err:
+            _LOGGER.warning("Could not read page text: %s", err)
+        raw_data["body_text_sample"] = body_text[:1000] if body_text else None
+
+        # Plan name (prefer the card's title)
+        plan_text = await self._text_of(service_card.locator(".plan-title").first)
+        if plan_text and plan_text.strip():
+            data.plan_name = raw_data["plan_name"] = plan_text.strip()
+            sources["plan_name"] = provenance("selector", ".plan-title")
+
+        # Text patterns only fill what the selectors did not find
+        values, text_raw, text_sources = extract_from_text(card_text, body_text)
+        for name, value in values.items():
+            if getattr(data, name) is None and value is not None:
+                setattr(data, name, value)
+                sources[name] = text_sources[name]
+        for key, value in text_raw.items():
+            raw_data.setdefault(key, value)
+
+        if data.topup_balance_gb is not None:
+            _LOGGER.info("Top-up balance found: %s", raw_data.get("topup_text"))
+        if data.topup_expiration_date is not None:
+            _LOGGER.info("Top-up expiration found: %s", data.topup_expiration_date)
+
+        self._fill_derived(data)
+        data.raw_data = raw_data
+        return data
+
+    def _retry_plan(self, data: AntelConsumoData) -> list[str]:
+        """Return the sources to try, cheapest first, for missing core fields.
+
+        "dom" re-parses the already loaded page, "http" fetches the consumo
+        page with the context's cookies, and "navigate" is the full browser
+        recovery through the home page, which can take minutes.
+        """
+        missing = data.missing_fields()
+        if not missing:
+            return []
+        body = ((data.raw_data or {}).get("body_text_sample") or "").lower()
+        if "inconveniente" in body:
+            # Error page: nothing to re-read in the DOM
+            return ["http", "navigate"]
+        if len(missing) < len(data.CORE_FIELDS):
+            return ["dom", "http"]
+        return ["dom", "http", "navigate"]
+
+    async def _complete_data(
+        self, page: Page, context: BrowserContext, data: AntelConsumoData
+    ) -> AntelConsumoData:
+        """Refetch only the missing fields, from the cheapest source first."""
+        for step in self._retry_plan(data):
+            missing = data.missing_fields()
+            if not missing:
+                break
+            _LOGGER.info("Missing %s, retrying from %s", ", ".join(missing), step)
+            self.metrics.incr(f"retry_{step}")
 
-            # Remaining data ("Me quedan")
-            remaining_value = service_card.locator("span.value-data").first
-            if await remaining_value.count():
-                value_text = await remaining_value.text_content() or ""
-                unit_text = ""
-                unit_element = service_card.locator("span.value-data + small").first
-                if await unit_element.count():
-                    unit_text = await unit_element.text_content() or ""
-                remaining_text = f"{value_text} {unit_text}".strip()
-                raw_data["remaining_text"] = remaining_text
-                data.remaining_data_gb = self._parse_data_value(remaining_text)
-
-            # Used and total data from progress labels
-            used_label = service_card.locator(
-                ".progress-bar__label:has-text('Consumidos')"
-            ).first
-            if await used_label.count():
-                used_text = await used_label.text_content() or ""
-                raw_data["used_label"] = used_text
-                data.used_data_gb = self._parse_data_value(used_text)
-
-            total_label = service_card.locator(
-                ".progress-bar__label:has-text('Incluido')"
-            ).first
-            if await total_label.count():
-                total_text = await total_label.text_content() or ""
-                raw_data["total_label"] = total_text
-                data.total_data_gb = self._parse_data_value(total_text)
-
-            # Top-up balance and expiration (from service card text)
-            card_text = ""
             try:
-                if await service_card.count():
-                    card_text = await service_card.inner_text(timeout=5000)
+                if step == "dom":
+                    other = self._extract_from_html(await page.content())
+                elif step == "http":
+                    result = await self._backend.fetch(
+                        ANTEL_CONSUMO_INTERNET_URL,
+                        await context.storage_state(),
+                        timeout=self._ms(30000),
+                    )
+                    if result.status != 200 or not result.url.startswith(ANTEL_BASE_URL):
+                        continue
+                    other = self._extract_from_html(result.text)
                 else:
-                    _LOGGER.warning("Service card not found for top-up extraction")
+                    await self._capture_artifacts(page, "error")
+                    await self._navigate_to_consumo(page)
+                    other = await self._extract_consumption_data(page)
             except Exception as err:
-                _LOGGER.warning("Could not read service card text: %s", err)
-
-            raw_data["card_text_sample"] = card_text[:500] if card_text else None
-            if card_text:
-                _LOGGER.info("Card text sample: %s", card_text[:200])
-                # Try different patterns for recarga balance
-                topup_match = re.search(r"Saldo de recargas[\.:]?\s*([\d.,]+)\s*GB", card_text, re.IGNORECASE)
-                if not topup_match:
-                    topup_match = re.search(r"Recarga datos.*?Me quedan\s*([\d.,]+)\s*GB", card_text, re.IGNORECASE | re.DOTALL)
-
-                if topup_match:
-                    topup_text = topup_match.group(1).strip() + " GB"
-                    raw_data["topup_text"] = topup_text
-                    data.topup_balance_gb = self._parse_data_value(topup_text)
-                    _LOGGER.info("Top-up balance found: %s", topup_text)
-                else:
-                    _LOGGER.info("Top-up balance not found in card text")
+                _LOGGER.debug("Retry from %s failed: %s", step, err)
+                continue
+
+            filled = data.merge(other)
+            if filled:
+                _LOGGER.info("Filled %s from %s", ", ".join(filled), step)
+                self.metrics.incr(f"retry_{step}_filled")
+            self._fill_derived(data)
+        return data
+
+    async def _navigate_to_consumo(self, page: Page) -> None:
+        """Reload the consumo page, going through the service link if needed."""
+        try:
+            await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="domcontentloaded", timeout=self._ms(120000))
+            await page.wait_for_load_state("networkidle", timeout=self._ms(60000))
+            await page.wait_for_selector("span.value-data", timeout=self._ms(60000))
+            return
+        except backends.PlaywrightTimeout:
+            pass
 
-                # Expiration date patterns
-                exp_match = re.search(r"Vence el\s*(\d{1,2}/\d{1,2}/\d{4})", card_text, re.IGNORECASE)
-                if not exp_match:
-                    exp_match = re.search(r"Vence el\s*(\d{1,2}\s+de\s+\w+(?:\s+\d{4})?)", card_text, re.IGNORECASE)
+        try:
+            await page.goto(ANTEL_HOME_URL, wait_until="domcontentloaded", timeout=self._ms(120000))
+            await page.wait_for_selector(".servicioBox", timeout=self._ms(60000))
 
-                if exp_match:
-                    data.topup_expiration_date = exp_match.group(1).strip()
-                    raw_data["topup_expiration"] = data.topup_expiration_date
-                    _LOGGER.info("Top-up expiration found: %s", data.topup_expiration_date)
-                else:
-                    _LOGGER.info("Top-up expiration not found in card text")
+            filter_text = self._service_id if self._service_id else "Fibra"
+            service_card = page.locator(".servicioBox").filter(
+                has_text=re.compile(re.escape(filter_text), re.I)
+            ).first
+
+            if await service_card.count():
+                service_link = service_card.locator("a").first
             else:
-                _LOGGER.warning("Service card text empty or unavailable")
+                service_link = page.locator(".servicioBox.internet a").first
+            if await service_link.count():
+                await service_link.click(timeout=self._ms(30000))
+                await page.wait_for_load_state("networkidle", timeout=self._ms(60000))
+                await page.wait_for_selector("span.value-data", timeout=self._ms(60000))
+        except Exception:
+            pass
+
+    async def _fetch_via_http(self) -> AntelConsumoData | None:
+        """Fetch the consumo page over plain HTTP using the stored session."""
+        state = await self._session.async_load()
+        if not state:
+            return None
 
-            # Billing period
-            body_text = await page.inner_text("body")
-            raw_data["body_text_sample"] = body_text[:1000] if body_text else None
-            if body_text:
-                match = re.search(r"Ciclo actual:\s*([^\n]+)", body_text)
-                if match:
-                    data.billing_period = match.group(1).strip()
-                    raw_data["billing_period"] = data.billing_period
-
-            # Plan name (prefer card)
-            if not data.plan_name:
-                try:
-                    plan_el = service_card.locator(".plan-title").first
-                except Exception:
-                    plan_el = None
-                if plan_el and await plan_el.count():
-                    plan_text = await plan_el.text_content() or ""
-                    if plan_text.strip():
-                        data.plan_name = plan_text.strip()
-                        raw_data["plan_name"] = data.plan_name
-
-            # Fallback: extract from body
-            if not data.plan_name and body_text:
-                plan_match = re.search(r"(Fibra[^\n]+)", body_text)
-                if plan_match:
-                    data.plan_name = plan_match.group(1).strip()
-                    raw_data["plan_name"] = data.plan_name
-
-            # Calculate remaining and percentage if needed
-            if data.remaining_data_gb is None and data.used_data_gb is not None and data.total_data_gb is not None:
-                data.remaining_data_gb = data.total_data_gb - data.used_data_gb
-
-            if data.used_data_gb is not None and data.total_data_gb is not None:
-                if data.total_data_gb > 0:
-                    data.percentage_used = (data.used_data_gb / data.total_data_gb) * 100
-
-            data.raw_data = raw_data
+        with self.metrics.stage("http_fetch"):
+            try:
+                result = await self._backend.fetch(
+                    ANTEL_CONSUMO_INTERNET_URL,
+                    state,
+                    headers=self._cache.conditional_headers(),
+                    timeout=self._ms(30000),
+                )
+            except Exception as err:
+                _LOGGER.debug("HTTP fetch failed: %s", err)
+                self.metrics.incr("http_miss")
+                return None
+
+        if not result.url.startswith(ANTEL_BASE_URL):
+            # Redirected to the login page: the session expired server-side
+            _LOGGER.debug("Stored session expired (redirected to %s)", result.url)
+            await self._session.async_clear()
+            self.metrics.incr("session_expired")
+            self.metrics.incr("http_miss")
+            return None
+        if result.status == 304 and (data := self._cache.lookup(None)) is not None:
+            self.metrics.incr("http_hit")
             return data
+        if result.status != 200:
+            _LOGGER.debug("HTTP fetch returned status %s", result.status)
+            self.metrics.incr("http_miss")
+            return None
 
-        except Exception as err:
-            _LOGGER.error("Error extracting consumption data: %s", err)
-            data.raw_data = raw_data
+        digest = content_hash(self._select_card_html(result.text))
+        data = self._cache.lookup(digest)
+        if data is None:
+            data = self._extract_from_html(result.text)
+            if data.missing_fields() and self._sniffer is not None:
+                # Values loaded by AJAX after render: ask their endpoints directly
+                replayed = await self._sniffer.async_replay(
+                    self._backend,
+                    result.storage_state or state,
+                    result.text,
+                    timeout=self._ms(30000),
+                )
+                if replayed is not None:
+                    data.merge(replayed)
+                    self._fill_derived(data)
+            if data.used_data_gb is None and data.total_data_gb is None:
+                self.metrics.incr("http_miss")
+                return None
+            self._cache.store(digest, data, result.headers)
+
+        self.metrics.incr("http_hit")
+        if result.storage_state:
+            await self._session.async_save(result.storage_state, new_session=False)
+        return data
+
+    async def _login_via_http(self) -> bool:
+        """Try the browser-free login; return False to fall back to the browser."""
+        if not self._http_login:
+            return False
+
+        with self.metrics.stage("http_login"):
+            try:
+                state = await HttpAuthenticator(
+                    self._backend, timeout=self._ms(30000)
+                ).async_login(self._username, self._password)
+            except AntelAuthError:
+                raise
+            except Exception as err:
+                _LOGGER.info("HTTP login not possible, using the browser: %s", err)
+                self.metrics.incr("http_login_fallback")
+                return False
+
+        self.metrics.incr("logins")
+        self.metrics.incr("http_logins")
+        await self._session.async_save(state)
+        return True
+
+    async def _session_active(self, page: Page) -> bool:
+        """Check whether the context's stored cookies are still logged in."""
+        try:
+            await page.goto(ANTEL_HOME_URL, wait_until="domcontentloaded", timeout=self._ms(60000))
+        except Exception:
+            return False
+        return page.url.startswith(ANTEL_BASE_URL)
+
+    @property
+    def _flight_key(self) -> tuple[str, str, str | None]:
+        """Return the coalescing key.
+
+        The password is part of it, so new credentials never share, and so
+        is the service: two entries on one account may watch different cards.
+        """
+        return (self._username, self._password, self._service_id)
+
+    @property
+    def scraping(self) -> bool:
+        """Return True if a scrape for this account is in flight."""
+        return self._flights.inflight(self._flight_key) is not None
+
+    async def get_consumption_data(self, max_age: float | None = None) -> AntelConsumoData:
+        """Get consumption data from Antel.
+
+        A result at most max_age seconds old (default: the freshness window)
+        is returned as is; otherwise the caller joins the account's
+        in-flight scrape or starts one.
+        """
+        key = self._flight_key
+        max_age = self._freshness if max_age is None else max_age
+        if (fresh := self._flights.fresh(key, max_age)) is not None:
+            self.metrics.incr("scrape_fresh")
+            return replace(fresh)
+        data, shared = await self._flights.async_do(key, self._scrape)
+        if shared:
+            self.metrics.incr("scrape_coalesced")
+        return replace(data)
+
+    async def _scrape(self) -> AntelConsumoData:
+        """Run the flight's scrape, marking this instance as its owner."""
+        self._owns_flight = True
+        try:
+            return await self._scrape_once()
+        finally:
+            self._owns_flight = False
+
+    async def _scrape_once(self) -> AntelConsumoData:
+        """Scrape the consumption data once, within the deadline.
+
+        Every Playwright call gets at most the time left. If the scrape still
+        runs past the deadline (a driver that stopped answering), it is
+        cancelled, the step it was in is logged and the browser and driver
+        are recycled.
+        """
+        deadline = self._deadline = Deadline(self._deadline_budget)
+        try:
+            with self.metrics.stage("scrape"):
+                data = await asyncio.wait_for(
+                    self._fetch(), deadline.budget + _WATCHDOG_GRACE
+                )
+        except asyncio.TimeoutError as err:
+            _LOGGER.error(
+                "Scrape exceeded its %ss deadline in step '%s' (steps started at: %s)",
+                deadline.budget,
+                deadline.step,
+                deadline.steps,
+            )
+            self.metrics.incr("watchdog_timeouts")
+            await self._recycle_backend()
+            raise AntelConnectionError(
+                f"Scrape deadline exceeded during {deadline.step}"
+            ) from err
+        finally:
+            self._deadline = None
+        if deadline.remaining() == 0:
+            _LOGGER.warning(
+                "Scrape used its whole %ss budget; last step '%s'", deadline.budget, deadline.step
+            )
+
+        if self.topups is not None:
+            await self._sync_topups(data)
+        data.parse_dates(self._local_today())
+        data.fetched_at = time.time()
+        return data
+
+    async def _fetch(self) -> AntelConsumoData:
+        """Get the data over HTTP if possible, else in the browser."""
+        data = None
+        if self._http_fetch:
+            self._mark("http_fetch")
+            data = await self._fetch_via_http()
+            if data is None:
+                self._mark("http_login")
+                if await self._login_via_http():
+                    self._mark("http_fetch_after_login")
+                    data = await self._fetch_via_http()
+        if data is not None:
+            self._session.hints["last_path"] = "http"
+            if isinstance(self._backend, PlaywrightBackend):
+                # A context pre-warmed for nothing; do not hold it until next poll
+                await self._backend.async_discard_standby()
             return data
+        try:
+            data = await self._fetch_via_browser()
+        finally:
+            await self._govern_memory()
+        self._session.hints["last_path"] = "browser"
+        return data
 
-    async def get_consumption_data(self) -> AntelConsumoData:
-        """Get consumption data from Antel."""
-        browser = await self._ensure_browser()
-        context = await browser.new_context(
-            viewport={"width": 1280, "height": 720},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+    async def prewarm(self) -> bool:
+        """Get the browser context of the next scrape ready; True if one was made.
 
+        Skipped when the last scrape did not need the browser: a standby
+        context would only hold memory.
+        """
+        if not isinstance(self._backend, PlaywrightBackend) or self.scraping:
+            return False
+        state = await self._session.async_load()
+        if self._http_fetch and self._session.hints.get("last_path") == "http":
+            return False
         try:
-            page = await context.new_page()
+            with self.metrics.stage("prewarm"):
+                await self._backend.async_prewarm(storage_state=state)
+        except Exception as err:
+            _LOGGER.debug("Could not pre-warm a browser context: %s", err)
+            return False
+        self.metrics.incr("prewarmed")
+        return True
 
-            # Login with retries
-            for attempt in range(3):
-                try:
-                    await self._login(page)
-                    break
-                except AntelConnectionError:
-                    if attempt < 2:
-                        await asyncio.sleep(30)
-                        continue
-                    raise
+    async def _recycle_backend(self) -> None:
+        """Close the browser and the driver after a hang; both restart on demand."""
+        try:
+            await self._backend.close()
+        except Exception as err:
+            _LOGGER.debug("Error recycling the backend: %s", err)
+        self.metrics.incr("browser_recycled")
 
-            home_url = f"{ANTEL_BASE_URL}/miAntel/"
+    async def _sync_topups(self, data: AntelConsumoData) -> None:
+        """Add new top-ups to the history; never fails the scrape."""
+        with self.metrics.stage("topups"):
+            try:
+                await self.topups.async_sync(
+                    await self._session.async_load(),
+                    data,
+                    self._local_today(),
+                    timeout=self._ms(30000),
+                )
+            except Exception as err:
+                _LOGGER.warning("Could not sync top-ups: %s", err)
+        data.topups = self.topups.active(self._local_today())
+
+    async def list_services(self) -> list[dict[str, str]]:
+        """Return the account's services from one dashboard fetch.
+
+        Uses the stored session (logging in over HTTP if needed); returns an
+        empty list when the dashboard cannot be read without a browser.
+        """
+        state = await self._session.async_load()
+        if not state and await self._login_via_http():
+            state = await self._session.async_load()
+        if not state:
+            return []
+        try:
+            result = await self._backend.fetch(
+                ANTEL_CONSUMO_INTERNET_URL, state, timeout=self._ms(30000)
+            )
+        except Exception as err:
+            _LOGGER.debug("Could not fetch the service list: %s", err)
+            return []
+        if result.status != 200 or not result.url.startswith(ANTEL_BASE_URL):
+            return []
+        return list_services(result.text)
+
+    async def _govern_memory(self) -> None:
+        """Sample idle browser memory and recycle Chromium above the limit."""
+        if isinstance(self._backend, PersistentProfileBackend):
+            size = await self._backend.async_enforce_budget()
+            self.metrics.gauge("browser_profile_mb", round(size / 1048576, 1))
+        if not self._reuse_browser and isinstance(self._backend, PlaywrightBackend):
+            await self._backend.close_browser()
+            return
+        await self._governor.async_sample(idle=True)
+        if self._governor.should_recycle() and isinstance(self._backend, PlaywrightBackend):
+            await self._backend.close_browser()
+            self.metrics.incr("browser_recycled")
+
+    async def _fetch_via_browser(self) -> AntelConsumoData:
+        """Log in if needed and scrape the consumo page in a browser."""
+        state = await self._session.async_load()
+        context = await self._backend.new_context(storage_state=state)
+        cache_stats = None
+
+        try:
+            if self._block_resources:
+                await context.route("**/*", self._route_resource)
+            # A pre-warmed context comes with its (preconnected) page
+            page = context.pages[0] if context.pages else await context.new_page()
+            if isinstance(self._backend, PersistentProfileBackend):
+                cache_stats = await self._track_http_cache(page)
+
+            self._mark("session_check")
+            if state and await self._session_active(page):
+                self.metrics.incr("session_reused")
+            else:
+                # Login with retries, as long as the deadline leaves room
+                self._mark("login")
+                with self.metrics.stage("login"):
+                    for attempt in range(3):
+                        try:
+                            await self._login(page)
+                            break
+                        except AntelConnectionError:
+                            if attempt < 2 and (
+                                self._deadline is None or self._deadline.remaining() > 60
+                            ):
+                                await asyncio.sleep(30)
+                                continue
+                            raise
+                self.metrics.incr("logins")
+                await self._session.async_save(await context.storage_state())
+
+            self._mark("home")
+            home_url = ANTEL_HOME_URL
             try:
-                await page.goto(home_url, wait_until="domcontentloaded", timeout=120000)
-                await page.wait_for_load_state("networkidle", timeout=60000)
-            except PlaywrightTimeout:
+                await page.goto(home_url, wait_until="domcontentloaded", timeout=self._ms(120000))
+                await page.wait_for_load_state("networkidle", timeout=self._ms(60000))
+            except backends.PlaywrightTimeout:
                 pass
 
             # Open user menu and navigate to Autogestión y trámites en línea
+            self._mark("menu")
             try:
                 user_menu = page.get_by_role("button", name=re.compile("mi cuenta|perfil|usuario|bienvenido", re.I))
                 if await user_menu.count():
-                    await user_menu.first.click(timeout=30000)
+                    await user_menu.first.click(timeout=self._ms(30000))
                 else:
                     menu_toggle = page.locator(".tMenu_toggle, .menu-usuario, .user-menu, .dropdown-toggle").first
                     if await menu_toggle.count():
-                        await menu_toggle.click(timeout=30000)
+                        await menu_toggle.click(timeout=self._ms(30000))
 
                 await page.get_by_role(
                     "link",
                     name=re.compile("autogestión y trámites en línea", re.I),
-                ).click(timeout=30000)
-                await page.wait_for_load_state("networkidle", timeout=60000)
+                ).click(timeout=self._ms(30000))
+                await page.wait_for_load_state("networkidle", timeout=self._ms(60000))
             except Exception:
                 pass
 
+            if self._sniffer is not None:
+                self._sniffer.attach(page)
+
             # Navigate to internet consumption page
+            self._mark("consumo")
             try:
-                await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="domcontentloaded", timeout=120000)
-            except PlaywrightTimeout:
+                await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="domcontentloaded", timeout=self._ms(120000))
+            except backends.PlaywrightTimeout:
                 try:
-                    await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="load", timeout=120000)
-                except PlaywrightTimeout:
-                    await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="commit", timeout=120000)
+                    await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="load", timeout=self._ms(120000))
+                except backends.PlaywrightTimeout:
+                    await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="commit", timeout=self._ms(120000))
             except Exception:
-                try:
-                    artifacts_dir = Path("/root/src/hacs-antel/artifacts")
-                    artifacts_dir.mkdir(parents=True, exist_ok=True)
-                    stamp = int(time.time())
-                    await page.screenshot(path=str(artifacts_dir / f"antel_consumo_goto_{stamp}.png"), full_page=True)
-                    html = await page.content()
-                    (artifacts_dir / f"antel_consumo_goto_{stamp}.html").write_text(html, encoding="utf-8")
-                except Exception:
-                    pass
+                await self._capture_artifacts(page, "consumo_goto")
                 raise
 
-            try:
-                await page.wait_for_load_state("networkidle", timeout=60000)
-            except PlaywrightTimeout:
-                pass
+            # Values carried by XHR/JSF responses need no rendering
+            data = None
+            digest = None
+            if self._sniffer is not None:
+                # Only hold off rendering once the data endpoints are known
+                data = await self._sniffer.async_wait(timeout=15 if self._sniffer.endpoints else 0)
 
-            try:
-                await page.wait_for_selector(
-                    "span.value-data, .progress-bar__label",
-                    timeout=60000,
-                )
-            except Exception:
+            if data is None:
+                self._mark("wait_values")
                 try:
-                    dashboard_link = page.get_by_role("link", name="Detalle de consumo")
-                    await dashboard_link.click(timeout=20000)
-                    await page.wait_for_load_state("networkidle", timeout=60000)
-                    await page.wait_for_selector("span.value-data", timeout=30000)
-                except Exception:
+                    await page.wait_for_load_state("networkidle", timeout=self._ms(60000))
+                except backends.PlaywrightTimeout:
                     pass
 
-            data = await self._extract_consumption_data(page)
-
-            if data.raw_data and data.raw_data.get("body_text_sample"):
-                if "inconveniente" in data.raw_data["body_text_sample"].lower():
+                try:
+                    await page.wait_for_selector(
+                        "span.value-data, .progress-bar__label",
+                        timeout=self._ms(60000),
+                    )
+                except Exception:
                     try:
-                        artifacts_dir = Path("/root/src/hacs-antel/artifacts")
-                        artifacts_dir.mkdir(parents=True, exist_ok=True)
-                        stamp = int(time.time())
-                        await page.screenshot(path=str(artifacts_dir / f"antel_error_{stamp}.png"), full_page=True)
-                        html = await page.content()
-                        (artifacts_dir / f"antel_error_{stamp}.html").write_text(html, encoding="utf-8")
+                        dashboard_link = page.get_by_role("link", name="Detalle de consumo")
+                        await dashboard_link.click(timeout=self._ms(20000))
+                        await page.wait_for_load_state("networkidle", timeout=self._ms(60000))
+                        await page.wait_for_selector("span.value-data", timeout=self._ms(30000))
                     except Exception:
                         pass
 
-                    try:
-                        await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="domcontentloaded", timeout=120000)
-                        await page.wait_for_load_state("networkidle", timeout=60000)
-                    except PlaywrightTimeout:
-                        pass
+                # Unchanged service card: skip extraction and its settle waits
+                try:
+                    digest = content_hash(self._select_card_html(await page.content()))
+                except Exception:
+                    digest = None
+                if digest and (cached := self._cache.lookup(digest)) is not None:
+                    await self._session.async_save(await context.storage_state(), new_session=False)
+                    return cached
+
+                self._mark("extract")
+                with self.metrics.stage("extract"):
                     data = await self._extract_consumption_data(page)
+                # Fully loaded page: the best moment to catch peak usage
+                await self._governor.async_sample()
 
-                    if data.used_data_gb is None and data.total_data_gb is None:
-                        try:
-                            await page.goto(home_url, wait_until="domcontentloaded", timeout=120000)
-                            await page.wait_for_selector(".servicioBox", timeout=60000)
-                            
-                            filter_text = self._service_id if self._service_id else "Fibra"
-                            service_card = page.locator(".servicioBox").filter(
-                                has_text=re.compile(filter_text, re.I)
-                            ).first
-                            
-                            if await service_card.count():
-                                service_link = service_card.locator("a").first
-                            else:
-                                service_link = page.locator(".servicioBox.internet a").first
-                            if await service_link.count():
-                                await service_link.click(timeout=30000)
-                                await page.wait_for_load_state("networkidle", timeout=60000)
-                                await page.wait_for_selector("span.value-data", timeout=60000)
-                        except Exception:
-                            pass
-                        data = await self._extract_consumption_data(page)
+                self._mark("complete")
+                data = await self._complete_data(page, context, data)
 
+            if data.used_data_gb is not None or data.total_data_gb is not None:
+                if digest:
+                    self._cache.store(digest, data)
+                await self._session.async_save(await context.storage_state(), new_session=False)
             return data
 
         finally:
-            await context.close()
+            try:
+                if self._sniffer is not None:
+                    await self._sniffer.async_close()
+                if cache_stats is not None:
+                    await cache_stats.async_detach()
+                    self._report_http_cache(cache_stats)
+            finally:
+                await self._backend.release_context(context)
+
+    async def _track_http_cache(self, page: Page) -> HttpCacheStats | None:
+        """Start counting the page's HTTP cache hits; None if CDP fails."""
+        stats = HttpCacheStats()
+        try:
+            await stats.async_attach(page)
+        except Exception as err:
+            _LOGGER.debug("Could not track the HTTP cache: %s", err)
+            return None
+        return stats
+
+    def _report_http_cache(self, stats: HttpCacheStats) -> None:
+        """Publish one scrape's HTTP cache figures as gauges."""
+        self.metrics.gauge("http_cache_requests", stats.requests)
+        self.metrics.gauge("http_cache_hit_ratio", round(stats.hit_ratio or 0.0, 3))
+        self.metrics.gauge("http_cache_saved_kb", round(stats.bytes_saved / 1024, 1))
+        self.metrics.gauge("http_cache_downloaded_kb", round(stats.bytes_downloaded / 1024, 1))
+
+    @staticmethod
+    async def _route_resource(route: Route) -> None:
+        """Abort requests for resources the scrape never reads."""
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
 
     async def validate_credentials(self) -> bool:
         """Validate credentials without fetching all data."""
-        browser = await self._ensure_browser()
-        context = await browser.new_context(
-            viewport={"width": 1280, "height": 720},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        if (inflight := self._flights.inflight(self._flight_key)) is not None:
+            # A scrape is already logging in with these credentials
+            try:
+                await asyncio.shield(inflight)
+                return True
+            except AntelAuthError:
+                return False
+            except Exception as err:
+                _LOGGER.debug("Shared scrape failed, validating on our own: %s", err)
+
+        await self._session.async_load()
+        try:
+            if await self._login_via_http():
+                return True
+        except AntelAuthError:
+            return False
+
+        context = await self._backend.new_context()
 
         try:
             page = await context.new_page()
             for attempt in range(3):
                 try:
                     await self._login(page)
+                    await self._session.async_save(await context.storage_state())
                     return True
                 except AntelConnectionError:
                     if attempt < 2:
@@ -522,4 +1173,4 @@ class AntelScraper:
         except AntelAuthError:
             return False
         finally:
-            await context.close()
+            await self._backend.release_context(context)
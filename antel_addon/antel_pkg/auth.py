@@ -0,0 +1,118 @@
+"""Browser-free TuID login using plain HTTP requests."""
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urljoin
+
+from .const import ANTEL_BASE_URL, ANTEL_HOME_URL, ANTEL_LOGIN_URL, USER_AGENT
+from .exceptions import AntelAuthError, AntelLoginUnsupported
+from .parsing import HtmlForm, parse_forms
+
+if TYPE_CHECKING:
+    from playwright.async_api import APIRequestContext, APIResponse
+
+    from .backends import ScraperBackend
+
+_LOGGER = logging.getLogger(__name__)
+
+_CHALLENGE_RE = re.compile(r"captcha|g-recaptcha|hcaptcha|cf-challenge|turnstile", re.I)
+_BAD_CREDENTIALS_RE = re.compile(
+    r"contraseña\s+(?:incorrecta|inválida)|credenciales\s+(?:incorrectas|inválidas)"
+    r"|usuario\s+o\s+contraseña\s+(?:incorrectos|inválidos)",
+    re.I,
+)
+_METHOD_LINK_TEXT = "usuario y contraseña"
+
+
+class HttpAuthenticator:
+    """Perform the TuID OpenID Connect login with an HTTP client.
+
+    The flow mirrors the browser: pick the "Usuario y contraseña" method,
+    post the username form, then the password form, carrying every hidden
+    field (state, nonce, CSRF tokens) and following redirects back to Mi
+    Antel. Anything unexpected raises AntelLoginUnsupported so the caller can
+    fall back to the browser login.
+    """
+
+    def __init__(self, backend: ScraperBackend, timeout: float = 30000) -> None:
+        """Initialize the authenticator."""
+        self._backend = backend
+        self._timeout = timeout
+
+    async def async_login(self, username: str, password: str) -> dict[str, Any]:
+        """Log in and return a Playwright storage state with the session cookies."""
+        playwright = await self._backend.async_playwright()
+        request = await playwright.request.new_context(user_agent=USER_AGENT)
+        try:
+            response = await request.get(ANTEL_LOGIN_URL, timeout=self._timeout)
+            html = await self._checked_text(response)
+
+            # Select TuID method: Usuario y contraseña
+            forms, links = parse_forms(html)
+            for href, text in links:
+                if text.lower() == _METHOD_LINK_TEXT:
+                    response = await request.get(urljoin(response.url, href), timeout=self._timeout)
+                    html = await self._checked_text(response)
+                    forms, links = parse_forms(html)
+                    break
+
+            # Step 1: Username (Cédula o correo)
+            form = self._form_with(forms, "text", "email")
+            if form is None:
+                raise AntelLoginUnsupported("Username form not found")
+            form.fields[form.first_input("text", "email")] = username
+            response = await self._submit(request, response.url, form)
+            html = await self._checked_text(response)
+
+            # Step 2: Password
+            form = self._form_with(parse_forms(html)[0], "password")
+            if form is None:
+                if _BAD_CREDENTIALS_RE.search(html):
+                    raise AntelAuthError("Invalid username")
+                raise AntelLoginUnsupported("Password form not found")
+            form.fields[form.first_input("password")] = password
+            response = await self._submit(request, response.url, form)
+            html = await self._checked_text(response)
+
+            if self._form_with(parse_forms(html)[0], "password") is not None:
+                if _BAD_CREDENTIALS_RE.search(html):
+                    raise AntelAuthError("Invalid credentials")
+                raise AntelLoginUnsupported("Still on the password form after submitting")
+
+            # Open Mi Antel so its own session cookies are issued
+            response = await request.get(ANTEL_HOME_URL, timeout=self._timeout)
+            if not response.url.startswith(ANTEL_BASE_URL) or not response.ok:
+                raise AntelLoginUnsupported(f"Mi Antel did not accept the session ({response.url})")
+
+            return await request.storage_state()
+        finally:
+            await request.dispose()
+
+    @staticmethod
+    def _form_with(forms: list[HtmlForm], *types: str) -> HtmlForm | None:
+        """Return the first form having an input of one of the given types."""
+        for form in forms:
+            if form.first_input(*types):
+                return form
+        return None
+
+    async def _submit(
+        self, request: APIRequestContext, page_url: str, form: HtmlForm
+    ) -> APIResponse:
+        """Submit a form like a browser would."""
+        url = urljoin(page_url, form.action or page_url)
+        if form.method == "post":
+            return await request.post(url, form=form.fields, timeout=self._timeout)
+        return await request.get(url, params=form.fields, timeout=self._timeout)
+
+    @staticmethod
+    async def _checked_text(response: APIResponse) -> str:
+        """Return the body, rejecting errors and challenges a browser must solve."""
+        if response.status >= 400:
+            raise AntelLoginUnsupported(f"HTTP {response.status} from {response.url}")
+        html = await response.text()
+        if _CHALLENGE_RE.search(html):
+            raise AntelLoginUnsupported(f"Challenge page at {response.url}")
+        return html
@@ -0,0 +1,419 @@
+"""Backends that give the scraper browser contexts and HTTP fetches."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .const import ANTEL_BASE_URL, BROWSER_CLOSE_TIMEOUT, USER_AGENT
+from .profile import (
+    DEFAULT_PROFILE_MAX_MB,
+    clear_locks,
+    dir_size,
+    disk_cache_bytes,
+    prune_profile,
+)
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Playwright
+
+_LOGGER = logging.getLogger(__name__)
+
+# Loaded into the standby page so Chromium resolves and connects ahead of time;
+# credentialed and anonymous requests use separate connections, so warm both
+_PRECONNECT_HTML = (
+    f'<link rel="dns-prefetch" href="{ANTEL_BASE_URL}">'
+    f'<link rel="preconnect" href="{ANTEL_BASE_URL}" crossorigin>'
+    f'<link rel="preconnect" href="{ANTEL_BASE_URL}">'
+)
+
+
+class _PlaywrightNotLoaded(Exception):
+    """Placeholder for Playwright's TimeoutError until it is imported."""
+
+
+# Playwright is imported on the first backend start so that loading this
+# package (e.g. when HA sets up the integration) stays cheap. Every page call
+# happens after that start, so except clauses see the real class.
+PlaywrightTimeout: type[Exception] = _PlaywrightNotLoaded
+_async_playwright: Any = None
+
+
+def _load_playwright() -> Any:
+    """Import Playwright and return its async_playwright entry point."""
+    global PlaywrightTimeout, _async_playwright
+
+    if _async_playwright is None:
+        start = time.perf_counter()
+        from playwright.async_api import TimeoutError as playwright_timeout
+        from playwright.async_api import async_playwright
+
+        PlaywrightTimeout = playwright_timeout
+        _async_playwright = async_playwright
+        _LOGGER.info(
+            "Imported Playwright in %.0f ms", (time.perf_counter() - start) * 1000
+        )
+    return _async_playwright
+
+
+BASE_ARGS = (
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+)
+
+# Low-footprint profile for 2-4 GB Home Assistant hosts: one renderer, no
+# background services, small caches and a capped V8 heap.
+LOW_MEMORY_ARGS = (
+    "--renderer-process-limit=1",
+    "--process-per-site",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,BackForwardCache",
+    "--no-first-run",
+    "--mute-audio",
+    "--disk-cache-size=33554432",
+    "--media-cache-size=1048576",
+    "--js-flags=--max-old-space-size=256",
+)
+
+DEFAULT_VIEWPORT = {"width": 1280, "height": 720}
+# Still above Bootstrap's md breakpoint (768 px), so the desktop layout and its
+# selectors are unchanged, but with ~half the pixels to rasterize.
+LOW_MEMORY_VIEWPORT = {"width": 800, "height": 600}
+
+
+@dataclass
+class FetchResult:
+    """Result of a plain HTTP fetch."""
+
+    status: int
+    url: str
+    text: str
+    headers: dict[str, str]
+    storage_state: dict[str, Any] | None = None
+
+
+class ScraperBackend:
+    """Source of browser contexts and plain HTTP fetches.
+
+    Subclasses decide how contexts are created; every backend shares the
+    Playwright driver, whose request API is used for cookie-carrying HTTP
+    fetches without starting Chromium.
+    """
+
+    name = "base"
+
+    def __init__(self) -> None:
+        """Initialize the backend."""
+        self._playwright: Playwright | None = None
+
+    async def async_playwright(self) -> Playwright:
+        """Return the running Playwright driver, starting it if needed."""
+        if self._playwright is None:
+            async_playwright = await asyncio.get_running_loop().run_in_executor(
+                None, _load_playwright
+            )
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def new_context(self, **kwargs: Any) -> BrowserContext:
+        """Return a browser context ready for a scrape."""
+        raise NotImplementedError
+
+    async def release_context(self, context: BrowserContext) -> None:
+        """Release a context returned by new_context.
+
+        Shielded and bounded: a cancelled scrape (e.g. by a timeout) still
+        closes its context, and a wedged close gives up after a while.
+        """
+        close = asyncio.ensure_future(
+            asyncio.wait_for(context.close(), BROWSER_CLOSE_TIMEOUT)
+        )
+        try:
+            await asyncio.shield(close)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            _LOGGER.debug("Could not close browser context: %s", err)
+
+    async def fetch(
+        self,
+        url: str,
+        storage_state: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = 30000,
+        method: str = "GET",
+        data: str | None = None,
+    ) -> FetchResult:
+        """Request a URL with the session cookies, following redirects.
+
+        The returned storage state includes any cookies the server refreshed.
+        """
+        playwright = await self.async_playwright()
+        request = await playwright.request.new_context(
+            storage_state=storage_state,
+            user_agent=USER_AGENT,
+        )
+        try:
+            response = await request.fetch(
+                url, method=method, headers=headers, data=data, timeout=timeout
+            )
+            return FetchResult(
+                status=response.status,
+                url=response.url,
+                text=await response.text() if method != "HEAD" else "",
+                headers=response.headers,
+                storage_state=await request.storage_state(),
+            )
+        finally:
+            await request.dispose()
+
+    async def close(self) -> None:
+        """Stop the Playwright driver, giving up after BROWSER_CLOSE_TIMEOUT."""
+        if self._playwright:
+            playwright, self._playwright = self._playwright, None
+            try:
+                await asyncio.wait_for(playwright.stop(), BROWSER_CLOSE_TIMEOUT)
+            except Exception:
+                pass
+
+
+class PlaywrightBackend(ScraperBackend):
+    """Headless Chromium launched through Playwright."""
+
+    name = "playwright"
+
+    def __init__(self, low_memory: bool = True, single_process: bool = False) -> None:
+        """Initialize the backend.
+
+        single_process saves another renderer but is less stable, so it is
+        opt-in on top of the low-memory profile.
+        """
+        super().__init__()
+        self._browser: Browser | None = None
+        self._low_memory = low_memory
+        self._single_process = single_process
+        self._standby: tuple[dict[str, Any], BrowserContext] | None = None
+
+    @property
+    def browser(self) -> Browser | None:
+        """Return the running browser, if any."""
+        return self._browser
+
+    def launch_args(self) -> list[str]:
+        """Return the Chromium command-line flags for this profile."""
+        args = list(BASE_ARGS)
+        if self._low_memory:
+            args.extend(LOW_MEMORY_ARGS)
+        if self._single_process:
+            args.extend(("--single-process", "--no-zygote"))
+        return args
+
+    async def async_browser(self) -> Browser:
+        """Ensure the browser is running and return it."""
+        if self._browser is None or not self._browser.is_connected():
+            playwright = await self.async_playwright()
+            self._browser = await playwright.chromium.launch(
+                headless=True,
+                args=self.launch_args(),
+            )
+        return self._browser
+
+    async def new_context(self, **kwargs: Any) -> BrowserContext:
+        """Return the standby context if it was made for kwargs, else a new one."""
+        if self._standby is not None:
+            standby_kwargs, context = self._standby
+            self._standby = None
+            if standby_kwargs == kwargs:
+                return context
+            # The session changed since the pre-warm (e.g. a keep-alive)
+            await self.release_context(context)
+        return await self._create_context(**kwargs)
+
+    async def async_prewarm(self, **kwargs: Any) -> None:
+        """Create the next scrape's context and page ahead of time.
+
+        The page preconnects to Mi Antel, so DNS and TLS are done too. The
+        standby costs one context's memory until new_context takes it.
+        """
+        await self.async_discard_standby()
+        context = await self._create_context(**kwargs)
+        try:
+            page = await context.new_page()
+            await page.set_content(_PRECONNECT_HTML)
+        except Exception:
+            await self.release_context(context)
+            raise
+        self._standby = (kwargs, context)
+
+    async def async_discard_standby(self) -> None:
+        """Close the standby context, if any."""
+        if self._standby is not None:
+            _, context = self._standby
+            self._standby = None
+            await self.release_context(context)
+
+    async def _create_context(self, **kwargs: Any) -> BrowserContext:
+        """Create a fresh context in the shared browser."""
+        browser = await self.async_browser()
+        kwargs.setdefault(
+            "viewport", LOW_MEMORY_VIEWPORT if self._low_memory else DEFAULT_VIEWPORT
+        )
+        kwargs.setdefault("user_agent", USER_AGENT)
+        return await browser.new_context(**kwargs)
+
+    async def close_browser(self) -> None:
+        """Close Chromium but keep the Playwright driver."""
+        self._standby = None
+        if self._browser:
+            browser, self._browser = self._browser, None
+            try:
+                await asyncio.wait_for(browser.close(), BROWSER_CLOSE_TIMEOUT)
+            except Exception as err:
+                _LOGGER.debug("Could not close the browser cleanly: %s", err)
+
+    async def close(self) -> None:
+        """Close browser and playwright runtime."""
+        await self.close_browser()
+        await super().close()
+
+
+class PersistentProfileBackend(PlaywrightBackend):
+    """Chromium with a profile kept on disk, so its HTTP cache survives.
+
+    Static JS/CSS of Mi Antel and TuID are then served from the disk cache
+    on later polls. A persistent profile has a single context: new_context
+    loads the session cookies into it and release_context only closes its
+    pages. The profile is pruned before each launch when over max_mb, and
+    the browser is closed after a scrape that leaves it over budget.
+    Routing requests disables Chromium's cache, so block_resources defeats
+    the point of this backend.
+    """
+
+    name = "persistent"
+
+    def __init__(
+        self, profile_dir: str | Path, max_mb: int = DEFAULT_PROFILE_MAX_MB, **kwargs: Any
+    ) -> None:
+        """Initialize the backend."""
+        super().__init__(**kwargs)
+        self._profile_dir = Path(profile_dir)
+        self._max_bytes = max_mb * 1024 * 1024
+        self._context: BrowserContext | None = None
+
+    def launch_args(self) -> list[str]:
+        """Return the profile flags with the disk cache sized to the budget."""
+        args = [arg for arg in super().launch_args() if not arg.startswith("--disk-cache-size=")]
+        args.append(f"--disk-cache-size={disk_cache_bytes(self._max_bytes)}")
+        return args
+
+    async def _async_persistent_context(self) -> BrowserContext:
+        """Launch Chromium on the profile, pruning it first, and return its context."""
+        if self._context is None:
+            await asyncio.get_running_loop().run_in_executor(None, self._prepare_profile)
+            playwright = await self.async_playwright()
+            self._context = await playwright.chromium.launch_persistent_context(
+                str(self._profile_dir),
+                headless=True,
+                args=self.launch_args(),
+                viewport=LOW_MEMORY_VIEWPORT if self._low_memory else DEFAULT_VIEWPORT,
+                user_agent=USER_AGENT,
+            )
+        return self._context
+
+    def _prepare_profile(self) -> None:
+        """Prune an oversized profile and clear stale locks (blocking)."""
+        prune_profile(self._profile_dir, self._max_bytes)
+        self._profile_dir.mkdir(parents=True, exist_ok=True)
+        clear_locks(self._profile_dir)
+
+    async def _create_context(self, **kwargs: Any) -> BrowserContext:
+        """Return the profile's context with the session's cookies.
+
+        Only cookies are applied; Mi Antel keeps no session in local storage.
+        """
+        context = await self._async_persistent_context()
+        await context.clear_cookies()
+        if state := kwargs.get("storage_state"):
+            await context.add_cookies(state.get("cookies", []))
+        return context
+
+    async def release_context(self, context: BrowserContext) -> None:
+        """Close the scrape's pages and routes, keeping the context and cache."""
+        try:
+            await asyncio.shield(
+                asyncio.wait_for(self._async_reset(context), BROWSER_CLOSE_TIMEOUT)
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            _LOGGER.debug("Could not reset the persistent context: %s", err)
+            await self.close_browser()
+
+    @staticmethod
+    async def _async_reset(context: BrowserContext) -> None:
+        """Close every page and drop every route of the context."""
+        await context.unroute("**/*")
+        for page in list(context.pages):
+            await page.close()
+
+    async def async_profile_size(self) -> int:
+        """Return the bytes used by the profile directory."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, dir_size, self._profile_dir
+        )
+
+    async def async_enforce_budget(self) -> int:
+        """Return the profile size, closing Chromium if it is over budget.
+
+        The next launch prunes it; Chromium must not be running meanwhile.
+        """
+        size = await self.async_profile_size()
+        if size > self._max_bytes:
+            await self.close_browser()
+        return size
+
+    async def close_browser(self) -> None:
+        """Close the persistent context, which closes Chromium."""
+        self._standby = None
+        if self._context is not None:
+            context, self._context = self._context, None
+            try:
+                await asyncio.wait_for(context.close(), BROWSER_CLOSE_TIMEOUT)
+            except Exception as err:
+                _LOGGER.debug("Could not close the browser cleanly: %s", err)
+
+
+class HarReplayBackend(PlaywrightBackend):
+    """Serve pages from a recorded HAR file, for offline development.
+
+    With update=True the HAR is (re)recorded from the live site instead.
+    """
+
+    name = "har"
+
+    def __init__(self, har_path: str | Path, update: bool = False, **kwargs: Any) -> None:
+        """Initialize the backend."""
+        super().__init__(**kwargs)
+        self._har_path = Path(har_path)
+        self._update = update
+
+    async def new_context(self, **kwargs: Any) -> BrowserContext:
+        """Create a context whose requests are answered from the HAR."""
+        context = await super().new_context(**kwargs)
+        await context.route_from_har(
+            self._har_path,
+            not_found="fallback" if self._update else "abort",
+            update=self._update,
+        )
+        return context
+
@@ -1,6 +1,4 @@
-"""Constants for the Antel Consumo integration."""
-
-DOMAIN = "antel_consumo"
+"""Constants for the Antel scraper package."""
 
 # URLs
 ANTEL_LOGIN_URL = (
@@ -12,15 +10,18 @@ ANTEL_LOGIN_URL = (
 )
 ANTEL_CONSUMO_INTERNET_URL = "https://aplicaciones.antel.com.uy/miAntel/consumo/internet"
 ANTEL_BASE_URL = "https://aplicaciones.antel.com.uy"
+ANTEL_HOME_URL = f"{ANTEL_BASE_URL}/miAntel/"
+# Detail of data top-ups (recargas): each purchase and its expiry
+ANTEL_RECARGAS_URL = f"{ANTEL_BASE_URL}/miAntel/consumo/recargas"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
 
-# Update interval (1 hour)
-DEFAULT_SCAN_INTERVAL = 3600
+# Chromium is restarted once the driver and browser exceed this RSS
+DEFAULT_MAX_BROWSER_MEMORY_MB = 600
 
-# Attributes
-ATTR_USED_DATA = "used_data"
-ATTR_TOTAL_DATA = "total_data"
-ATTR_REMAINING_DATA = "remaining_data"
-ATTR_PERCENTAGE_USED = "percentage_used"
-ATTR_PLAN_NAME = "plan_name"
-ATTR_BILLING_PERIOD = "billing_period"
-ATTR_LAST_UPDATE = "last_update"
+# Upper bound for closing a context or the browser; a wedged Chromium must
+# not hold up a shutdown or the next scrape
+BROWSER_CLOSE_TIMEOUT = 15
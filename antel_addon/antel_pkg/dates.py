@@ -0,0 +1,171 @@
+"""Spanish date text as shown by Mi Antel, parsed into real dates.
+
+One compiled pattern, generated from the month table, recognises every
+supported form: "15 de febrero 2026", "15 de febrero de 2026", "12 mar.",
+"sábado 3 de enero", "15/02/2026", "15-02-26" and ISO "2026-02-15". Results
+are cached per (text, today), since the same strings come back every poll.
+"""
+from __future__ import annotations
+
+import re
+from datetime import date
+from functools import lru_cache
+
+MONTHS = {
+    "enero": 1,
+    "febrero": 2,
+    "marzo": 3,
+    "abril": 4,
+    "mayo": 5,
+    "junio": 6,
+    "julio": 7,
+    "agosto": 8,
+    "septiembre": 9,
+    "setiembre": 9,
+    "octubre": 10,
+    "noviembre": 11,
+    "diciembre": 12,
+}
+# Abbreviations as used in Uruguayan pages ("set." is as common as "sep.")
+_MONTH_ALIASES = {
+    **MONTHS,
+    **{name[:3]: number for name, number in MONTHS.items()},
+    "sept": 9,
+}
+_MONTH_ALT = "|".join(sorted(_MONTH_ALIASES, key=len, reverse=True))
+
+_DATE_RE = re.compile(
+    r"(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2})"
+    r"|(?P<num_d>\d{1,2})[/-](?P<num_m>\d{1,2})(?:[/-](?P<num_y>\d{4}|\d{2}))?\b"
+    rf"|(?P<es_d>\d{{1,2}})\s+(?:de\s+)?(?P<es_m>{_MONTH_ALT})\b\.?(?:\s*,?\s+(?:de\s+|del\s+)?(?P<es_y>\d{{4}}))?\b",
+    re.IGNORECASE,
+)
+# "1 de enero al 31 de enero", "del 1/1 al 31/1", "1 de enero - 31 de enero"
+_RANGE_SPLIT_RE = re.compile(r"\s+(?:al|hasta(?:\s+el)?|a)\s+|\s+[-–]\s+", re.IGNORECASE)
+
+
+def _parts(match: re.Match[str]) -> tuple[int, int, int | None]:
+    """Return day, month and optional year of a date match."""
+    if match.group("iso_y"):
+        return int(match.group("iso_d")), int(match.group("iso_m")), int(match.group("iso_y"))
+    if match.group("num_d"):
+        year = match.group("num_y")
+        if year is not None:
+            year = int(year) + (2000 if len(year) == 2 else 0)
+        return int(match.group("num_d")), int(match.group("num_m")), year
+    month = _MONTH_ALIASES.get(match.group("es_m").lower())
+    year = match.group("es_y")
+    return int(match.group("es_d")), month, int(year) if year else None
+
+
+def _nearest(day: int, month: int, today: date) -> date | None:
+    """Place a year-less day/month in the year that puts it closest to today.
+
+    "Vence el 5 de enero" read on December 20th is next January; "31 de
+    diciembre" read on January 3rd is last December.
+    """
+    candidates = []
+    for year in (today.year - 1, today.year, today.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:
+            continue
+    if not candidates:
+        return None
+    return min(candidates, key=lambda candidate: abs((candidate - today).days))
+
+
+def _to_date(parts: tuple[int, int, int | None], today: date) -> date | None:
+    """Build a date from parts, inferring a missing year."""
+    day, month, year = parts
+    if year is None:
+        return _nearest(day, month, today)
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=256)
+def _parse_date_cached(text: str, today: date) -> date | None:
+    if not (match := _DATE_RE.search(text)):
+        return None
+    return _to_date(_parts(match), today)
+
+
+def parse_date(text: str | None, today: date | None = None) -> date | None:
+    """Return the first date in text, e.g. 'Vence el 12 de marzo' -> 2026-03-12."""
+    if not text:
+        return None
+    return _parse_date_cached(text, today or date.today())
+
+
+def _anchored(text: str | None, anchor: date, after: bool) -> date | None:
+    """Return the first date in text, a missing year put on anchor's side."""
+    if not text or not (match := _DATE_RE.search(text)):
+        return None
+    day, month, year = _parts(match)
+    if year is not None:
+        return _to_date((day, month, year), anchor)
+    step = 1 if after else -1
+    for offset in range(5):  # 29 February needs up to four years
+        try:
+            candidate = date(anchor.year + step * offset, month, day)
+        except ValueError:
+            continue
+        if (candidate >= anchor) if after else (candidate <= anchor):
+            return candidate
+    return None
+
+
+def parse_date_after(text: str | None, start: date) -> date | None:
+    """Parse a date known to fall on or after start, e.g. an expiry.
+
+    Unlike parse_date, the result does not depend on when it is parsed:
+    "20 de marzo" after a purchase on 2026-03-01 is 2026-03-20 for good.
+    """
+    return _anchored(text, start, after=True)
+
+
+def parse_date_before(text: str | None, end: date) -> date | None:
+    """Parse a date known to fall on or before end, e.g. a purchase."""
+    return _anchored(text, end, after=False)
+
+
+@lru_cache(maxsize=64)
+def _parse_cycle_cached(text: str, today: date) -> tuple[date, date] | None:
+    halves = _RANGE_SPLIT_RE.split(text, maxsplit=1)
+    if len(halves) != 2:
+        return None
+    first_match, last_match = _DATE_RE.search(halves[0]), _DATE_RE.search(halves[1])
+    if first_match is None or last_match is None:
+        return None
+    first, last = _parts(first_match), _parts(last_match)
+
+    end = _to_date(last, today)
+    if end is None:
+        return None
+    if first[2] is not None:
+        start = _to_date(first, today)
+    else:
+        # The first day is the latest occurrence not after the last day
+        try:
+            start = date(end.year, first[1], first[0])
+            if start > end:
+                start = date(end.year - 1, first[1], first[0])
+        except ValueError:
+            return None
+    if start is None or start > end:
+        return None
+    return start, end
+
+
+def parse_cycle(text: str | None, today: date | None = None) -> tuple[date, date] | None:
+    """Parse '1 de enero al 31 de enero' into its first and last day.
+
+    A cycle spanning the new year ('15 de diciembre al 14 de enero') gets
+    consecutive years.
+    """
+    if not text:
+        return None
+    return _parse_cycle_cached(text, today or date.today())
@@ -0,0 +1,44 @@
+"""A total time budget for one scrape, handed down to every Playwright call."""
+from __future__ import annotations
+
+import time
+
+# Whole scrape, login included; the add-on's outer timeout is 300 s
+DEFAULT_SCRAPE_DEADLINE = 240
+# Past the budget, calls still get this much so they fail fast instead of
+# meaning "no timeout" (Playwright's 0)
+_MIN_TIMEOUT_MS = 1
+
+
+class Deadline:
+    """Track the time left of a scrape and the step it is in.
+
+    Each Playwright call gets min(its own cap, the time left) instead of a
+    fixed timeout, so nested fallbacks cannot add up beyond the budget. The
+    step names say where an overrun happened.
+    """
+
+    def __init__(self, budget: float) -> None:
+        """Start the clock."""
+        self.budget = budget
+        self._started = time.monotonic()
+        self.step = "start"
+        self.steps: dict[str, float] = {}
+
+    @property
+    def elapsed(self) -> float:
+        """Return the seconds since the scrape started."""
+        return time.monotonic() - self._started
+
+    def remaining(self) -> float:
+        """Return the seconds left, never negative."""
+        return max(0.0, self.budget - self.elapsed)
+
+    def timeout_ms(self, cap_ms: float) -> float:
+        """Return a Playwright timeout: cap_ms or the time left, if shorter."""
+        return max(_MIN_TIMEOUT_MS, min(cap_ms, self.remaining() * 1000))
+
+    def mark(self, step: str) -> None:
+        """Enter a step, remembering when it started."""
+        self.step = step
+        self.steps[step] = round(self.elapsed, 1)
@@ -0,0 +1,17 @@
+"""Exceptions raised by the Antel scraper."""
+
+
+class AntelScraperError(Exception):
+    """Base exception for Antel scraper."""
+
+
+class AntelAuthError(AntelScraperError):
+    """Authentication error."""
+
+
+class AntelConnectionError(AntelScraperError):
+    """Connection error."""
+
+
+class AntelLoginUnsupported(AntelScraperError):
+    """The HTTP login met something only a browser can handle."""
@@ -0,0 +1,73 @@
+"""Timing and counter hooks shared by the add-on and the integration."""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Listener signature: (kind, name, value) where kind is "stage", "counter" or "gauge"
+Listener = Callable[[str, str, float], None]
+
+
+class Instrumentation:
+    """Collect stage timings, counters and gauges from a scraper."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.stages: dict[str, float] = {}
+        self.counters: dict[str, float] = {}
+        self.gauges: dict[str, float] = {}
+        self._listeners: list[Listener] = []
+
+    def add_listener(self, listener: Listener) -> Callable[[], None]:
+        """Register a listener and return a callable that removes it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _notify(self, kind: str, name: str, value: float) -> None:
+        """Call listeners, never letting one break a scrape."""
+        for listener in list(self._listeners):
+            try:
+                listener(kind, name, value)
+            except Exception:
+                _LOGGER.exception("Instrumentation listener failed")
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block and record its last duration in seconds."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            duration = time.monotonic() - start
+            self.stages[name] = duration
+            self._notify("stage", name, duration)
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+        self._notify("counter", name, self.counters[name])
+
+    def gauge(self, name: str, value: float) -> None:
+        """Record the current value of a gauge."""
+        self.gauges[name] = value
+        self._notify("gauge", name, value)
+
+    def ratio(self, hits: str, misses: str) -> float | None:
+        """Return hits / (hits + misses) for two counters."""
+        total = self.counters.get(hits, 0) + self.counters.get(misses, 0)
+        if not total:
+            return None
+        return self.counters.get(hits, 0) / total
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a copy of all metrics."""
+        return {
+            "stages": dict(self.stages),
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+        }
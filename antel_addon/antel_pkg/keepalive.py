@@ -0,0 +1,102 @@
+"""Keep the Mi Antel session alive between polls with cheap requests."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from .backends import ScraperBackend
+from .const import ANTEL_BASE_URL, ANTEL_HOME_URL
+from .instrumentation import Instrumentation
+from .session import SessionStore
+
+_LOGGER = logging.getLogger(__name__)
+
+# Mi Antel (JSF) sessions idle out after about 30 minutes
+DEFAULT_KEEPALIVE_INTERVAL = 20 * 60
+
+
+class SessionKeepAlive:
+    """Periodically HEAD Mi Antel with the stored session cookies.
+
+    A full TuID login costs tens of seconds; a HEAD request costs one round
+    trip. Each ping refreshes the server-side idle timer and any rotated
+    cookies; a redirect to the login page is counted as an expiry and clears
+    the session so the next scrape logs in straight away. A scrape that logs
+    in while a ping is out wins: the ping's outcome is then dropped.
+    """
+
+    def __init__(
+        self,
+        backend: ScraperBackend,
+        session_store: SessionStore,
+        interval: float = DEFAULT_KEEPALIVE_INTERVAL,
+        instrumentation: Instrumentation | None = None,
+    ) -> None:
+        """Initialize the keep-alive."""
+        self._backend = backend
+        self._session = session_store
+        self.interval = interval
+        self.metrics = instrumentation or Instrumentation()
+        self._task: asyncio.Task | None = None
+
+    async def async_ping(self) -> bool:
+        """Send one keep-alive request; return True if the session is alive."""
+        state = await self._session.async_load()
+        if not state:
+            return False
+
+        try:
+            result = await self._backend.fetch(ANTEL_HOME_URL, state, method="HEAD")
+        except Exception as err:
+            _LOGGER.debug("Keep-alive request failed: %s", err)
+            self.metrics.incr("keepalive_errors")
+            return False
+
+        if not result.url.startswith(ANTEL_BASE_URL):
+            _LOGGER.info(
+                "Antel session expired after %.0f minutes", (self._session.age or 0) / 60
+            )
+            if await self._session.async_clear(expected=state):
+                self.metrics.incr("session_expired")
+            return False
+
+        if result.storage_state:
+            await self._session.async_save(
+                result.storage_state, new_session=False, expected=state
+            )
+        self.metrics.incr("keepalive_ok")
+        if self._session.age is not None:
+            self.metrics.gauge("session_age_s", round(self._session.age))
+        return True
+
+    @property
+    def running(self) -> bool:
+        """Return True while the keep-alive loop runs."""
+        return self._task is not None and not self._task.done()
+
+    async def async_run(self) -> None:
+        """Ping forever; a changed interval applies from the next ping."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.async_ping()
+
+    def start(self) -> None:
+        """Run the keep-alive loop as a background task."""
+        if not self.running:
+            self._task = asyncio.create_task(self.async_run())
+
+    def stop(self) -> None:
+        """Cancel the keep-alive loop, if running."""
+        if self._task is not None:
+            self._task.cancel()
+
+    async def async_stop(self) -> None:
+        """Stop the loop and release the HTTP driver."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._backend.close()
@@ -0,0 +1,117 @@
+"""Memory accounting for the Playwright driver and Chromium processes."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+from pathlib import Path
+
+from .instrumentation import Instrumentation
+
+_LOGGER = logging.getLogger(__name__)
+
+_PROC = Path("/proc")
+_PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+
+# Playwright driver (node) and Chromium process names, as shown in /proc/<pid>/stat
+_BROWSER_COMM_RE = re.compile(r"chrom|headless_shell|node|playwright", re.IGNORECASE)
+
+# Weight of a new sample in the steady-state moving average
+_STEADY_ALPHA = 0.3
+
+
+def process_tree_rss(root_pid: int | None = None) -> int | None:
+    """Return the summed RSS in bytes of browser processes under root_pid.
+
+    Defaults to this process, so it measures the Playwright driver and every
+    Chromium process it spawned but neither the Python interpreter nor
+    unrelated children (Home Assistant runs other subprocesses).
+    Returns None where /proc is unavailable.
+    """
+    if not _PROC.is_dir():
+        return None
+    root_pid = root_pid or os.getpid()
+
+    children: dict[int, list[int]] = {}
+    rss_kb: dict[int, int] = {}
+    for entry in _PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            # The command name may contain spaces; fields resume after ")"
+            comm = stat[stat.index("(") + 1 : stat.rindex(")")]
+            fields = stat[stat.rindex(")") + 2 :].split()
+            ppid = int(fields[1])
+            if _BROWSER_COMM_RE.search(comm):
+                rss_kb[int(entry.name)] = int(fields[21]) * _PAGE_KB
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    total = 0
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        total += rss_kb.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total * 1024
+
+
+class MemoryGovernor:
+    """Track browser memory and decide when to recycle it.
+
+    Peak and a moving-average steady state are published as gauges so hosts
+    can be sized; crossing max_rss_mb asks the scraper to restart Chromium.
+    """
+
+    def __init__(
+        self,
+        max_rss_mb: float | None = None,
+        instrumentation: Instrumentation | None = None,
+    ) -> None:
+        """Initialize the governor."""
+        self._max_rss_mb = max_rss_mb
+        self._metrics = instrumentation
+        self.last_mb: float | None = None
+        self.peak_mb: float = 0.0
+        self.steady_mb: float | None = None
+
+    def bind(self, instrumentation: Instrumentation) -> None:
+        """Publish gauges to the given instrumentation."""
+        self._metrics = instrumentation
+
+    async def async_sample(self, idle: bool = False) -> float | None:
+        """Sample browser RSS in MB; idle samples feed the steady-state figure."""
+        rss = await asyncio.get_running_loop().run_in_executor(None, process_tree_rss)
+        if rss is None:
+            return None
+
+        self.last_mb = rss / (1024 * 1024)
+        self.peak_mb = max(self.peak_mb, self.last_mb)
+        if idle:
+            if self.steady_mb is None:
+                self.steady_mb = self.last_mb
+            else:
+                self.steady_mb += _STEADY_ALPHA * (self.last_mb - self.steady_mb)
+
+        if self._metrics is not None:
+            self._metrics.gauge("browser_rss_mb", round(self.last_mb, 1))
+            self._metrics.gauge("browser_rss_peak_mb", round(self.peak_mb, 1))
+            if self.steady_mb is not None:
+                self._metrics.gauge("browser_rss_steady_mb", round(self.steady_mb, 1))
+        return self.last_mb
+
+    def should_recycle(self) -> bool:
+        """Return True if the last sample exceeded the configured limit."""
+        if self._max_rss_mb is None or self.last_mb is None:
+            return False
+        if self.last_mb > self._max_rss_mb:
+            _LOGGER.info(
+                "Browser using %.0f MB (limit %.0f MB), recycling",
+                self.last_mb,
+                self._max_rss_mb,
+            )
+            return True
+        return False
@@ -0,0 +1,80 @@
+"""Find and reap Chromium processes left behind by an interrupted run.
+
+Only meant for a container where this process owns every browser (the
+add-on); the integration shares its host with Home Assistant and never
+calls these.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import signal
+from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+_PROC = Path("/proc")
+BROWSER_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+def _browser_pids(zombies: bool = False) -> list[int]:
+    """Return the pids of Chromium processes: running ones, or our zombies.
+
+    Zombies are only listed when they are our own children, the only ones
+    we may wait for.
+    """
+    if not _PROC.is_dir():
+        return []
+    own_pid = os.getpid()
+    pids = []
+    for entry in _PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            comm = stat[stat.index("(") + 1 : stat.rindex(")")].lower()
+            state, ppid = stat[stat.rindex(")") + 2 :].split()[:2]
+        except (OSError, ValueError, IndexError):
+            continue
+        if not any(name in comm for name in BROWSER_NAMES):
+            continue
+        if zombies and state == "Z" and int(ppid) == own_pid:
+            pids.append(int(entry.name))
+        elif not zombies and state != "Z":
+            pids.append(int(entry.name))
+    return pids
+
+
+def reap_zombies() -> int:
+    """Collect exited Chromium children, so they do not linger as zombies.
+
+    Running as the container's PID 1, orphaned Chromium helpers are
+    reparented to us and stay defunct until waited for. Only those pids are
+    waited for: a waitpid(-1) would also take the exit status of the
+    Playwright driver, which asyncio's child watcher is waiting for.
+    """
+    reaped = 0
+    for pid in _browser_pids(zombies=True):
+        try:
+            if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                reaped += 1
+        except ChildProcessError:
+            continue
+    return reaped
+
+
+def kill_browsers() -> int:
+    """SIGKILL every Chromium process and reap them; return how many."""
+    killed = 0
+    for pid in _browser_pids():
+        try:
+            os.kill(pid, signal.SIGKILL)
+            killed += 1
+        except ProcessLookupError:
+            continue
+        except PermissionError as err:
+            _LOGGER.debug("Cannot kill browser process %s: %s", pid, err)
+    reaped = reap_zombies()
+    if killed or reaped:
+        _LOGGER.info("Killed %s browser process(es), reaped %s zombie(s)", killed, reaped)
+    return killed
@@ -0,0 +1,166 @@
+"""Persistent Chromium profile: its disk budget and HTTP cache accounting.
+
+A profile kept between scrapes lets Chromium serve the JSF and TuID
+JS/CSS bundles from its disk cache instead of downloading them each poll.
+The disk cache is capped by a Chromium flag; everything else in the
+profile (code cache, service workers, leftovers) is pruned here when the
+whole directory grows past its budget.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from playwright.async_api import CDPSession, Page
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_MAX_MB = 150
+# Share of the profile budget given to the HTTP disk cache
+_DISK_CACHE_SHARE = 0.6
+
+# Regenerated by Chromium on demand, so the first to go when over budget
+_CACHE_DIRS = (
+    "Default/Cache",
+    "Default/Code Cache",
+    "Default/GPUCache",
+    "Default/Service Worker/CacheStorage",
+    "Default/Service Worker/ScriptCache",
+    "GrShaderCache",
+    "ShaderCache",
+)
+# Left by a Chromium that was killed; a new launch would think the profile
+# is still in use
+_LOCK_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket")
+
+
+def disk_cache_bytes(max_bytes: int) -> int:
+    """Return the --disk-cache-size for a profile budget."""
+    return int(max_bytes * _DISK_CACHE_SHARE)
+
+
+def dir_size(path: Path) -> int:
+    """Return the bytes used by the files under path."""
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def prune_profile(path: Path, max_bytes: int) -> int:
+    """Bring a (closed) profile under max_bytes; return the bytes freed.
+
+    Caches go first; if that is not enough the whole profile is wiped and
+    the next launch starts cold. Session cookies live in the session store,
+    not here, so no login is lost.
+    """
+    before = size = dir_size(path)
+    if size <= max_bytes:
+        return 0
+    for relative in _CACHE_DIRS:
+        shutil.rmtree(path / relative, ignore_errors=True)
+        size = dir_size(path)
+        if size <= max_bytes:
+            break
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+        size = 0
+    _LOGGER.info(
+        "Pruned browser profile from %.1f MB to %.1f MB", before / 1048576, size / 1048576
+    )
+    return before - size
+
+
+def clear_locks(path: Path) -> None:
+    """Remove the singleton locks of a Chromium that did not exit cleanly."""
+    for name in _LOCK_FILES:
+        try:
+            (path / name).unlink()
+        except FileNotFoundError:
+            continue
+        except OSError as err:
+            _LOGGER.debug("Could not remove %s: %s", name, err)
+
+
+class HttpCacheStats:
+    """Count a page's requests answered by Chromium's HTTP cache.
+
+    Playwright does not say whether a response came from the cache, so the
+    page's Network events are read over CDP. Bytes saved are the cached
+    responses' Content-Length, or their decoded size without one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty counts."""
+        self.requests = 0
+        self.hits = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+        self._cached: set[str] = set()
+        self._received: dict[str, int] = {}
+        self._lengths: dict[str, int] = {}
+        self._session: CDPSession | None = None
+
+    @property
+    def hit_ratio(self) -> float | None:
+        """Return hits / requests, or None before any request finished."""
+        return self.hits / self.requests if self.requests else None
+
+    async def async_attach(self, page: Page) -> None:
+        """Start counting the requests of page."""
+        self._session = await page.context.new_cdp_session(page)
+        self._session.on("Network.requestServedFromCache", self._on_served_from_cache)
+        self._session.on("Network.responseReceived", self._on_response)
+        self._session.on("Network.dataReceived", self._on_data)
+        self._session.on("Network.loadingFinished", self._on_finished)
+        await self._session.send("Network.enable")
+
+    async def async_detach(self) -> None:
+        """Stop counting; the page may already be gone."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            try:
+                await session.detach()
+            except Exception:
+                pass
+
+    def _on_served_from_cache(self, params: dict[str, Any]) -> None:
+        """Mark a request answered from the memory or disk cache."""
+        self._cached.add(params["requestId"])
+
+    def _on_response(self, params: dict[str, Any]) -> None:
+        """Note whether a response is cached, and its declared length."""
+        response = params.get("response", {})
+        if response.get("fromDiskCache") or response.get("fromPrefetchCache"):
+            self._cached.add(params["requestId"])
+        headers = {name.lower(): value for name, value in response.get("headers", {}).items()}
+        try:
+            self._lengths[params["requestId"]] = int(headers["content-length"])
+        except (KeyError, ValueError):
+            pass
+
+    def _on_data(self, params: dict[str, Any]) -> None:
+        """Add up the decoded bytes of a response."""
+        request_id = params["requestId"]
+        self._received[request_id] = self._received.get(request_id, 0) + params.get("dataLength", 0)
+
+    def _on_finished(self, params: dict[str, Any]) -> None:
+        """Count a finished request as a hit or a download."""
+        request_id = params["requestId"]
+        received = self._received.pop(request_id, 0)
+        length = self._lengths.pop(request_id, received)
+        self.requests += 1
+        if request_id in self._cached:
+            self._cached.discard(request_id)
+            self.hits += 1
+            self.bytes_saved += length
+        else:
+            self.bytes_downloaded += int(params.get("encodedDataLength", 0))
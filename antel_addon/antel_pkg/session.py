@@ -0,0 +1,114 @@
+"""Persistence of the logged-in browser session (cookies and storage)."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """Keep the Playwright storage state of the last login.
+
+    The state is usable both by browser contexts (storage_state=...) and by
+    the lightweight HTTP fetcher. Login hints (e.g. which frame held the
+    password field) are stored next to it. Without a path it only lives in
+    memory.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """Initialize the store."""
+        self._path = Path(path) if path else None
+        self._state: dict[str, Any] | None = None
+        self._loaded = False
+        self.hints: dict[str, Any] = {}
+        self.created_at: float | None = None
+        # Executor writes could otherwise land out of order
+        self._write_lock = asyncio.Lock()
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the stored state, reading it from disk once."""
+        if not self._loaded and self._path is not None:
+            stored = await asyncio.get_running_loop().run_in_executor(None, self._read)
+            if stored:
+                self._state = stored.get("state")
+                self.hints = stored.get("hints", {})
+                self.created_at = stored.get("created_at")
+        self._loaded = True
+        return self._state
+
+    @property
+    def age(self) -> float | None:
+        """Return the seconds since the stored session logged in."""
+        if self._state is None or self.created_at is None:
+            return None
+        return time.time() - self.created_at
+
+    async def async_save(
+        self,
+        state: dict[str, Any],
+        new_session: bool = True,
+        expected: dict[str, Any] | None = None,
+    ) -> bool:
+        """Store a state; new_session=False for cookies refreshed by the server.
+
+        With expected, the state is only replaced if it is still that one
+        (e.g. no login saved a newer session meanwhile); returns whether it
+        was stored.
+        """
+        if expected is not None and self._state is not expected:
+            return False
+        self._state = state
+        self._loaded = True
+        if new_session or self.created_at is None:
+            self.created_at = time.time()
+        await self._async_persist()
+        return True
+
+    async def async_clear(self, expected: dict[str, Any] | None = None) -> bool:
+        """Forget the stored state, e.g. after the server expired it.
+
+        With expected, only if the stored state is still that one.
+        """
+        if expected is not None and self._state is not expected:
+            return False
+        self._state = None
+        self._loaded = True
+        self.created_at = None
+        await self._async_persist()
+        return True
+
+    async def _async_persist(self) -> None:
+        """Write the current state to disk, if persistent."""
+        if self._path is None:
+            return
+        async with self._write_lock:
+            # Read under the lock, so the last write holds the latest state
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self._write,
+                {"state": self._state, "hints": self.hints, "created_at": self.created_at},
+            )
+
+    def _read(self) -> dict[str, Any] | None:
+        """Read the state file."""
+        try:
+            return json.loads(self._path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            _LOGGER.warning("Could not read session state: %s", err)
+            return None
+
+    def _write(self, stored: dict[str, Any]) -> None:
+        """Write the state file atomically; it holds credentials-equivalent cookies."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(".tmp")
+        with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            json.dump(stored, f)
+        os.replace(tmp, self._path)
@@ -0,0 +1,90 @@
+"""Share one in-flight scrape between concurrent callers for the same account."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Run at most one call per key; later callers await the same task.
+
+    The last result of each key is kept with its completion time, so callers
+    that accept a result up to max_age seconds old get it without a call.
+    A caller being cancelled does not cancel the shared task while others
+    still wait for its result; the last waiter leaving cancels it, so no
+    call keeps running for nobody.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._inflight: dict[Hashable, asyncio.Future[T]] = {}
+        self._results: dict[Hashable, tuple[float, T]] = {}
+        self._waiters: dict[asyncio.Future[T], int] = {}
+
+    def inflight(self, key: Hashable) -> asyncio.Future[T] | None:
+        """Return the call running for key, if any."""
+        return self._inflight.get(key)
+
+    def forget(self, key: Hashable) -> None:
+        """Drop the last result for key, so it is never returned as fresh."""
+        self._results.pop(key, None)
+
+    def fresh(self, key: Hashable, max_age: float) -> T | None:
+        """Return the last result for key if it is at most max_age old."""
+        if max_age <= 0 or (cached := self._results.get(key)) is None:
+            return None
+        finished, result = cached
+        return result if time.monotonic() - finished <= max_age else None
+
+    async def async_do(
+        self, key: Hashable, call: Callable[[], Awaitable[T]]
+    ) -> tuple[T, bool]:
+        """Await call(), or the call already running for key.
+
+        Returns the result and whether it was shared with another caller.
+        """
+        task = self._inflight.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, call))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task), shared
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    async def async_cancel(self, key: Hashable, timeout: float | None = None) -> None:
+        """Cancel the call running for key and wait until it has stopped.
+
+        Waiting matters to callers about to tear down what the call uses.
+        """
+        if (task := self._inflight.get(key)) is None:
+            return
+        task.cancel()
+        await asyncio.wait({task}, timeout=timeout)
+
+    async def _run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Run the call and remember its result."""
+        result = await call()
+        self._results[key] = (time.monotonic(), result)
+        return result
+
+    def _forget(self, key: Hashable, task: asyncio.Future[T]) -> None:
+        """Drop a finished task from the registry."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Retrieved here so a failure nobody awaited is not logged as lost
+            task.exception()
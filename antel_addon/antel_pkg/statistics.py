@@ -0,0 +1,129 @@
+"""Hourly usage samples kept locally for recorder long-term statistics."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .antel_scraper import AntelConsumoData
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+# Samples older than this are dropped; they have been imported long before
+_RETENTION = 90 * 24 * HOUR
+# Rows per import call, so a long backfill does not become one huge request
+STATISTICS_BATCH_SIZE = 500
+
+
+class UsageSamples:
+    """Record one usage sample per hour and hand out the rows not yet imported.
+
+    Each sample carries a running sum of consumed data: plan usage deltas
+    (a drop means the cycle renewed, so the new value is all new usage) plus
+    top-up balance decreases. The sum never goes down, which is what the
+    recorder expects of a has_sum statistic. Rows are only marked exported
+    after a successful import, so hours missed while Home Assistant was
+    unreachable are backfilled by the next call.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """Initialize the store; without a path it only lives in memory."""
+        self._path = Path(path) if path else None
+        self._loaded = False
+        self.samples: list[dict[str, Any]] = []
+        self.exported_until: int | None = None
+
+    async def async_load(self) -> None:
+        """Read the samples from disk once."""
+        if not self._loaded and self._path is not None:
+            stored = await asyncio.get_running_loop().run_in_executor(None, self._read)
+            if stored:
+                self.samples = stored.get("samples", [])
+                self.exported_until = stored.get("exported_until")
+        self._loaded = True
+
+    async def async_record(self, data: AntelConsumoData) -> None:
+        """Add the sample of a scrape, replacing an earlier one in the same hour."""
+        if data.used_data_gb is None:
+            return
+        await self.async_load()
+        fetched_at = data.fetched_at if data.fetched_at is not None else time.time()
+        start = int(fetched_at // HOUR * HOUR)
+        if self.samples and self.samples[-1]["start"] == start:
+            self.samples.pop()
+            if self.exported_until is not None and self.exported_until >= start:
+                # The hour changed after its import: send it again
+                self.exported_until = start - HOUR
+        if self.samples and self.samples[-1]["start"] > start:
+            return
+
+        used = data.used_data_gb
+        topup = data.topup_balance_gb
+        total = 0.0
+        if self.samples:
+            previous = self.samples[-1]
+            total = previous["sum"]
+            total += used - previous["used"] if used >= previous["used"] else used
+            if topup is not None and previous.get("topup") is not None:
+                total += max(0.0, previous["topup"] - topup)
+
+        self.samples.append(
+            {"start": start, "used": used, "topup": topup, "sum": round(total, 3)}
+        )
+        cutoff = start - _RETENTION
+        self.samples = [sample for sample in self.samples if sample["start"] >= cutoff]
+        await self._async_persist()
+
+    def pending(self) -> list[dict[str, Any]]:
+        """Return the samples not yet imported, oldest first."""
+        return [
+            sample
+            for sample in self.samples
+            if self.exported_until is None or sample["start"] > self.exported_until
+        ]
+
+    def batches(self) -> list[list[dict[str, Any]]]:
+        """Return the pending samples split into import-sized batches."""
+        pending = self.pending()
+        return [
+            pending[index : index + STATISTICS_BATCH_SIZE]
+            for index in range(0, len(pending), STATISTICS_BATCH_SIZE)
+        ]
+
+    async def async_mark_exported(self, rows: list[dict[str, Any]]) -> None:
+        """Remember that rows were imported."""
+        if rows:
+            self.exported_until = max(row["start"] for row in rows)
+            await self._async_persist()
+
+    async def _async_persist(self) -> None:
+        """Write the samples to disk, if persistent."""
+        if self._path is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self._write,
+                {"samples": self.samples, "exported_until": self.exported_until},
+            )
+
+    def _read(self) -> dict[str, Any] | None:
+        """Read the samples file."""
+        try:
+            return json.loads(self._path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            _LOGGER.warning("Could not read usage samples: %s", err)
+            return None
+
+    def _write(self, stored: dict[str, Any]) -> None:
+        """Write the samples file atomically."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(stored), encoding="utf-8")
+        os.replace(tmp, self._path)
@@ -1,32 +1,34 @@
 import asyncio
+import hmac
 import json
 import logging
 import os
+import signal
+import socket
 import sys
-import calendar
-from datetime import datetime, date
-from zoneinfo import ZoneInfo
+import time
+from datetime import datetime, timezone
 import requests
 from pathlib import Path
-
-# Global timezone (set from config)
-USER_TIMEZONE = None
-
-
-def get_local_date():
-    """Get today's date in user's timezone."""
-    if USER_TIMEZONE:
-        try:
-            tz = ZoneInfo(USER_TIMEZONE)
-            return datetime.now(tz).date()
-        except Exception:
-            pass
-    return date.today()
+from urllib.parse import parse_qs, urlsplit
 
 # Adjust path to find the package if needed
 sys.path.append("/app")
 
-from antel_pkg.antel_scraper import AntelScraper
+from antel_pkg.antel_scraper import AntelConsumoData, AntelScraper
+from antel_pkg.artifacts import ArtifactStore
+from antel_pkg.backends import PersistentProfileBackend, PlaywrightBackend, ScraperBackend
+from antel_pkg.billing import BillingCalendar
+from antel_pkg.cache import ResponseCache
+from antel_pkg.const import DEFAULT_MAX_BROWSER_MEMORY_MB
+from antel_pkg.instrumentation import Instrumentation
+from antel_pkg.keepalive import SessionKeepAlive
+from antel_pkg.memory import MemoryGovernor
+from antel_pkg.processes import kill_browsers, reap_zombies
+from antel_pkg.ratelimit import DEFAULT_REFRESH_BURST, TokenBucket
+from antel_pkg.session import SessionStore
+from antel_pkg.statistics import UsageSamples
+from antel_pkg.topups import TopupStore
 
 # Configure logging
 logging.basicConfig(
@@ -44,39 +46,36 @@ HEADERS = {
     "Content-Type": "application/json",
 }
 
+# Billing calendar in the configured timezone (set from config)
+CALENDAR = BillingCalendar()
+
+
+def get_local_date():
+    """Get today's date in user's timezone."""
+    return CALENDAR.today()
+
+
 # Daily tracking file
 DAILY_DATA_FILE = Path("/data/daily_tracking.json")
 
+# Last successful scrape, republished on startup
+LAST_DATA_FILE = Path("/data/last_data.json")
+
+# Top-up history, synced incrementally
+TOPUPS_FILE = Path("/data/topups.json")
+
+# Hourly usage samples, imported into the recorder's long-term statistics
+SAMPLES_FILE = Path("/data/samples.json")
+STATISTIC_ID = "antel_consumo:datos_consumidos"
+
+# Logged-in browser session, reused to skip the TuID login
+SESSION_FILE = Path("/data/session.json")
 
-def calculate_renewal_dates(renewal_day: int):
-    """Calculate next renewal date, days remaining, and days passed since last renewal."""
-    today = get_local_date()
-    # Clamp renewal_day to valid day in month
-    days_in_month = calendar.monthrange(today.year, today.month)[1]
-    renewal_day = max(1, min(int(renewal_day), 31))
-    day_this_month = min(renewal_day, days_in_month)
-
-    # Next renewal date
-    if today.day <= day_this_month:
-        renewal_date = date(today.year, today.month, day_this_month)
-    else:
-        year = today.year + (1 if today.month == 12 else 0)
-        month = 1 if today.month == 12 else today.month + 1
-        days_next_month = calendar.monthrange(year, month)[1]
-        renewal_date = date(year, month, min(renewal_day, days_next_month))
-
-    # Last renewal date
-    if today.day >= day_this_month:
-        last_renewal = date(today.year, today.month, day_this_month)
-    else:
-        year = today.year - (1 if today.month == 1 else 0)
-        month = 12 if today.month == 1 else today.month - 1
-        days_prev_month = calendar.monthrange(year, month)[1]
-        last_renewal = date(year, month, min(renewal_day, days_prev_month))
-
-    days_remaining = (renewal_date - today).days
-    days_passed = (today - last_renewal).days
-    return renewal_date, days_remaining, days_passed
+# Chromium profile kept between scrapes when browser_profile is on
+PROFILE_DIR = Path("/data/browser_profile")
+
+# Seconds before a scheduled scrape to pre-warm its browser context
+PREWARM_LEAD = 15
 
 
 def get_config():
@@ -89,12 +88,33 @@ def get_config():
             "scan_interval": 60,
             "service_id": "",
             "renewal_day": None,
-            "timezone": "America/Montevideo"
+            "timezone": "America/Montevideo",
+            "artifacts_dir": "/data/artifacts",
+            "artifacts_max_mb": 20,
+            "low_memory": True,
+            "browser_max_memory_mb": DEFAULT_MAX_BROWSER_MEMORY_MB,
+            "http_login": True,
+            "keepalive_minutes": 20,
+            "sniff_network": True,
+            "topup_alert_days": 3,
+            "statistics": True,
+            "control_port": 8099,
+            "refresh_per_hour": 6,
         }
     with open(config_path, "r") as f:
         return json.load(f)
 
 
+def write_json_atomic(path, payload):
+    """Write JSON through a temporary file, so a kill mid-write keeps the old file."""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(payload, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
 def load_daily_tracking():
     """Load daily tracking data from persistent storage."""
     if DAILY_DATA_FILE.exists():
@@ -109,8 +129,7 @@ def load_daily_tracking():
 def save_daily_tracking(data):
     """Save daily tracking data to persistent storage."""
     try:
-        with open(DAILY_DATA_FILE, "w") as f:
-            json.dump(data, f)
+        write_json_atomic(DAILY_DATA_FILE, data)
     except Exception as e:
         logger.error(f"Failed to save daily tracking: {e}")
 
@@ -159,6 +178,25 @@ def calculate_daily_topup_consumption(current_topup_gb: float) -> float:
     return round(daily_consumption, 2)
 
 
+def load_last_data():
+    """Load the last successful scrape result, if any."""
+    if LAST_DATA_FILE.exists():
+        try:
+            with open(LAST_DATA_FILE, "r") as f:
+                return AntelConsumoData.from_dict(json.load(f))
+        except Exception as e:
+            logger.warning(f"Failed to load last data: {e}")
+    return None
+
+
+def save_last_data(data):
+    """Persist a scrape result so it can be republished after a restart."""
+    try:
+        write_json_atomic(LAST_DATA_FILE, data.as_dict())
+    except Exception as e:
+        logger.error(f"Failed to save last data: {e}")
+
+
 def update_sensor(entity_id, state, attributes=None, unit=None, icon=None, device_class=None):
     """Update a sensor state via Supervisor API."""
     url = f"{SUPERVISOR_API}/states/sensor.{entity_id}"
@@ -185,8 +223,374 @@ def update_sensor(entity_id, state, attributes=None, unit=None, icon=None, devic
         logger.error(f"Failed to update sensor {entity_id}: {e}")
 
 
+def notify(title, message, notification_id):
+    """Create a persistent notification via Supervisor API."""
+    url = f"{SUPERVISOR_API}/services/persistent_notification/create"
+    payload = {"title": title, "message": message, "notification_id": notification_id}
+    try:
+        response = requests.post(url, headers=HEADERS, json=payload, timeout=10)
+        response.raise_for_status()
+    except Exception as e:
+        logger.error(f"Failed to create notification {notification_id}: {e}")
+
+
+def import_statistics(rows):
+    """Import hourly usage rows via the recorder.import_statistics service."""
+    url = f"{SUPERVISOR_API}/services/recorder/import_statistics"
+    payload = {
+        "statistic_id": STATISTIC_ID,
+        "source": STATISTIC_ID.split(":")[0],
+        "name": "Antel datos consumidos",
+        "unit_of_measurement": "GB",
+        "has_mean": False,
+        "has_sum": True,
+        "stats": [
+            {
+                "start": datetime.fromtimestamp(row["start"], timezone.utc).isoformat(),
+                "state": row["sum"],
+                "sum": row["sum"],
+            }
+            for row in rows
+        ],
+    }
+    try:
+        response = requests.post(url, headers=HEADERS, json=payload, timeout=30)
+        response.raise_for_status()
+        return True
+    except Exception as e:
+        logger.error(f"Failed to import statistics: {e}")
+        return False
+
+
+async def push_statistics(samples, data):
+    """Record a sample and import every hour the recorder does not have yet."""
+    await samples.async_record(data)
+    for rows in samples.batches():
+        if not await asyncio.to_thread(import_statistics, rows):
+            # Left pending; the next cycle backfills them
+            break
+        await samples.async_mark_exported(rows)
+        logger.info(f"Imported {len(rows)} hourly usage statistics")
+
+
+def publish_sensors(data, track_daily=True):
+    """Publish all sensors for a scrape result.
+
+    Blocking (one Supervisor request per sensor); run it in a worker thread.
+
+    track_daily is disabled when republishing a restored snapshot so stale
+    values never become the baseline of a new day.
+    """
+    # Update main sensors
+    if data.used_data_gb is not None:
+        update_sensor("antel_datos_usados", data.used_data_gb, unit="GB", icon="mdi:download")
+
+    if data.used_data_gb is not None and track_daily:
+        # Calculate and update daily consumption
+        daily_gb = calculate_daily_consumption(data.used_data_gb)
+        topup_daily = 0.0
+        if data.topup_balance_gb is not None:
+            topup_daily = calculate_daily_topup_consumption(data.topup_balance_gb)
+        total_daily = round(daily_gb + topup_daily, 2)
+        update_sensor(
+            "antel_consumo_hoy",
+            total_daily,
+            unit="GB",
+            icon="mdi:calendar-today",
+            attributes={
+                "state_class": "total_increasing",
+                "last_reset": get_local_date().isoformat(),
+                "consumo_plan": round(daily_gb, 2),
+                "consumo_recargas": round(topup_daily, 2)
+            }
+        )
+        logger.info(f"Daily consumption: {total_daily} GB (plan={daily_gb}, recargas={topup_daily})")
+
+    if data.total_data_gb is not None:
+        update_sensor("antel_datos_totales", data.total_data_gb, unit="GB", icon="mdi:database")
+
+    if data.remaining_data_gb is not None:
+        # Include top-up balance in remaining data if available
+        total_remaining = data.remaining_data_gb
+        if data.topup_balance_gb is not None:
+            total_remaining += data.topup_balance_gb
+        update_sensor("antel_datos_restantes", total_remaining, unit="GB", icon="mdi:database-check")
+
+    if data.topup_balance_gb is not None:
+        update_sensor("antel_saldo_recargas", data.topup_balance_gb, unit="GB", icon="mdi:database-plus")
+
+    if data.topup_expiration_date:
+        if data.topup_expires_on:
+            update_sensor(
+                "antel_recargas_vence",
+                data.topup_expires_on,
+                icon="mdi:calendar-end",
+                device_class="date",
+                attributes={"texto": data.topup_expiration_date},
+            )
+        else:
+            update_sensor("antel_recargas_vence", data.topup_expiration_date, icon="mdi:calendar-end")
+
+    if data.topups is not None:
+        update_sensor(
+            "antel_recargas_activas",
+            len(data.topups),
+            icon="mdi:database-plus-outline",
+            attributes={"recargas": data.topups},
+        )
+        if data.topups:
+            next_topup = data.topups[0]
+            update_sensor(
+                "antel_recarga_proxima_vence",
+                next_topup["expires_on"],
+                icon="mdi:calendar-end",
+                device_class="date",
+                attributes={
+                    "cantidad_gb": next_topup.get("amount_gb"),
+                    "restante_gb": next_topup.get("remaining_gb"),
+                },
+            )
+
+    if data.percentage_used is not None:
+        update_sensor("antel_porcentaje_usado", round(data.percentage_used, 1), unit="%", icon="mdi:percent")
+
+    if data.plan_name:
+        update_sensor("antel_plan", data.plan_name, icon="mdi:file-document")
+
+    if data.billing_period:
+        update_sensor(
+            "antel_periodo_facturacion",
+            data.billing_period,
+            icon="mdi:calendar",
+            attributes={"inicio": data.billing_period_start, "fin": data.billing_period_end},
+        )
+    if data.billing_period_start and data.billing_period_end:
+        update_sensor("antel_ciclo_inicio", data.billing_period_start, icon="mdi:calendar-start", device_class="date")
+        update_sensor("antel_ciclo_fin", data.billing_period_end, icon="mdi:calendar-end", device_class="date")
+
+    # Renewal sensors, from the configured renewal day or the scraped cycle
+    CALENDAR.update_from_text(data.billing_period)
+    renewal = CALENDAR.renewal_info()
+    if renewal:
+        try:
+            renewal_date, days_remaining, days_passed = renewal
+            update_sensor("antel_fecha_renovacion", renewal_date.isoformat(), icon="mdi:calendar")
+            update_sensor("antel_dias_hasta_renovacion", days_remaining, unit="días", icon="mdi:calendar-clock")
+            update_sensor("antel_dias_pasados_del_contrato", days_passed, unit="días", icon="mdi:calendar-check")
+
+            # Average usage sensors
+            if data.used_data_gb is not None and days_passed > 0:
+                avg_used = round(data.used_data_gb / days_passed, 2)
+                update_sensor("antel_promedio_uso_diario", avg_used, unit="GB/día", icon="mdi:chart-line")
+            if data.remaining_data_gb is not None and days_remaining > 0:
+                avg_remaining = round(data.remaining_data_gb / days_remaining, 2)
+                update_sensor("antel_promedio_restante_diario", avg_remaining, unit="GB/día", icon="mdi:chart-timeline-variant")
+        except Exception as e:
+            logger.warning(f"Failed to calculate renewal_day sensors: {e}")
+
+
+class Shutdown:
+    """Turn SIGTERM/SIGINT into an orderly stop.
+
+    Only the scrape itself is cancelled; publishing, statistics and the
+    tracking files run to completion (they are not awaited across a signal),
+    then the loop exits and the browser is closed within a bounded time.
+    """
+
+    def __init__(self, controller):
+        self.requested = False
+        self._controller = controller
+        self._scrape = None
+
+    def install(self):
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self.request, signum)
+
+    def request(self, signum=None):
+        if self.requested:
+            return
+        self.requested = True
+        logger.info(f"Received {signal.Signals(signum).name if signum else 'stop'}, shutting down")
+        if self._scrape is not None and not self._scrape.done():
+            self._scrape.cancel()
+        self._controller.wake()
+
+    async def scrape(self, coro, timeout):
+        """Run a scrape that a shutdown may cancel."""
+        self._scrape = asyncio.ensure_future(asyncio.wait_for(coro, timeout=timeout))
+        try:
+            return await self._scrape
+        finally:
+            self._scrape = None
+
+
+class RefreshController:
+    """Let the control endpoint wake the scrape loop and wait for its result.
+
+    A refresh joins the cycle already running, or wakes the loop and waits
+    for the next one, so concurrent requests never start extra scrapes.
+    """
+
+    def __init__(self, bucket, tokens=()):
+        self.bucket = bucket
+        # Bearer tokens accepted by the endpoint; empty ones are ignored
+        self._tokens = [token for token in tokens if token]
+        self.last_data = None
+        self._wakeup = asyncio.Event()
+        self._running = None
+        self._next = None
+        self._stopping = False
+
+    def start_cycle(self):
+        """Mark a scrape cycle as running; return the future it resolves."""
+        self._running = self._next or asyncio.get_running_loop().create_future()
+        self._next = None
+        self._wakeup.clear()
+        return self._running
+
+    def finish_cycle(self, data):
+        """Resolve the running cycle with its data (None if it failed)."""
+        if data is not None:
+            self.last_data = data
+        if self._running is not None and not self._running.done():
+            self._running.set_result(data)
+        self._running = None
+
+    def wake(self):
+        """End the current wait early (on shutdown)."""
+        self._stopping = True
+        self._wakeup.set()
+
+    async def wait(self, timeout):
+        """Sleep until the next scheduled cycle or an on-demand refresh.
+
+        Returns True if woken before the timeout.
+        """
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            if not self._stopping:
+                logger.info("On-demand refresh requested")
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def is_fresh(self, max_age):
+        """Return True if the last data is at most max_age seconds old."""
+        data = self.last_data
+        return (
+            data is not None
+            and data.fetched_at is not None
+            and time.time() - data.fetched_at <= max_age
+        )
+
+    async def refresh(self, max_age):
+        """Return (status, data) after making sure data is at most max_age old."""
+        if self.is_fresh(max_age):
+            return "fresh", self.last_data
+        cycle = self._running or self._next
+        if cycle is None:
+            if not self.bucket.try_acquire():
+                return "rate_limited", self.last_data
+            cycle = self._next = asyncio.get_running_loop().create_future()
+            self._wakeup.set()
+        data = await asyncio.shield(cycle)
+        return ("refreshed", data) if data is not None else ("failed", self.last_data)
+
+    def authorized(self, header):
+        """Return True if an Authorization header carries an accepted token."""
+        scheme, _, token = (header or "").partition(" ")
+        return scheme.lower() == "bearer" and any(
+            hmac.compare_digest(token.strip().encode(), accepted.encode())
+            for accepted in self._tokens
+        )
+
+    async def handle(self, reader, writer):
+        """Serve POST /refresh?max_age=<seconds> with a JSON answer.
+
+        Each refresh may log in and start Chromium, so callers must send
+        "Authorization: Bearer <token>".
+        """
+        try:
+            status, body, headers = await self._respond(reader)
+            payload = json.dumps(body).encode()
+            reason = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+                      405: "Method Not Allowed", 429: "Too Many Requests",
+                      500: "Internal Server Error", 502: "Bad Gateway"}[status]
+            head = f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+            head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+            head += f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n"
+            writer.write(head.encode() + payload)
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"Control request failed: {e}")
+        finally:
+            # Also on a dropped client, so no socket is left open
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _respond(self, reader):
+        """Read one request; return (status, body, headers) for its answer."""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=10)
+            authorization = None
+            while line := (await asyncio.wait_for(reader.readline(), timeout=10)).strip():
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "authorization":
+                    authorization = value.strip()
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            url = urlsplit(target)
+            if not self.authorized(authorization):
+                return 401, {"error": "unauthorized"}, {"WWW-Authenticate": "Bearer"}
+            if url.path != "/refresh":
+                return 404, {"error": "not found"}, {}
+            if method != "POST":
+                return 405, {"error": "use POST"}, {"Allow": "POST"}
+            query = parse_qs(url.query)
+            max_age = float(query.get("max_age", ["0"])[0])
+            result, data = await self.refresh(max_age)
+        except (ValueError, asyncio.TimeoutError) as err:
+            return 400, {"error": str(err) or "bad request"}, {}
+        except Exception as err:
+            logger.error(f"Control request failed: {err}")
+            return 500, {"error": "internal error"}, {}
+
+        if result == "rate_limited":
+            retry_after = str(int(self.bucket.retry_after()) + 1)
+            return 429, {"status": result, "data": public_data(data)}, {"Retry-After": retry_after}
+        status = 502 if result == "failed" else 200
+        return status, {"status": result, "data": public_data(data)}, {}
+
+
+def internal_address():
+    """Return the add-on's address on the Supervisor's internal network.
+
+    Binding there instead of 0.0.0.0 keeps the endpoint off any other
+    interface the container may get.
+    """
+    try:
+        return socket.gethostbyname(socket.gethostname())
+    except OSError:
+        return "127.0.0.1"
+
+
+def public_data(data):
+    """Return data for the control endpoint, without the raw page text."""
+    if data is None:
+        return None
+    result = data.as_dict()
+    result.pop("raw_data", None)
+    return result
+
+
 async def main():
+    started = time.monotonic()
     logger.info("Antel Consumo Add-on started")
+    # Browsers of a run killed mid-scrape would otherwise live on with us
+    kill_browsers()
     
     config = get_config()
     username = config.get("username")
@@ -194,118 +598,223 @@ async def main():
     scan_interval = config.get("scan_interval", 60)  # Minutes
     service_id = config.get("service_id", "")
     renewal_day = config.get("renewal_day", None)
+    artifacts_dir = config.get("artifacts_dir") or "/data/artifacts"
+    artifacts_max_mb = config.get("artifacts_max_mb", 20)
+    low_memory = config.get("low_memory", True)
+    browser_max_memory_mb = config.get("browser_max_memory_mb") or DEFAULT_MAX_BROWSER_MEMORY_MB
+    http_login = config.get("http_login", True)
+    keepalive_minutes = config.get("keepalive_minutes", 20)
+    sniff_network = config.get("sniff_network", True)
+    topup_alert_days = config.get("topup_alert_days", 3)
+    statistics = config.get("statistics", True)
+    control_port = config.get("control_port", 8099)
+    refresh_per_hour = config.get("refresh_per_hour", 6)
+    control_token = config.get("control_token", "")
+    prewarm = config.get("prewarm", True)
+    browser_profile = config.get("browser_profile", False)
+    profile_max_mb = config.get("profile_max_mb", 150)
     
     # Set global timezone
-    global USER_TIMEZONE
-    USER_TIMEZONE = config.get("timezone", "America/Montevideo")
-    logger.info(f"Using timezone: {USER_TIMEZONE}")
+    global CALENDAR
+    user_timezone = config.get("timezone") or "America/Montevideo"
+    CALENDAR = BillingCalendar(renewal_day, user_timezone)
+    logger.info(f"Using timezone: {user_timezone}")
     logger.info(f"Config: service_id={service_id}, renewal_day={renewal_day}")
     
     if not username or not password:
         logger.error("Username and password are required in configuration")
         return
 
-    while True:
+    # Shared across attempts so screenshot rate limits survive scraper restarts
+    artifact_store = ArtifactStore(artifacts_dir, max_bytes=int(artifacts_max_mb) * 1024 * 1024)
+    session_store = SessionStore(SESSION_FILE)
+    metrics = Instrumentation()
+    # One governor for the whole run so peak/steady figures span all scrapes
+    governor = MemoryGovernor(browser_max_memory_mb)
+    response_cache = ResponseCache(metrics)
+    topup_store = TopupStore(TOPUPS_FILE)
+    samples = UsageSamples(SAMPLES_FILE)
+
+    keepalive = None
+    if keepalive_minutes:
+        keepalive = SessionKeepAlive(
+            ScraperBackend(), session_store, interval=keepalive_minutes * 60, instrumentation=metrics
+        )
+        keepalive.start()
+        logger.info(f"Session keep-alive every {keepalive_minutes} minutes")
+
+    # Publish the last known values right away; the first scrape takes minutes
+    first_state_logged = False
+    last_data = load_last_data()
+    published_on = None
+    if last_data is not None:
+        await asyncio.to_thread(publish_sensors, last_data, False)
+        first_state_logged = True
+        logger.info(f"Restored last known data; first state after {time.monotonic() - started:.2f}s")
+
+    controller = RefreshController(
+        TokenBucket(refresh_per_hour / 3600, DEFAULT_REFRESH_BURST),
+        tokens=(control_token, SUPERVISOR_TOKEN),
+    )
+    controller.last_data = last_data
+    shutdown = Shutdown(controller)
+    shutdown.install()
+    server = None
+    if control_port:
+        control_host = internal_address()
+        server = await asyncio.start_server(controller.handle, control_host, control_port)
+        logger.info(f"Control endpoint: POST http://{control_host}:{control_port}/refresh?max_age=<s>")
+        if not control_token:
+            logger.info("No control_token set: only the Supervisor token is accepted")
+
+    def make_backend():
+        if browser_profile:
+            return PersistentProfileBackend(PROFILE_DIR, profile_max_mb, low_memory=low_memory)
+        return PlaywrightBackend(low_memory=low_memory)
+
+    def make_scraper():
+        return AntelScraper(
+            username,
+            password,
+            service_id if service_id else None,
+            artifact_store=artifact_store,
+            session_store=session_store,
+            instrumentation=metrics,
+            backend=make_backend(),
+            memory_governor=governor,
+            http_login=http_login,
+            response_cache=response_cache,
+            sniff_network=sniff_network,
+            topup_store=topup_store,
+            local_today=get_local_date,
+        )
+
+    # Scraper of the next cycle, created early when its context is pre-warmed
+    next_scraper = None
+    while not shutdown.requested:
         success = False
+        cycle_data = None
+        controller.start_cycle()
         for attempt in range(1, 4):
+            if shutdown.requested:
+                break
             logger.info(f"Starting scrape attempt {attempt}/3...")
-            scraper = AntelScraper(username, password, service_id if service_id else None)
+            scraper, next_scraper = next_scraper or make_scraper(), None
             try:
-                data = await asyncio.wait_for(scraper.get_consumption_data(), timeout=300)
+                data = await shutdown.scrape(scraper.get_consumption_data(), timeout=300)
 
                 if not data or (data.used_data_gb is None and data.total_data_gb is None and data.remaining_data_gb is None):
                     raise ValueError("No valid data returned from scrape")
 
-                # Update main sensors
-                if data.used_data_gb is not None:
-                    update_sensor("antel_datos_usados", data.used_data_gb, unit="GB", icon="mdi:download")
-
-                    # Calculate and update daily consumption
-                    daily_gb = calculate_daily_consumption(data.used_data_gb)
-                    topup_daily = 0.0
-                    if data.topup_balance_gb is not None:
-                        topup_daily = calculate_daily_topup_consumption(data.topup_balance_gb)
-                    total_daily = round(daily_gb + topup_daily, 2)
-                    update_sensor(
-                        "antel_consumo_hoy",
-                        total_daily,
-                        unit="GB",
-                        icon="mdi:calendar-today",
-                        attributes={
-                            "state_class": "total_increasing",
-                            "last_reset": date.today().isoformat(),
-                            "consumo_plan": round(daily_gb, 2),
-                            "consumo_recargas": round(topup_daily, 2)
-                        }
-                    )
-                    logger.info(f"Daily consumption: {total_daily} GB (plan={daily_gb}, recargas={topup_daily})")
-
-                if data.total_data_gb is not None:
-                    update_sensor("antel_datos_totales", data.total_data_gb, unit="GB", icon="mdi:database")
-
-                if data.remaining_data_gb is not None:
-                    # Include top-up balance in remaining data if available
-                    total_remaining = data.remaining_data_gb
-                    if data.topup_balance_gb is not None:
-                        total_remaining += data.topup_balance_gb
-                    update_sensor("antel_datos_restantes", total_remaining, unit="GB", icon="mdi:database-check")
-
-                if data.topup_balance_gb is not None:
-                    update_sensor("antel_saldo_recargas", data.topup_balance_gb, unit="GB", icon="mdi:database-plus")
-
-                if data.topup_expiration_date:
-                    update_sensor("antel_recargas_vence", data.topup_expiration_date, icon="mdi:calendar-end")
-
-                if data.percentage_used is not None:
-                    update_sensor("antel_porcentaje_usado", round(data.percentage_used, 1), unit="%", icon="mdi:percent")
-
-                if data.plan_name:
-                    update_sensor("antel_plan", data.plan_name, icon="mdi:file-document")
-
-                if data.billing_period:
-                    update_sensor("antel_periodo_facturacion", data.billing_period, icon="mdi:calendar")
-
-                # Configurable renewal day sensors
-                if renewal_day:
-                    try:
-                        renewal_date, days_remaining, days_passed = calculate_renewal_dates(int(renewal_day))
-                        update_sensor("antel_fecha_renovacion", renewal_date.isoformat(), icon="mdi:calendar")
-                        update_sensor("antel_dias_hasta_renovacion", days_remaining, unit="días", icon="mdi:calendar-clock")
-                        update_sensor("antel_dias_pasados_del_contrato", days_passed, unit="días", icon="mdi:calendar-check")
-
-                        # Average usage sensors
-                        if data.used_data_gb is not None and days_passed > 0:
-                            avg_used = round(data.used_data_gb / days_passed, 2)
-                            update_sensor("antel_promedio_uso_diario", avg_used, unit="GB/día", icon="mdi:chart-line")
-                        if data.remaining_data_gb is not None and days_remaining > 0:
-                            avg_remaining = round(data.remaining_data_gb / days_remaining, 2)
-                            update_sensor("antel_promedio_restante_diario", avg_remaining, unit="GB/día", icon="mdi:chart-timeline-variant")
-                    except Exception as e:
-                        logger.warning(f"Failed to calculate renewal_day sensors: {e}")
+                # Same values on the same day: the sensors already show them
+                if data == last_data and published_on == get_local_date():
+                    metrics.incr("publish_skipped")
+                    logger.info("Data unchanged, skipping sensor updates")
+                else:
+                    await asyncio.to_thread(publish_sensors, data)
+                    save_last_data(data)
+                    last_data = data
+                    published_on = get_local_date()
+                if not first_state_logged:
+                    first_state_logged = True
+                    logger.info(f"First state after {time.monotonic() - started:.2f}s")
+
+                if statistics:
+                    await push_statistics(samples, data)
+
+                if topup_alert_days and scraper.topups is not None:
+                    for topup in await scraper.topups.async_pop_expiring(get_local_date(), topup_alert_days):
+                        await asyncio.to_thread(
+                            notify,
+                            "Antel: recarga por vencer",
+                            f"La recarga de {topup.get('amount_gb')} GB vence el {topup['expires_on']}.",
+                            f"antel_recarga_{topup['id']}",
+                        )
 
                 logger.info("Scrape finished successfully. Data updated.")
+                logger.info(
+                    "Scrape stages: "
+                    + ", ".join(f"{name}={secs:.1f}s" for name, secs in metrics.stages.items())
+                    + f"; counters: {metrics.counters}"
+                )
+                if "http_cache_requests" in metrics.gauges:
+                    gauges = metrics.gauges
+                    logger.info(
+                        f"Browser cache: {gauges['http_cache_hit_ratio']:.0%} of "
+                        f"{gauges['http_cache_requests']:.0f} requests, "
+                        f"{gauges['http_cache_saved_kb']:.0f} KB saved, "
+                        f"{gauges['http_cache_downloaded_kb']:.0f} KB downloaded; "
+                        f"profile {gauges.get('browser_profile_mb', 0):.0f} MB"
+                    )
+                if governor.last_mb is not None:
+                    logger.info(
+                        f"Browser memory: last={governor.last_mb:.0f} MB, peak={governor.peak_mb:.0f} MB, "
+                        f"steady={governor.steady_mb or 0:.0f} MB"
+                    )
                 success = True
+                cycle_data = data
                 break
 
+            except asyncio.CancelledError:
+                if not shutdown.requested:
+                    raise
+                logger.info(f"Scrape attempt {attempt} cancelled by shutdown")
             except asyncio.TimeoutError:
                 logger.error(f"Error during scrape attempt {attempt}: timeout after 300s")
-                if attempt < 3:
-                    await asyncio.sleep(30)
+                if attempt < 3 and not shutdown.requested:
+                    await controller.wait(30)
             except Exception as e:
                 logger.error(f"Error during scrape attempt {attempt}: {e}")
-                if attempt < 3:
-                    await asyncio.sleep(30)
+                if attempt < 3 and not shutdown.requested:
+                    await controller.wait(30)
             finally:
+                # Cancels and awaits a scrape still running before closing
                 try:
                     await scraper.close()
                 except Exception as close_err:
                     logger.warning(f"Error closing scraper after attempt {attempt}: {close_err}")
+                reap_zombies()
 
+        controller.finish_cycle(cycle_data)
+        if shutdown.requested:
+            break
         if not success:
             logger.error("All 3 scrape attempts failed. Waiting until next cycle.")
 
         logger.info(f"Sleeping for {scan_interval} minutes...")
-        await asyncio.sleep(scan_interval * 60)
+        if not prewarm or scan_interval * 60 <= PREWARM_LEAD:
+            await controller.wait(scan_interval * 60)
+            continue
+        if await controller.wait(scan_interval * 60 - PREWARM_LEAD) or shutdown.requested:
+            continue
+        # Launch Chromium and connect to Mi Antel while nothing waits on it;
+        # skipped by the scraper when the last scrape did not need a browser
+        next_scraper = make_scraper()
+        try:
+            if await shutdown.scrape(next_scraper.prewarm(), timeout=PREWARM_LEAD * 4):
+                logger.info("Browser context pre-warmed for the next scrape")
+        except asyncio.CancelledError:
+            if not shutdown.requested:
+                raise
+        except Exception as e:
+            logger.debug(f"Pre-warm failed: {e}")
+        await controller.wait(PREWARM_LEAD)
+
+    # Orderly stop: no new requests, flush state, make sure no browser survives
+    if next_scraper is not None:
+        try:
+            await next_scraper.close()
+        except Exception as close_err:
+            logger.warning(f"Error closing the pre-warmed scraper: {close_err}")
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    if keepalive is not None:
+        await keepalive.async_stop()
+    if controller.last_data is not None:
+        save_last_data(controller.last_data)
+    kill_browsers()
+    logger.info("Antel Consumo Add-on stopped")
 
 
 if __name__ == "__main__":
@@ -6,29 +6,62 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN
 from .coordinator import AntelConsumoCoordinator
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Antel Consumo services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Antel Consumo from a config entry."""
     coordinator = AntelConsumoCoordinator(hass, entry)
 
-    await coordinator.async_config_entry_first_refresh()
+    # Entities start from the last stored snapshot; a full login and scrape
+    # takes minutes, so it must not hold up Home Assistant startup.
+    await coordinator.async_restore()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    entry.async_on_unload(
+        async_track_time_change(hass, coordinator.async_new_day, hour=0, minute=0, second=0)
+    )
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN}_first_refresh"
+    )
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running coordinator, without a reload."""
+    coordinator: AntelConsumoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    service_id = coordinator.scraper.service_id
+    coordinator.apply_options(entry.options)
+    coordinator.async_update_listeners()
+    if coordinator.scraper.service_id != service_id:
+        # The current values belong to the previous service
+        await coordinator.async_request_refresh()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
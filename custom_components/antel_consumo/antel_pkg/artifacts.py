@@ -0,0 +1,125 @@
+"""Bounded store for failure screenshots and HTML dumps."""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+DEFAULT_SCREENSHOT_INTERVAL = 6 * 3600
+
+# Per-request tokens that would make every dump of the same error page unique
+_VOLATILE_RE = re.compile(
+    r'(name="javax\.faces\.ViewState"[^>]*value=")[^"]*(")|(nonce=")[^"]*(")',
+    re.IGNORECASE,
+)
+
+
+class ArtifactStore:
+    """Store failure artifacts under a size and age cap.
+
+    HTML dumps are gzip-compressed and deduplicated by content hash, so an
+    outage that keeps returning the same error page only keeps one copy.
+    Screenshots are rate-limited per error type and evicted oldest-first
+    together with the HTML once the store exceeds its budget.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+        screenshot_interval: float = DEFAULT_SCREENSHOT_INTERVAL,
+    ) -> None:
+        """Initialize the store."""
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._screenshot_interval = screenshot_interval
+        self._last_screenshot: dict[str, float] = {}
+
+    @property
+    def directory(self) -> Path:
+        """Return the directory artifacts are written to."""
+        return self._directory
+
+    async def async_capture(self, page: Page, error_type: str) -> None:
+        """Save the page HTML and, if not rate-limited, a screenshot."""
+        try:
+            html = await page.content()
+        except Exception:
+            html = None
+
+        screenshot = None
+        now = time.time()
+        if now - self._last_screenshot.get(error_type, 0) >= self._screenshot_interval:
+            try:
+                screenshot = await page.screenshot(type="jpeg", quality=60)
+                self._last_screenshot[error_type] = now
+            except Exception:
+                screenshot = None
+
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._save, error_type, html, screenshot, now
+        )
+
+    def _save(
+        self,
+        error_type: str,
+        html: str | None,
+        screenshot: bytes | None,
+        now: float,
+    ) -> None:
+        """Write artifacts to disk and enforce the store limits."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        if html is not None:
+            normalized = _VOLATILE_RE.sub(r"\1\2\3\4", html)
+            digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+            path = self._directory / f"antel_{error_type}_{digest}.html.gz"
+            if path.exists():
+                # Identical page already stored: just mark it as recently used
+                os.utime(path, (now, now))
+                _LOGGER.debug("Artifact %s already stored", path.name)
+            else:
+                path.write_bytes(gzip.compress(html.encode("utf-8")))
+                _LOGGER.info("Saved %s HTML to %s", error_type, path)
+
+        if screenshot:
+            path = self._directory / f"antel_{error_type}_{int(now)}.jpg"
+            path.write_bytes(screenshot)
+            _LOGGER.info("Saved %s screenshot to %s", error_type, path)
+
+        self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Drop expired artifacts, then evict least recently used over budget."""
+        entries: list[tuple[float, int, Path]] = []
+        for path in self._directory.glob("antel_*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self._max_age:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        while total > self._max_bytes and entries:
+            _, size, path = entries.pop(0)
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,96 @@
+"""Content-addressed cache of the last scrape result."""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import re
+import time
+from typing import TYPE_CHECKING, Any
+
+from .instrumentation import Instrumentation
+
+if TYPE_CHECKING:
+    from .antel_scraper import AntelConsumoData
+
+# Tokens that change on every render without the data changing
+_VOLATILE_RE = re.compile(
+    r'name="javax\.faces\.ViewState"[^>]*value="[^"]*"|nonce="[^"]*"|\bid="j_idt[^"]*"',
+    re.IGNORECASE,
+)
+
+
+def content_hash(html: str) -> str:
+    """Return a stable hash of an HTML fragment."""
+    normalized = " ".join(_VOLATILE_RE.sub("", html).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Remember the last result together with its content hash and validators.
+
+    When the service card hashes the same as last time, extraction and every
+    downstream stage can be skipped; ETag/Last-Modified are replayed as
+    conditional headers on the HTTP path.
+    """
+
+    def __init__(self, instrumentation: Instrumentation | None = None) -> None:
+        """Initialize an empty cache."""
+        self._metrics = instrumentation or Instrumentation()
+        self._digest: str | None = None
+        self._data: AntelConsumoData | None = None
+        self._validators: dict[str, str] = {}
+
+    def bind(self, instrumentation: Instrumentation) -> None:
+        """Publish hit/miss counters to the given instrumentation."""
+        self._metrics = instrumentation
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return If-None-Match/If-Modified-Since headers for the cached page."""
+        if self._data is None:
+            return {}
+        headers = {}
+        if etag := self._validators.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := self._validators.get("last-modified"):
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def lookup(self, digest: str | None) -> AntelConsumoData | None:
+        """Return a fresh copy of the cached data if digest matches.
+
+        digest=None means the server answered 304 Not Modified.
+        """
+        if self._data is not None and (digest is None or digest == self._digest):
+            self._record("cache_hit")
+            return dataclasses.replace(self._data, fetched_at=time.time())
+        self._record("cache_miss")
+        return None
+
+    def clear(self) -> None:
+        """Forget the cached result, e.g. when another service is selected."""
+        self._digest = None
+        self._data = None
+        self._validators = {}
+
+    def store(
+        self,
+        digest: str,
+        data: AntelConsumoData,
+        headers: dict[str, Any] | None = None,
+    ) -> None:
+        """Cache a freshly extracted result."""
+        self._digest = digest
+        self._data = data
+        data.content_hash = digest
+        self._validators = {
+            key: value
+            for key, value in (headers or {}).items()
+            if key.lower() in ("etag", "last-modified")
+        }
+
+    def _record(self, counter: str) -> None:
+        """Count a hit or miss and publish the running hit rate."""
+        self._metrics.incr(counter)
+        rate = self._metrics.ratio("cache_hit", "cache_miss")
+        if rate is not None:
+            self._metrics.gauge("cache_hit_rate", round(rate, 3))
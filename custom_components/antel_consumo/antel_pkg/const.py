@@ -0,0 +1,27 @@
+"""Constants for the Antel scraper package."""
+
+# URLs
+ANTEL_LOGIN_URL = (
+    "https://www.antel.com.uy/acceder/-/login/openid_connect_request"
+    "?p_p_state=maximized"
+    "&_com_liferay_login_web_portlet_LoginPortlet_saveLastPath=false"
+    "&_com_liferay_login_web_portlet_LoginPortlet_redirect=/"
+    "&_com_liferay_login_web_portlet_LoginPortlet_OPEN_ID_CONNECT_PROVIDER_NAME=TuID"
+)
+ANTEL_CONSUMO_INTERNET_URL = "https://aplicaciones.antel.com.uy/miAntel/consumo/internet"
+ANTEL_BASE_URL = "https://aplicaciones.antel.com.uy"
+ANTEL_HOME_URL = f"{ANTEL_BASE_URL}/miAntel/"
+# Detail of data top-ups (recargas): each purchase and its expiry
+ANTEL_RECARGAS_URL = f"{ANTEL_BASE_URL}/miAntel/consumo/recargas"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Chromium is restarted once the driver and browser exceed this RSS
+DEFAULT_MAX_BROWSER_MEMORY_MB = 600
+
+# Upper bound for closing a context or the browser; a wedged Chromium must
+# not hold up a shutdown or the next scrape
+BROWSER_CLOSE_TIMEOUT = 15
@@ -0,0 +1,355 @@
+"""Browser-free parsing of Mi Antel pages."""
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from collections.abc import Collection
+from html.parser import HTMLParser
+from typing import Any
+
+_DATA_VALUE_RE = re.compile(r"([\d.,]+)\s*(GB|MB|TB|KB)?", re.IGNORECASE)
+_SERVICE_BOX_RE = re.compile(r'<div[^>]+class="[^"]*\bservicioBox\b', re.IGNORECASE)
+
+_REMAINING_RE = re.compile(r"Me quedan\s*([\d.,]+)\s*(GB|MB|TB)", re.IGNORECASE)
+_USED_RE = re.compile(r"Consumidos\s*([\d.,]+\s*(?:GB|MB|TB))", re.IGNORECASE)
+_TOTAL_RE = re.compile(r"Incluido\s*([\d.,]+\s*(?:GB|MB|TB))", re.IGNORECASE)
+_TOPUP_RES = (
+    re.compile(r"Saldo de recargas[\.:]?\s*([\d.,]+)\s*GB", re.IGNORECASE),
+    re.compile(r"Recarga datos.*?Me quedan\s*([\d.,]+)\s*GB", re.IGNORECASE | re.DOTALL),
+)
+_EXPIRATION_RES = (
+    re.compile(r"Vence el\s*(\d{1,2}/\d{1,2}/\d{4})", re.IGNORECASE),
+    re.compile(r"Vence el\s*(\d{1,2}\s+de\s+\w+(?:\s+\d{4})?)", re.IGNORECASE),
+)
+_BILLING_RE = re.compile(r"Ciclo actual:\s*([^\n]+)")
+_PLAN_RE = re.compile(r"(Fibra[^\n]+)")
+
+# How much an extracted value is trusted, by where it came from
+CONFIDENCE = {
+    "selector": 1.0,
+    "progress_label": 0.95,
+    "card_text": 0.8,
+    "body_text": 0.5,
+}
+
+_BLOCK_TAGS = frozenset(
+    {"br", "div", "p", "li", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6", "span", "small"}
+)
+
+
+def parse_data_value(text: str | None) -> float | None:
+    """Parse data value from text (e.g., '15.5 GB' -> 15.5)."""
+    if not text:
+        return None
+
+    # Remove whitespace and normalize
+    text = text.strip().upper()
+
+    # Try to extract number and unit
+    match = _DATA_VALUE_RE.search(text)
+    if match:
+        value = float(match.group(1).replace(',', '.'))
+        unit = match.group(2) or 'GB'
+
+        # Convert to GB
+        if unit == 'TB':
+            return value * 1024
+        elif unit == 'MB':
+            return value / 1024
+        elif unit == 'KB':
+            return value / (1024 * 1024)
+        else:  # GB
+            return value
+
+    return None
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text, one line per block element."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in ("script", "style"):
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Return the visible text of an HTML document, similar to innerText."""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def select_service_card_html(html: str, filter_text: str) -> str | None:
+    """Return the HTML of the first .servicioBox containing filter_text."""
+    starts = [match.start() for match in _SERVICE_BOX_RE.finditer(html)]
+    if not starts:
+        return None
+    cards = [html[start:end] for start, end in zip(starts, starts[1:] + [len(html)])]
+    pattern = re.compile(re.escape(filter_text), re.IGNORECASE)
+    for card in cards:
+        if pattern.search(card):
+            return card
+    return cards[0]
+
+
+# Service identifiers as shown on the cards, e.g. "ZU3367"
+_SERVICE_ID_RE = re.compile(r"\b[A-Z]{2}\d{4,}\b")
+
+
+def list_services(html: str) -> list[dict[str, str]]:
+    """Return the services on the dashboard as {"id", "name"} dicts.
+
+    The id is what service_id filters cards by: the card's identifier when it
+    shows one, else its first line of text.
+    """
+    starts = [match.start() for match in _SERVICE_BOX_RE.finditer(html)]
+    services: list[dict[str, str]] = []
+    seen: set[str] = set()
+    for start, end in zip(starts, starts[1:] + [len(html)]):
+        lines = html_to_text(html[start:end]).splitlines()
+        if not lines:
+            continue
+        match = _SERVICE_ID_RE.search("\n".join(lines))
+        service_id = match.group(0) if match else lines[0]
+        if service_id not in seen:
+            seen.add(service_id)
+            services.append({"id": service_id, "name": lines[0]})
+    return services
+
+
+def provenance(source: str, matcher: str, confidence: float | None = None) -> dict[str, Any]:
+    """Describe where a field value came from."""
+    return {
+        "source": source,
+        "matcher": matcher,
+        "confidence": CONFIDENCE[source] if confidence is None else confidence,
+    }
+
+
+def extract_from_text(
+    card_text: str | None, body_text: str | None
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, dict[str, Any]]]:
+    """Extract consumption fields from card and body text.
+
+    Returns the parsed values keyed like AntelConsumoData fields, the raw
+    strings they were parsed from, and the provenance of each value.
+    """
+    values: dict[str, Any] = {}
+    raw: dict[str, Any] = {}
+    sources: dict[str, dict[str, Any]] = {}
+    card_text = card_text or ""
+    body_text = body_text or ""
+    text = card_text or body_text
+    text_source = "card_text" if card_text else "body_text"
+
+    if match := _REMAINING_RE.search(text):
+        raw["remaining_text"] = f"{match.group(1)} {match.group(2)}"
+        values["remaining_data_gb"] = parse_data_value(raw["remaining_text"])
+        sources["remaining_data_gb"] = provenance(text_source, _REMAINING_RE.pattern)
+    if match := _USED_RE.search(text):
+        raw["used_label"] = f"Consumidos {match.group(1)}"
+        values["used_data_gb"] = parse_data_value(match.group(1))
+        sources["used_data_gb"] = provenance(text_source, _USED_RE.pattern)
+    if match := _TOTAL_RE.search(text):
+        raw["total_label"] = f"Incluido {match.group(1)}"
+        values["total_data_gb"] = parse_data_value(match.group(1))
+        sources["total_data_gb"] = provenance(text_source, _TOTAL_RE.pattern)
+
+    for regex in _TOPUP_RES:
+        if match := regex.search(card_text):
+            raw["topup_text"] = match.group(1).strip() + " GB"
+            values["topup_balance_gb"] = parse_data_value(raw["topup_text"])
+            sources["topup_balance_gb"] = provenance("card_text", regex.pattern)
+            break
+    for regex in _EXPIRATION_RES:
+        if match := regex.search(card_text):
+            values["topup_expiration_date"] = raw["topup_expiration"] = match.group(1).strip()
+            sources["topup_expiration_date"] = provenance("card_text", regex.pattern)
+            break
+
+    if match := _BILLING_RE.search(body_text):
+        values["billing_period"] = raw["billing_period"] = match.group(1).strip()
+        sources["billing_period"] = provenance("body_text", _BILLING_RE.pattern)
+    if match := _PLAN_RE.search(card_text or body_text):
+        values["plan_name"] = raw["plan_name"] = match.group(1).strip()
+        sources["plan_name"] = provenance(text_source, _PLAN_RE.pattern)
+
+    return values, raw, sources
+
+
+@dataclass
+class HtmlForm:
+    """A form found in a page, with its submittable fields."""
+
+    action: str
+    method: str
+    fields: dict[str, str] = field(default_factory=dict)
+    input_types: dict[str, str] = field(default_factory=dict)
+
+    def first_input(self, *types: str) -> str | None:
+        """Return the name of the first input with one of the given types."""
+        for name, input_type in self.input_types.items():
+            if input_type in types:
+                return name
+        return None
+
+
+class _FormExtractor(HTMLParser):
+    """Collect forms and links from a page."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.forms: list[HtmlForm] = []
+        self.links: list[tuple[str, str]] = []
+        self._form: HtmlForm | None = None
+        self._link_href: str | None = None
+        self._link_text: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = {key: value or "" for key, value in attrs}
+        if tag == "form":
+            self._form = HtmlForm(
+                action=attributes.get("action", ""),
+                method=attributes.get("method", "get").lower(),
+            )
+            self.forms.append(self._form)
+        elif tag == "input" and self._form is not None and attributes.get("name"):
+            input_type = attributes.get("type", "text").lower()
+            if input_type in ("checkbox", "radio") and "checked" not in attributes:
+                return
+            if input_type in ("submit", "button", "image", "reset"):
+                return
+            self._form.fields[attributes["name"]] = attributes.get("value", "")
+            self._form.input_types[attributes["name"]] = input_type
+        elif tag == "a" and attributes.get("href"):
+            self._link_href = attributes["href"]
+            self._link_text = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "form":
+            self._form = None
+        elif tag == "a" and self._link_href is not None:
+            self.links.append((self._link_href, " ".join("".join(self._link_text).split())))
+            self._link_href = None
+
+    def handle_data(self, data: str) -> None:
+        if self._link_href is not None:
+            self._link_text.append(data)
+
+
+def parse_forms(html: str) -> tuple[list[HtmlForm], list[tuple[str, str]]]:
+    """Return the forms and (href, text) links of a page."""
+    parser = _FormExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.forms, parser.links
+
+
+_CDATA_RE = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+VIEWSTATE_RE = re.compile(
+    r'name="javax\.faces\.ViewState"[^>]*value="([^"]*)"'
+    r'|<update id="[^"]*javax\.faces\.ViewState[^"]*"><!\[CDATA\[(.*?)\]\]>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def partial_response_html(body: str) -> str:
+    """Return the HTML fragments of a JSF partial-response, joined."""
+    return "\n".join(_CDATA_RE.findall(body))
+
+
+def json_text(value: Any) -> str:
+    """Flatten the strings and numbers of a decoded JSON document, one per line."""
+    if isinstance(value, dict):
+        return "\n".join(f"{key} {json_text(item)}" for key, item in value.items())
+    if isinstance(value, list):
+        return "\n".join(json_text(item) for item in value)
+    return "" if value is None else str(value)
+
+
+def find_viewstate(html: str) -> str | None:
+    """Return the JSF view state of a page or partial-response."""
+    if match := VIEWSTATE_RE.search(html):
+        return match.group(1) or match.group(2)
+    return None
+
+
+_ROW_RE = re.compile(r"<tr\b([^>]*)>(.*?)</tr>", re.IGNORECASE | re.DOTALL)
+# Stable row keys only: PrimeFaces' data-ri is a position and shifts with new rows
+_ROW_KEY_RE = re.compile(r'data-(?:rk|id)="([^"]+)"', re.IGNORECASE)
+_DATE_TEXT = r"\d{1,2}/\d{1,2}/\d{4}|\d{1,2}\s+de\s+\w+(?:\s+(?:de\s+)?\d{4})?"
+_TOPUP_EXPIRY_RE = re.compile(rf"Vence(?:\s+el)?[:\s]*({_DATE_TEXT})", re.IGNORECASE)
+_TOPUP_DATE_RE = re.compile(rf"({_DATE_TEXT})", re.IGNORECASE)
+_TOPUP_AMOUNT_RE = re.compile(r"([\d.,]+\s*(?:GB|MB|TB))", re.IGNORECASE)
+_TOPUP_REMAINING_RE = re.compile(
+    r"(?:Me quedan|Saldo|Disponible)[:\s]*([\d.,]+\s*(?:GB|MB|TB))", re.IGNORECASE
+)
+
+
+def parse_topups(
+    html: str, since_id: str | None = None, refresh_ids: Collection[str] = ()
+) -> list[dict[str, Any]]:
+    """Return the top-up purchases listed in the recargas view, newest first.
+
+    Rows up to since_id are new to the caller. Past it only the rows in
+    refresh_ids (known top-ups still in use, whose balance moves) are
+    returned, and parsing stops once all of them were seen. Rows without a
+    data amount (headers, totals) are skipped.
+    """
+    entries: list[dict[str, Any]] = []
+    pending = set(refresh_ids)
+    known = False
+    for match in _ROW_RE.finditer(html):
+        text = html_to_text(match.group(2))
+        amount = _TOPUP_AMOUNT_RE.search(text)
+        if amount is None:
+            continue
+
+        expires = _TOPUP_EXPIRY_RE.search(text)
+        purchase_text = _TOPUP_EXPIRY_RE.sub("", text)
+        purchased = _TOPUP_DATE_RE.search(purchase_text)
+        remaining = _TOPUP_REMAINING_RE.search(text)
+        entry = {
+            "purchased": purchased.group(1).strip() if purchased else None,
+            "amount_gb": parse_data_value(amount.group(1)),
+            "remaining_gb": parse_data_value(remaining.group(1)) if remaining else None,
+            "expires": expires.group(1).strip() if expires else None,
+        }
+        if key := _ROW_KEY_RE.search(match.group(1)):
+            entry["id"] = key.group(1)
+        else:
+            entry["id"] = hashlib.sha1(
+                f"{entry['purchased']}|{entry['amount_gb']}|{entry['expires']}".encode()
+            ).hexdigest()[:12]
+
+        if entry["id"] == since_id:
+            known = True
+        if known:
+            if entry["id"] in pending:
+                pending.discard(entry["id"])
+                entries.append(entry)
+            if not pending:
+                break
+            continue
+        entries.append(entry)
+    return entries
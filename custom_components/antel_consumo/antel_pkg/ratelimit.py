@@ -0,0 +1,46 @@
+"""Token bucket guarding on-demand refreshes."""
+from __future__ import annotations
+
+import time
+
+# Six on-demand scrapes per hour, at most two back to back
+DEFAULT_REFRESH_RATE = 6 / 3600
+DEFAULT_REFRESH_BURST = 2
+
+
+class TokenBucket:
+    """Allow `capacity` calls at once, refilled at `rate` tokens per second.
+
+    An automation stuck in a loop gets a burst and then one call per refill
+    interval, instead of a scrape (and Chromium) per trigger.
+    """
+
+    def __init__(
+        self, rate: float = DEFAULT_REFRESH_RATE, capacity: float = DEFAULT_REFRESH_BURST
+    ) -> None:
+        """Initialize a full bucket."""
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last call."""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        """Return the seconds until a token is available."""
+        self._refill()
+        if self._tokens >= 1 or self._rate <= 0:
+            return 0.0
+        return (1 - self._tokens) / self._rate
@@ -0,0 +1,230 @@
+"""Capture and replay of the XHR/JSF responses that carry consumption values."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl, urlencode
+
+from .const import ANTEL_BASE_URL, ANTEL_CONSUMO_INTERNET_URL
+from .instrumentation import Instrumentation
+from .parsing import find_viewstate, json_text, partial_response_html
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Response
+
+    from .antel_scraper import AntelConsumoData
+    from .backends import ScraperBackend
+    from .session import SessionStore
+
+_LOGGER = logging.getLogger(__name__)
+
+_VALUE_HINT_RE = re.compile(r"recarg|saldo|me quedan|consumidos|incluido", re.IGNORECASE)
+# Request headers a JSF/XHR endpoint needs to answer like it did for the page
+_REPLAY_HEADERS = ("content-type", "faces-request", "x-requested-with", "accept")
+_VIEWSTATE_PARAM = "javax.faces.ViewState"
+_MAX_ENDPOINTS = 5
+
+
+class NetworkSniffer:
+    """Read consumption values from the page's own XHR/JSF partial responses.
+
+    While a page loads, JSON and partial-response bodies mentioning data
+    balances are parsed as soon as they arrive, so the scrape does not wait
+    for rendering. The requests that carried values are remembered in the
+    session hints; later polls replay them over HTTP, refreshing the JSF view
+    state from a plain fetch of the consumo page.
+
+    JSON bodies carry no service card, so with a service_id set only bodies
+    that mention it are used; otherwise another service's values could win.
+    """
+
+    def __init__(
+        self,
+        session_store: SessionStore,
+        parse: Callable[[str], AntelConsumoData],
+        instrumentation: Instrumentation | None = None,
+        derive: Callable[[AntelConsumoData], None] | None = None,
+    ) -> None:
+        """Initialize the sniffer.
+
+        parse turns an HTML fragment into data; derive recomputes the values
+        merge() leaves out (remaining, percentage) once inputs are combined.
+        """
+        self._session = session_store
+        self._parse = parse
+        self._derive = derive
+        self.service_id: str | None = None
+        self._metrics = instrumentation or Instrumentation()
+        self._data: AntelConsumoData | None = None
+        self._complete = asyncio.Event()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def endpoints(self) -> list[dict[str, Any]]:
+        """Return the remembered endpoints, most recently useful first."""
+        return self._session.hints.setdefault("endpoints", [])
+
+    def attach(self, page: Page) -> None:
+        """Start inspecting the responses of a page."""
+        self._data = None
+        self._complete.clear()
+        page.on("response", self._on_response)
+
+    def _on_response(self, response: Response) -> None:
+        """Schedule inspection of a response without blocking the event."""
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        task = asyncio.ensure_future(self._inspect(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _inspect(self, response: Response) -> None:
+        """Parse a captured response and remember its request if useful."""
+        try:
+            content_type = response.headers.get("content-type", "")
+            body = await response.text()
+        except Exception as err:
+            _LOGGER.debug("Could not read %s: %s", response.url, err)
+            return
+        if not _VALUE_HINT_RE.search(body) or not self._for_service(body):
+            return
+
+        data = self._parse_body(body, content_type)
+        if data is None:
+            return
+        self._metrics.incr("sniffer_captured")
+        request = response.request
+        self._remember(
+            {
+                "url": request.url,
+                "method": request.method,
+                "post_data": request.post_data,
+                "headers": {
+                    key: value
+                    for key, value in request.headers.items()
+                    if key.lower() in _REPLAY_HEADERS
+                },
+            }
+        )
+        self._accumulate(data)
+
+    def _for_service(self, body: str) -> bool:
+        """Return False if a service is configured and body does not mention it."""
+        return self.service_id is None or self.service_id in body
+
+    def _parse_body(self, body: str, content_type: str) -> AntelConsumoData | None:
+        """Parse a JSON or partial-response body into data, if it has any value."""
+        if "json" in content_type:
+            try:
+                html = json_text(json.loads(body))
+            except ValueError:
+                return None
+        elif "<partial-response" in body:
+            html = partial_response_html(body)
+        else:
+            html = body
+
+        data = self._parse(html)
+        if not data.provenance:
+            return None
+        for source in data.provenance.values():
+            if source["source"] != "derived":
+                source["source"] = "network"
+        return data
+
+    def _accumulate(self, data: AntelConsumoData) -> None:
+        """Merge values spread over several responses."""
+        if self._data is None:
+            self._data = data
+        else:
+            self._data.merge(data)
+            if self._derive is not None:
+                self._derive(self._data)
+        if not self._data.missing_fields():
+            self._complete.set()
+
+    def _remember(self, endpoint: dict[str, Any]) -> None:
+        """Store an endpoint first in the hints, without duplicates."""
+        endpoints = [
+            known
+            for known in self.endpoints
+            if (known["url"], known["post_data"]) != (endpoint["url"], endpoint["post_data"])
+        ]
+        self._session.hints["endpoints"] = [endpoint, *endpoints][:_MAX_ENDPOINTS]
+
+    async def async_wait(self, timeout: float) -> AntelConsumoData | None:
+        """Wait up to timeout seconds for captures to yield every core field."""
+        if not self._complete.is_set():
+            try:
+                await asyncio.wait_for(self._complete.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        self._metrics.incr("sniffer_hit")
+        return self._data
+
+    async def async_replay(
+        self,
+        backend: ScraperBackend,
+        storage_state: dict[str, Any],
+        page_html: str | None = None,
+        timeout: float = 30000,
+    ) -> AntelConsumoData | None:
+        """Request the remembered endpoints directly over HTTP.
+
+        page_html is a plain fetch of the consumo page; its view state
+        replaces the stale one in recorded JSF posts.
+        """
+        if not self.endpoints:
+            return None
+        viewstate = find_viewstate(page_html) if page_html else None
+
+        self._data = None
+        self._complete.clear()
+        for endpoint in list(self.endpoints):
+            post_data = endpoint["post_data"]
+            if post_data and _VIEWSTATE_PARAM in post_data:
+                if viewstate is None:
+                    continue
+                params = dict(parse_qsl(post_data, keep_blank_values=True))
+                params[_VIEWSTATE_PARAM] = viewstate
+                post_data = urlencode(params)
+
+            headers = dict(endpoint["headers"])
+            headers.setdefault("referer", ANTEL_CONSUMO_INTERNET_URL)
+            try:
+                result = await backend.fetch(
+                    endpoint["url"],
+                    storage_state,
+                    headers=headers,
+                    method=endpoint["method"],
+                    data=post_data,
+                    timeout=timeout,
+                )
+            except Exception as err:
+                _LOGGER.debug("Replay of %s failed: %s", endpoint["url"], err)
+                continue
+            if result.status != 200 or not result.url.startswith(ANTEL_BASE_URL):
+                continue
+            if not self._for_service(result.text):
+                continue
+
+            data = self._parse_body(result.text, result.headers.get("content-type", ""))
+            if data is None:
+                continue
+            self._accumulate(data)
+            if self._complete.is_set():
+                self._metrics.incr("sniffer_replay_hit")
+                return self._data
+
+        self._metrics.incr("sniffer_replay_miss")
+        return None
+
+    async def async_close(self) -> None:
+        """Cancel inspections still in flight."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,219 @@
+"""Top-up (recargas) history, synced incrementally from Mi Antel."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .const import ANTEL_BASE_URL, ANTEL_RECARGAS_URL
+from .dates import parse_date_after, parse_date_before
+from .instrumentation import Instrumentation
+from .parsing import parse_topups
+
+if TYPE_CHECKING:
+    from .antel_scraper import AntelConsumoData
+    from .backends import ScraperBackend
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_EXPIRY_ALERT_DAYS = 3
+# The detail view is refetched at least this often even if the card looks the same
+DEFAULT_SYNC_MAX_AGE = 24 * 60 * 60
+_MAX_ENTRIES = 100
+
+
+class TopupStore:
+    """Keep the top-ups seen so far, newest first, with the sync bookkeeping."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """Initialize the store; without a path it only lives in memory."""
+        self._path = Path(path) if path else None
+        self._loaded = False
+        self.entries: list[dict[str, Any]] = []
+        self.alerted: list[str] = []
+        self.synced_at: float | None = None
+        self.card_signature: list[Any] | None = None
+
+    @property
+    def last_id(self) -> str | None:
+        """Return the id of the newest known top-up."""
+        return self.entries[0]["id"] if self.entries else None
+
+    async def async_load(self) -> None:
+        """Read the store from disk once."""
+        if not self._loaded and self._path is not None:
+            stored = await asyncio.get_running_loop().run_in_executor(None, self._read)
+            if stored:
+                self.entries = stored.get("entries", [])
+                self.alerted = stored.get("alerted", [])
+                self.synced_at = stored.get("synced_at")
+                self.card_signature = stored.get("card_signature")
+        self._loaded = True
+
+    async def async_save(self) -> None:
+        """Write the store to disk, if persistent."""
+        if self._path is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self._write,
+                {
+                    "entries": self.entries,
+                    "alerted": self.alerted,
+                    "synced_at": self.synced_at,
+                    "card_signature": self.card_signature,
+                },
+            )
+
+    def _read(self) -> dict[str, Any] | None:
+        """Read the store file."""
+        try:
+            return json.loads(self._path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            _LOGGER.warning("Could not read top-up history: %s", err)
+            return None
+
+    def _write(self, stored: dict[str, Any]) -> None:
+        """Write the store file atomically."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(stored), encoding="utf-8")
+        os.replace(tmp, self._path)
+
+
+class TopupSync:
+    """Fetch the recargas view only when needed and parse only new rows.
+
+    The service card's top-up balance and expiry tell when something was
+    bought: a higher balance or a different expiry triggers a sync, as does
+    the max_age fallback. Each sync parses the rows newer than the last
+    known id, plus the known top-ups still active, to refresh their balance.
+    """
+
+    def __init__(
+        self,
+        backend: ScraperBackend,
+        store: TopupStore,
+        instrumentation: Instrumentation | None = None,
+        max_age: float = DEFAULT_SYNC_MAX_AGE,
+    ) -> None:
+        """Initialize the sync."""
+        self._backend = backend
+        self.store = store
+        self._metrics = instrumentation or Instrumentation()
+        self._max_age = max_age
+
+    def needs_sync(self, data: AntelConsumoData) -> bool:
+        """Return True if the card suggests new top-ups or the history is stale."""
+        store = self.store
+        if store.synced_at is None or time.time() - store.synced_at > self._max_age:
+            return True
+        if store.card_signature is None:
+            return True
+        last_balance, last_expiry = store.card_signature
+        if data.topup_expiration_date != last_expiry:
+            return True
+        return (data.topup_balance_gb or 0) > (last_balance or 0)
+
+    async def async_sync(
+        self,
+        storage_state: dict[str, Any] | None,
+        data: AntelConsumoData,
+        today: date,
+        timeout: float = 30000,
+    ) -> list[dict[str, Any]]:
+        """Pull new top-ups and refresh active ones; return the new entries."""
+        await self.store.async_load()
+        store = self.store
+        if self._resolve_expiries(store.entries, today):
+            # Entries stored before expiry dates were resolved at sync
+            await store.async_save()
+        signature = [data.topup_balance_gb, data.topup_expiration_date]
+        if not self.needs_sync(data):
+            store.card_signature = signature
+            self._metrics.incr("topup_sync_skipped")
+            return []
+
+        result = await self._backend.fetch(
+            ANTEL_RECARGAS_URL, storage_state, timeout=timeout
+        )
+        if result.status != 200 or not result.url.startswith(ANTEL_BASE_URL):
+            _LOGGER.debug("Recargas view unavailable (%s, %s)", result.status, result.url)
+            self._metrics.incr("topup_sync_failed")
+            return []
+
+        active_ids = [entry["id"] for entry in self.active(today)]
+        known = {entry["id"]: entry for entry in store.entries}
+        new_entries = []
+        for entry in parse_topups(result.text, since_id=store.last_id, refresh_ids=active_ids):
+            if (stored := known.get(entry["id"])) is not None:
+                if stored.get("expires") != entry["expires"]:
+                    stored.pop("expires_on", None)
+                stored.update(entry)
+            else:
+                new_entries.append(entry)
+        store.entries = (new_entries + store.entries)[:_MAX_ENTRIES]
+        self._resolve_expiries(store.entries, today)
+        store.synced_at = time.time()
+        store.card_signature = signature
+        await store.async_save()
+        self._metrics.incr("topup_sync")
+        self._metrics.incr("topups_new", len(new_entries))
+        if new_entries:
+            _LOGGER.info("Found %s new top-up(s)", len(new_entries))
+        return new_entries
+
+    @staticmethod
+    def _resolve_expiries(entries: list[dict[str, Any]], today: date) -> bool:
+        """Store each entry's expiry as an ISO date; return True if any was new.
+
+        Year-less texts ("20 de marzo") are placed after the purchase date,
+        or after the sync date without one, and never parsed again: parsed
+        against a later today they would move to next year and come back
+        to life.
+        """
+        resolved = False
+        for entry in entries:
+            if "expires_on" in entry:
+                continue
+            purchased = parse_date_before(entry.get("purchased"), today) or today
+            expires = parse_date_after(entry.get("expires"), purchased)
+            entry["expires_on"] = expires.isoformat() if expires else None
+            resolved = True
+        return resolved
+
+    def active(self, today: date) -> list[dict[str, Any]]:
+        """Return the known top-ups not expired on today (the local date).
+
+        Soonest expiry first.
+        """
+        active = [
+            dict(entry)
+            for entry in self.store.entries
+            if entry.get("expires_on") and entry["expires_on"] >= today.isoformat()
+        ]
+        return sorted(active, key=lambda entry: entry["expires_on"])
+
+    async def async_pop_expiring(
+        self, today: date, within_days: int = DEFAULT_EXPIRY_ALERT_DAYS
+    ) -> list[dict[str, Any]]:
+        """Return active top-ups expiring soon that were not alerted before."""
+        limit = (today + timedelta(days=within_days)).isoformat()
+        expiring = [
+            entry
+            for entry in self.active(today)
+            if entry["expires_on"] <= limit and entry["id"] not in self.store.alerted
+        ]
+        if expiring:
+            known = {entry["id"] for entry in self.store.entries}
+            self.store.alerted = [
+                entry_id for entry_id in self.store.alerted if entry_id in known
+            ] + [entry["id"] for entry in expiring]
+            await self.store.async_save()
+        return expiring
@@ -6,16 +6,48 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
+from homeassistant.core import callback
+from homeassistant.helpers.selector import (
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 
-from .antel_scraper import (
+from .antel_pkg.antel_scraper import (
     AntelScraper,
     AntelAuthError,
     AntelConnectionError,
     AntelScraperError,
 )
-from .const import DOMAIN
+from .const import (
+    CONF_BLOCK_RESOURCES,
+    CONF_HTTP_FETCH,
+    CONF_KEEPALIVE,
+    CONF_KEEPALIVE_MINUTES,
+    CONF_PREWARM,
+    CONF_RENEWAL_DAY,
+    CONF_REUSE_BROWSER,
+    CONF_SERVICE_ID,
+    DEFAULT_KEEPALIVE_MINUTES,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    MAX_KEEPALIVE_MINUTES,
+    MAX_SCAN_INTERVAL,
+    MIN_KEEPALIVE_MINUTES,
+    MIN_SCAN_INTERVAL,
+)
+from .coordinator import AntelConsumoCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +64,12 @@ class AntelConsumoConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow."""
+        return AntelConsumoOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -76,3 +114,99 @@ class AntelConsumoConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+
+class AntelConsumoOptionsFlow(OptionsFlow):
+    """Handle Antel Consumo options.
+
+    Changes are applied live by the entry's update listener, without a
+    reload, so the browser and the logged-in session keep running.
+    """
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        coordinator: AntelConsumoCoordinator | None = self.hass.data.get(DOMAIN, {}).get(
+            self.config_entry.entry_id
+        )
+        services: list[dict[str, str]] = []
+        if coordinator is not None:
+            try:
+                services = await coordinator.scraper.list_services()
+            except Exception as err:
+                _LOGGER.debug("Could not list Antel services: %s", err)
+
+        if services:
+            service_field: Any = SelectSelector(
+                SelectSelectorConfig(
+                    options=[
+                        SelectOptionDict(
+                            value=service["id"],
+                            label=service["name"]
+                            if service["name"] == service["id"]
+                            else f"{service['name']} ({service['id']})",
+                        )
+                        for service in services
+                    ],
+                    custom_value=True,
+                    mode=SelectSelectorMode.DROPDOWN,
+                )
+            )
+        else:
+            service_field = str
+
+        schema: dict[Any, Any] = {
+            # Empty means: the first Fibra service on the dashboard
+            vol.Optional(
+                CONF_SERVICE_ID,
+                description={"suggested_value": options.get(CONF_SERVICE_ID)},
+            ): service_field,
+            vol.Required(
+                CONF_SCAN_INTERVAL,
+                default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ): NumberSelector(
+                NumberSelectorConfig(
+                    min=MIN_SCAN_INTERVAL,
+                    max=MAX_SCAN_INTERVAL,
+                    step=300,
+                    unit_of_measurement="s",
+                    mode=NumberSelectorMode.BOX,
+                )
+            ),
+            # Empty means: take it from the cycle shown in Mi Antel
+            vol.Optional(
+                CONF_RENEWAL_DAY,
+                description={"suggested_value": options.get(CONF_RENEWAL_DAY)},
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=31)),
+            vol.Required(
+                CONF_HTTP_FETCH, default=options.get(CONF_HTTP_FETCH, True)
+            ): bool,
+            vol.Required(
+                CONF_BLOCK_RESOURCES, default=options.get(CONF_BLOCK_RESOURCES, False)
+            ): bool,
+            vol.Required(
+                CONF_REUSE_BROWSER, default=options.get(CONF_REUSE_BROWSER, True)
+            ): bool,
+            vol.Required(CONF_PREWARM, default=options.get(CONF_PREWARM, True)): bool,
+            vol.Required(
+                CONF_KEEPALIVE, default=options.get(CONF_KEEPALIVE, True)
+            ): bool,
+            vol.Required(
+                CONF_KEEPALIVE_MINUTES,
+                default=options.get(CONF_KEEPALIVE_MINUTES, DEFAULT_KEEPALIVE_MINUTES),
+            ): NumberSelector(
+                NumberSelectorConfig(
+                    min=MIN_KEEPALIVE_MINUTES,
+                    max=MAX_KEEPALIVE_MINUTES,
+                    step=1,
+                    unit_of_measurement="min",
+                    mode=NumberSelectorMode.BOX,
+                )
+            ),
+        }
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
@@ -2,19 +2,40 @@
 
 DOMAIN = "antel_consumo"
 
-# URLs
-ANTEL_LOGIN_URL = (
-    "https://www.antel.com.uy/acceder/-/login/openid_connect_request"
-    "?p_p_state=maximized"
-    "&_com_liferay_login_web_portlet_LoginPortlet_saveLastPath=false"
-    "&_com_liferay_login_web_portlet_LoginPortlet_redirect=/"
-    "&_com_liferay_login_web_portlet_LoginPortlet_OPEN_ID_CONNECT_PROVIDER_NAME=TuID"
-)
-ANTEL_CONSUMO_INTERNET_URL = "https://aplicaciones.antel.com.uy/miAntel/consumo/internet"
-ANTEL_BASE_URL = "https://aplicaciones.antel.com.uy"
-
-# Update interval (1 hour)
+# Update interval (1 hour) and the range the options allow, in seconds
 DEFAULT_SCAN_INTERVAL = 3600
+MIN_SCAN_INTERVAL = 900
+MAX_SCAN_INTERVAL = 86400
+
+# Options
+CONF_RENEWAL_DAY = "renewal_day"
+CONF_SERVICE_ID = "service_id"
+CONF_HTTP_FETCH = "http_fetch"
+CONF_BLOCK_RESOURCES = "block_resources"
+CONF_REUSE_BROWSER = "reuse_browser"
+CONF_PREWARM = "prewarm"
+CONF_KEEPALIVE = "keepalive"
+CONF_KEEPALIVE_MINUTES = "keepalive_minutes"
+
+# Minutes between session keep-alive pings; Mi Antel idles out after ~30
+DEFAULT_KEEPALIVE_MINUTES = 20
+MIN_KEEPALIVE_MINUTES = 5
+MAX_KEEPALIVE_MINUTES = 29
+
+# Seconds before a scheduled refresh to pre-warm the browser context
+PREWARM_LEAD = 15
+
+# On-demand refresh service
+SERVICE_REFRESH = "refresh"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_MAX_AGE = "max_age"
+
+# Last successful scrape, kept in .storage
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+
+# Fired once per top-up when it is about to expire
+EVENT_TOPUP_EXPIRING = f"{DOMAIN}_topup_expiring"
 
 # Attributes
 ATTR_USED_DATA = "used_data"
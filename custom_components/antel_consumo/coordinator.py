@@ -2,26 +2,63 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+import time
+from collections.abc import Mapping
+from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
-from .antel_scraper import (
+from .antel_pkg.antel_scraper import (
     AntelScraper,
     AntelConsumoData,
     AntelScraperError,
     AntelAuthError,
     AntelConnectionError,
 )
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from .antel_pkg.artifacts import ArtifactStore
+from .antel_pkg.backends import ScraperBackend
+from .antel_pkg.billing import BillingCalendar
+from .antel_pkg.const import DEFAULT_MAX_BROWSER_MEMORY_MB
+from .antel_pkg.keepalive import SessionKeepAlive
+from .antel_pkg.memory import MemoryGovernor
+from .antel_pkg.ratelimit import TokenBucket
+from .antel_pkg.session import SessionStore
+from .antel_pkg.statistics import UsageSamples
+from .antel_pkg.topups import DEFAULT_EXPIRY_ALERT_DAYS, TopupStore
+from homeassistant.const import (
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    UnitOfInformation,
+)
 
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
+from .const import (
+    CONF_BLOCK_RESOURCES,
+    CONF_HTTP_FETCH,
+    CONF_KEEPALIVE,
+    CONF_KEEPALIVE_MINUTES,
+    CONF_PREWARM,
+    CONF_RENEWAL_DAY,
+    CONF_REUSE_BROWSER,
+    CONF_SERVICE_ID,
+    DOMAIN,
+    DEFAULT_KEEPALIVE_MINUTES,
+    DEFAULT_SCAN_INTERVAL,
+    EVENT_TOPUP_EXPIRING,
+    PREWARM_LEAD,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,29 +70,184 @@ class AntelConsumoCoordinator(DataUpdateCoordinator[AntelConsumoData]):
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the coordinator."""
+        # Renewal questions for the computed sensors; the scraped cycle wins
+        self.calendar = BillingCalendar(
+            entry.options.get(CONF_RENEWAL_DAY), hass.config.time_zone
+        )
+        session_store = SessionStore(
+            hass.config.path(DOMAIN, f"session_{entry.entry_id}.json")
+        )
         self.scraper = AntelScraper(
             username=entry.data[CONF_USERNAME],
             password=entry.data[CONF_PASSWORD],
+            artifact_store=ArtifactStore(hass.config.path(DOMAIN, "artifacts")),
+            session_store=session_store,
+            memory_governor=MemoryGovernor(DEFAULT_MAX_BROWSER_MEMORY_MB),
+            topup_store=TopupStore(hass.config.path(DOMAIN, f"topups_{entry.entry_id}.json")),
+            local_today=self.calendar.today,
+        )
+        # Its own driver-only backend, so pings never wait for a scrape's browser
+        self.keepalive = SessionKeepAlive(
+            ScraperBackend(), session_store, instrumentation=self.scraper.metrics
+        )
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}"
         )
+        self.samples = UsageSamples(
+            hass.config.path(DOMAIN, f"samples_{entry.entry_id}.json")
+        )
+        self._statistic_id = f"{DOMAIN}:consumed_data_{entry.entry_id.lower()}"
+        self._created = time.monotonic()
+        self._first_state_logged = False
+        self.restored = False
+        # Fields that changed in the last refresh; None means treat all as new
+        self.changed_fields: set[str] | None = None
+        # Guards the refresh service against automation loops
+        self.refresh_limiter = TokenBucket()
+        self._max_age: float | None = None
+        self._prewarm = True
+        self._unsub_prewarm: CALLBACK_TYPE | None = None
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            # AntelConsumoData ignores fetch time in comparisons, so unchanged
+            # values do not rewrite every entity state
+            always_update=False,
         )
+        self.apply_options(entry.options)
+
+    def apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the entry options to the running coordinator and scraper.
+
+        Nothing is reloaded: the interval applies from the next scheduled
+        refresh, the scraper settings from the next scrape, and the browser
+        keeps running. The keep-alive starts or stops right away; a new
+        interval applies from its next ping.
+        """
+        self.update_interval = timedelta(
+            seconds=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+        self.scraper.configure(
+            service_id=options.get(CONF_SERVICE_ID),
+            http_fetch=options.get(CONF_HTTP_FETCH, True),
+            block_resources=options.get(CONF_BLOCK_RESOURCES, False),
+            reuse_browser=options.get(CONF_REUSE_BROWSER, True),
+        )
+        self.calendar.set_renewal_day(options.get(CONF_RENEWAL_DAY))
+        self.keepalive.interval = 60 * options.get(
+            CONF_KEEPALIVE_MINUTES, DEFAULT_KEEPALIVE_MINUTES
+        )
+        if options.get(CONF_KEEPALIVE, True):
+            self.keepalive.start()
+        else:
+            self.keepalive.stop()
+        self._prewarm = options.get(CONF_PREWARM, True)
+        if not self._prewarm:
+            self._cancel_prewarm()
+
+    def _schedule_prewarm(self) -> None:
+        """Pre-warm the browser PREWARM_LEAD seconds before the next refresh."""
+        self._cancel_prewarm()
+        if not self._prewarm or self.update_interval is None:
+            return
+        delay = self.update_interval.total_seconds() - PREWARM_LEAD
+        if delay > 0:
+            self._unsub_prewarm = async_call_later(self.hass, delay, self._async_prewarm)
+
+    def _cancel_prewarm(self) -> None:
+        """Cancel a pending pre-warm."""
+        if self._unsub_prewarm is not None:
+            self._unsub_prewarm()
+            self._unsub_prewarm = None
+
+    async def _async_prewarm(self, _now: datetime) -> None:
+        """Get the next scrape's browser context ready."""
+        self._unsub_prewarm = None
+        try:
+            await self.scraper.prewarm()
+        except Exception as err:
+            _LOGGER.debug("Could not pre-warm the browser: %s", err)
+
+    @callback
+    def async_new_day(self, _now: datetime) -> None:
+        """Rewrite the date-derived sensors at local midnight.
+
+        With always_update=False unchanged scrapes notify nobody, so days
+        until renewal, the daily averages and the daily consumption would
+        otherwise keep yesterday's values. No scraped field changed, so
+        entities bound to scraped fields skip the update.
+        """
+        self.changed_fields = set()
+        self.async_update_listeners()
+
+    @property
+    def data_age(self) -> float | None:
+        """Return the age in seconds of the current data."""
+        if self.data is None or self.data.fetched_at is None:
+            return None
+        return max(0.0, time.time() - self.data.fetched_at)
+
+    async def async_restore(self) -> bool:
+        """Load the last successful snapshot from storage."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning("Could not load stored Antel data: %s", err)
+            return False
+        if not stored:
+            return False
+
+        self.data = AntelConsumoData.from_dict(stored)
+        self.calendar.update_from_text(self.data.billing_period)
+        self.changed_fields = None
+        self.restored = True
+        _LOGGER.debug("Restored Antel data, %s s old", self.data_age)
+        self._log_first_state()
+        return True
+
+    async def async_refresh_max_age(self, max_age: float) -> None:
+        """Refresh unless the data is at most max_age seconds old.
+
+        Concurrent calls join the in-flight scrape; new scrapes are rate
+        limited.
+        """
+        age = self.data_age
+        if age is not None and age <= max_age and not self.restored:
+            return
+        if not self.scraper.scraping and not self.refresh_limiter.try_acquire():
+            raise HomeAssistantError(
+                "Antel refresh rate limit reached, retry in "
+                f"{self.refresh_limiter.retry_after():.0f} s"
+            )
+        self._max_age = max_age
+        try:
+            await self.async_refresh()
+        finally:
+            self._max_age = None
+        if not self.last_update_success:
+            raise HomeAssistantError("Antel refresh failed, see the log for details")
 
     async def _async_update_data(self) -> AntelConsumoData:
         """Fetch data from Antel."""
+        try:
+            return await self._async_fetch()
+        finally:
+            # Counted from now, like the coordinator's own next refresh
+            self._schedule_prewarm()
+
+    async def _async_fetch(self) -> AntelConsumoData:
+        """Scrape, store and post-process one refresh."""
         try:
             _LOGGER.debug("Fetching Antel consumption data")
-            data = await self.scraper.get_consumption_data()
+            data = await self.scraper.get_consumption_data(max_age=self._max_age)
             _LOGGER.debug(
                 "Fetched data: used=%s GB, total=%s GB",
                 data.used_data_gb,
                 data.total_data_gb,
             )
-            return data
         except AntelAuthError as err:
             _LOGGER.error("Authentication error: %s", err)
             raise UpdateFailed(f"Authentication failed: {err}") from err
@@ -69,6 +261,82 @@ class AntelConsumoCoordinator(DataUpdateCoordinator[AntelConsumoData]):
             _LOGGER.exception("Unexpected error fetching Antel data")
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
+        await self._store.async_save(data.as_dict())
+        self.calendar.update_from_text(data.billing_period)
+        await self._async_alert_expiring_topups()
+        await self._async_import_statistics(data)
+        if self.restored:
+            self.restored = False
+            # Clear the restored flag even when the values did not change
+            self.hass.loop.call_soon(self.async_update_listeners)
+        self.changed_fields = data.changed_fields(self.data)
+        self._log_first_state()
+        return data
+
+    async def _async_import_statistics(self, data: AntelConsumoData) -> None:
+        """Record the hourly sample and import every row the recorder lacks."""
+        await self.samples.async_record(data)
+        if "recorder" not in self.hass.config.components:
+            return
+        # Imported here so loading the integration does not pull in recorder
+        from homeassistant.components.recorder.models import (
+            StatisticData,
+            StatisticMeanType,
+            StatisticMetaData,
+        )
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+        from homeassistant.util.unit_conversion import InformationConverter
+
+        metadata = StatisticMetaData(
+            mean_type=StatisticMeanType.NONE,
+            has_sum=True,
+            name="Antel datos consumidos",
+            source=DOMAIN,
+            statistic_id=self._statistic_id,
+            unit_class=InformationConverter.UNIT_CLASS,
+            unit_of_measurement=UnitOfInformation.GIGABYTES,
+        )
+        for rows in self.samples.batches():
+            async_add_external_statistics(
+                self.hass,
+                metadata,
+                [
+                    StatisticData(
+                        start=datetime.fromtimestamp(row["start"], dt_util.UTC),
+                        state=row["sum"],
+                        sum=row["sum"],
+                    )
+                    for row in rows
+                ],
+            )
+            await self.samples.async_mark_exported(rows)
+
+    async def _async_alert_expiring_topups(self) -> None:
+        """Fire an event once for each top-up about to expire."""
+        if self.scraper.topups is None:
+            return
+        for topup in await self.scraper.topups.async_pop_expiring(
+            self.calendar.today(), DEFAULT_EXPIRY_ALERT_DAYS
+        ):
+            _LOGGER.info("Top-up %s expires on %s", topup["id"], topup["expires_on"])
+            self.hass.bus.async_fire(
+                EVENT_TOPUP_EXPIRING,
+                {"entry_id": self.config_entry.entry_id, **topup},
+            )
+
+    def _log_first_state(self) -> None:
+        """Log how long it took from setup until entities had a value."""
+        if not self._first_state_logged:
+            self._first_state_logged = True
+            _LOGGER.info(
+                "First Antel state available %.2fs after setup",
+                time.monotonic() - self._created,
+            )
+
     async def async_shutdown(self) -> None:
         """Shutdown the coordinator and close the scraper."""
+        self._cancel_prewarm()
+        await self.keepalive.async_stop()
         await self.scraper.close()
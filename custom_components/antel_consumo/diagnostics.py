@@ -0,0 +1,48 @@
+"""Diagnostics support for Antel Consumo."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_SERVICE_ID, DOMAIN
+from .coordinator import AntelConsumoCoordinator
+
+# The page text samples can hold the holder's name, phone or service numbers
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_SERVICE_ID,
+    "card_text_sample",
+    "body_text_sample",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    This is where the raw extraction data (matched labels and where each
+    value came from) is exposed, instead of in state attributes. Users
+    attach it to public issues, so account details are redacted.
+    """
+    coordinator: AntelConsumoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "restored": coordinator.restored,
+            "data_age": coordinator.data_age,
+        },
+        "data": async_redact_data(data.as_dict(), TO_REDACT) if data is not None else None,
+        "metrics": coordinator.scraper.metrics.snapshot(),
+    }
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -12,14 +13,17 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfInformation
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import ATTR_LAST_UPDATE, DOMAIN
 from .coordinator import AntelConsumoCoordinator
-from .antel_scraper import AntelConsumoData
+from .antel_pkg.antel_scraper import AntelConsumoData
+from .antel_pkg.billing import BillingCalendar
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -27,6 +31,34 @@ class AntelSensorEntityDescription(SensorEntityDescription):
     """Describes an Antel sensor entity."""
 
     value_fn: Callable[[AntelConsumoData], Any]
+    # Data fields value_fn reads; a refresh that changed none of them is skipped
+    state_fields: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True, kw_only=True)
+class AntelComputedSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor derived from the data and the billing calendar."""
+
+    value_fn: Callable[[AntelConsumoData, BillingCalendar], Any]
+
+
+def _iso_date(value: str | None) -> date | None:
+    """Return a date from its ISO form."""
+    return date.fromisoformat(value) if value else None
+
+
+def _topup_left(topup: dict[str, Any]) -> float | None:
+    """Return what is left of a top-up; the amount bought if not shown.
+
+    A used-up top-up has 0.0 left, which must not fall back to the amount.
+    """
+    remaining = topup.get("remaining_gb")
+    return topup.get("amount_gb") if remaining is None else remaining
+
+
+def _next_topup(data: AntelConsumoData) -> dict[str, Any] | None:
+    """Return the active top-up that expires first."""
+    return data.topups[0] if data.topups else None
 
 
 SENSORS: tuple[AntelSensorEntityDescription, ...] = (
@@ -46,6 +78,7 @@ SENSORS: tuple[AntelSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:database",
+        state_fields=frozenset({"total_data_gb"}),
         value_fn=lambda data: data.total_data_gb,
     ),
     AntelSensorEntityDescription(
@@ -55,6 +88,7 @@ SENSORS: tuple[AntelSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:database-check",
+        state_fields=frozenset({"remaining_data_gb"}),
         value_fn=lambda data: data.remaining_data_gb,
     ),
     AntelSensorEntityDescription(
@@ -63,20 +97,163 @@ SENSORS: tuple[AntelSensorEntityDescription, ...] = (
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:percent",
+        state_fields=frozenset({"percentage_used"}),
         value_fn=lambda data: round(data.percentage_used, 1) if data.percentage_used is not None else None,
     ),
     AntelSensorEntityDescription(
         key="plan_name",
         translation_key="plan_name",
         icon="mdi:file-document",
+        state_fields=frozenset({"plan_name"}),
         value_fn=lambda data: data.plan_name,
     ),
     AntelSensorEntityDescription(
         key="billing_period",
         translation_key="billing_period",
         icon="mdi:calendar",
+        state_fields=frozenset({"billing_period"}),
         value_fn=lambda data: data.billing_period,
     ),
+    AntelSensorEntityDescription(
+        key="billing_period_start",
+        translation_key="billing_period_start",
+        device_class=SensorDeviceClass.DATE,
+        icon="mdi:calendar-start",
+        state_fields=frozenset({"billing_period_start"}),
+        value_fn=lambda data: _iso_date(data.billing_period_start),
+    ),
+    AntelSensorEntityDescription(
+        key="billing_period_end",
+        translation_key="billing_period_end",
+        device_class=SensorDeviceClass.DATE,
+        icon="mdi:calendar-end",
+        state_fields=frozenset({"billing_period_end"}),
+        value_fn=lambda data: _iso_date(data.billing_period_end),
+    ),
+    AntelSensorEntityDescription(
+        key="topup_expiration",
+        translation_key="topup_expiration",
+        device_class=SensorDeviceClass.DATE,
+        icon="mdi:calendar-end",
+        state_fields=frozenset({"topup_expires_on"}),
+        value_fn=lambda data: _iso_date(data.topup_expires_on),
+    ),
+    AntelSensorEntityDescription(
+        key="topup_balance",
+        translation_key="topup_balance",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:database-plus",
+        state_fields=frozenset({"topup_balance_gb"}),
+        value_fn=lambda data: data.topup_balance_gb,
+    ),
+    AntelSensorEntityDescription(
+        key="active_topups",
+        translation_key="active_topups",
+        icon="mdi:database-plus-outline",
+        state_fields=frozenset({"topups"}),
+        value_fn=lambda data: len(data.topups) if data.topups is not None else None,
+    ),
+    AntelSensorEntityDescription(
+        key="next_topup_expiry",
+        translation_key="next_topup_expiry",
+        device_class=SensorDeviceClass.DATE,
+        icon="mdi:calendar-end",
+        state_fields=frozenset({"topups"}),
+        value_fn=lambda data: (
+            _iso_date(topup["expires_on"]) if (topup := _next_topup(data)) else None
+        ),
+    ),
+    AntelSensorEntityDescription(
+        key="next_topup_amount",
+        translation_key="next_topup_amount",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        icon="mdi:database-clock",
+        state_fields=frozenset({"topups"}),
+        value_fn=lambda data: (
+            _topup_left(topup) if (topup := _next_topup(data)) else None
+        ),
+    ),
+)
+
+
+def _average(amount: float | None, days: int) -> float | None:
+    """Return amount per day, or None without a whole day to divide by."""
+    if amount is None or days <= 0:
+        return None
+    return round(amount / days, 2)
+
+
+def _total_remaining(data: AntelConsumoData) -> float | None:
+    """Return plan data left plus the top-up balance."""
+    if data.remaining_data_gb is None:
+        return None
+    return round(data.remaining_data_gb + (data.topup_balance_gb or 0), 2)
+
+
+COMPUTED_SENSORS: tuple[AntelComputedSensorEntityDescription, ...] = (
+    AntelComputedSensorEntityDescription(
+        key="total_remaining_data",
+        translation_key="total_remaining_data",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:database-check",
+        value_fn=lambda data, calendar: _total_remaining(data),
+    ),
+    AntelComputedSensorEntityDescription(
+        key="renewal_date",
+        translation_key="renewal_date",
+        device_class=SensorDeviceClass.DATE,
+        icon="mdi:calendar",
+        value_fn=lambda data, calendar: (
+            info[0] if (info := calendar.renewal_info()) else None
+        ),
+    ),
+    AntelComputedSensorEntityDescription(
+        key="days_until_renewal",
+        translation_key="days_until_renewal",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        icon="mdi:calendar-clock",
+        value_fn=lambda data, calendar: (
+            info[1] if (info := calendar.renewal_info()) else None
+        ),
+    ),
+    AntelComputedSensorEntityDescription(
+        key="days_since_renewal",
+        translation_key="days_since_renewal",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        icon="mdi:calendar-check",
+        value_fn=lambda data, calendar: (
+            info[2] if (info := calendar.renewal_info()) else None
+        ),
+    ),
+    AntelComputedSensorEntityDescription(
+        key="average_daily_usage",
+        translation_key="average_daily_usage",
+        native_unit_of_measurement="GB/d",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:chart-line",
+        value_fn=lambda data, calendar: (
+            _average(data.used_data_gb, info[2])
+            if (info := calendar.renewal_info())
+            else None
+        ),
+    ),
+    AntelComputedSensorEntityDescription(
+        key="average_daily_remaining",
+        translation_key="average_daily_remaining",
+        native_unit_of_measurement="GB/d",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:chart-timeline-variant",
+        value_fn=lambda data, calendar: (
+            _average(data.remaining_data_gb, info[1])
+            if (info := calendar.renewal_info())
+            else None
+        ),
+    ),
 )
 
 
@@ -88,28 +265,36 @@ async def async_setup_entry(
     """Set up Antel Consumo sensors based on a config entry."""
     coordinator: AntelConsumoCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        AntelSensor(coordinator, description, entry)
-        for description in SENSORS
+    entities: list[SensorEntity] = [
+        AntelSensor(coordinator, description, entry) for description in SENSORS
+    ]
+    entities.extend(
+        AntelComputedSensor(coordinator, description, entry)
+        for description in COMPUTED_SENSORS
     )
+    entities.append(AntelDailyConsumptionSensor(coordinator, entry))
+    async_add_entities(entities)
 
 
-class AntelSensor(CoordinatorEntity[AntelConsumoCoordinator], SensorEntity):
-    """Representation of an Antel Consumo sensor."""
+class AntelEntity(CoordinatorEntity[AntelConsumoCoordinator], SensorEntity):
+    """Base for Antel sensors: one device per entry, state written on change.
+
+    Each refresh rewrote every entity although most values (plan name,
+    billing period) change once a month. A refresh that changed none of the
+    entity's state fields is skipped outright; otherwise the state is only
+    written when availability, value or attributes differ from the last
+    write. The last_update attribute is left out of that comparison.
+    """
 
-    entity_description: AntelSensorEntityDescription
     _attr_has_entity_name = True
+    _state_fields: frozenset[str] = frozenset()
 
     def __init__(
-        self,
-        coordinator: AntelConsumoCoordinator,
-        description: AntelSensorEntityDescription,
-        entry: ConfigEntry,
+        self, coordinator: AntelConsumoCoordinator, entry: ConfigEntry, key: str
     ) -> None:
-        """Initialize the sensor."""
+        """Initialize the entity."""
         super().__init__(coordinator)
-        self.entity_description = description
-        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
         self._attr_device_info = {
             "identifiers": {(DOMAIN, entry.entry_id)},
             "name": "Antel Internet",
@@ -117,6 +302,50 @@ class AntelSensor(CoordinatorEntity[AntelConsumoCoordinator], SensorEntity):
             "model": "Mi Antel",
             "entry_type": "service",
         }
+        self._written: tuple[Any, ...] | None = None
+
+    def _unchanged_fields(self) -> bool:
+        """Return True if the refresh did not touch this entity's fields."""
+        changed = self.coordinator.changed_fields
+        return (
+            self._written is not None
+            and bool(self._state_fields)
+            and changed is not None
+            and not changed & self._state_fields
+            and self._written[:2] == (self.available, self.coordinator.restored)
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if it changed."""
+        if self._unchanged_fields():
+            return
+        attributes = dict(self.extra_state_attributes or {})
+        attributes.pop(ATTR_LAST_UPDATE, None)
+        written = (self.available, self.coordinator.restored, self.native_value, attributes)
+        if written == self._written:
+            return
+        self._written = written
+        self.async_write_ha_state()
+
+
+class AntelSensor(AntelEntity):
+    """Representation of an Antel Consumo sensor."""
+
+    entity_description: AntelSensorEntityDescription
+    # Kept in the live state but not written to the recorder with every change
+    _unrecorded_attributes = frozenset({"sources", "topups"})
+
+    def __init__(
+        self,
+        coordinator: AntelConsumoCoordinator,
+        description: AntelSensorEntityDescription,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry, description.key)
+        self.entity_description = description
+        self._state_fields = description.state_fields
 
     @property
     def native_value(self) -> Any:
@@ -128,11 +357,179 @@ class AntelSensor(CoordinatorEntity[AntelConsumoCoordinator], SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return extra state attributes."""
-        if self.coordinator.data is None or self.coordinator.data.raw_data is None:
+        data = self.coordinator.data
+        if data is None:
             return None
 
-        # Only add raw data for the main sensor (used_data)
-        if self.entity_description.key == "used_data":
-            return {"raw_data": self.coordinator.data.raw_data}
+        attributes: dict[str, Any] = {}
+        if data.fetched_at is not None:
+            attributes[ATTR_LAST_UPDATE] = datetime.fromtimestamp(
+                data.fetched_at, dt_util.UTC
+            ).isoformat()
+        if self.coordinator.restored:
+            attributes["restored"] = True
 
-        return None
+        # Raw extraction text is only in the diagnostics download; recording
+        # it with every state change bloats the database and the frontend
+        if self.entity_description.key == "active_topups" and data.topups:
+            attributes["topups"] = data.topups
+        if self.entity_description.key == "used_data" and data.provenance:
+            attributes["confidence"] = round(data.confidence, 2)
+            attributes["sources"] = {
+                key: origin["source"] for key, origin in data.provenance.items()
+            }
+
+        return attributes or None
+
+
+class AntelComputedSensor(AntelEntity):
+    """A sensor computed in memory from the data and the billing calendar."""
+
+    entity_description: AntelComputedSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: AntelConsumoCoordinator,
+        description: AntelComputedSensorEntityDescription,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry, description.key)
+        self.entity_description = description
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        if self.coordinator.data is None:
+            return None
+        return self.entity_description.value_fn(
+            self.coordinator.data, self.coordinator.calendar
+        )
+
+
+@dataclass
+class DailyBaseline(ExtraStoredData):
+    """Readings at the start of a local day, kept across restarts.
+
+    A drop in plan usage (the cycle renewed) or a rise in top-up balance (a
+    purchase) moves the baseline instead of losing what was used earlier.
+    """
+
+    day: str
+    plan_base: float
+    topup_base: float | None
+    last_used: float
+    last_topup: float | None
+
+    @classmethod
+    def start(cls, day: date, used: float, topup: float | None) -> DailyBaseline:
+        """Return a baseline for a new day."""
+        return cls(day.isoformat(), used, topup, used, topup)
+
+    def update(self, used: float, topup: float | None) -> tuple[float, float]:
+        """Track a reading; return today's plan and top-up consumption."""
+        if used < self.last_used:
+            self.plan_base -= self.last_used
+        if topup is not None:
+            if self.topup_base is None:
+                self.topup_base = topup
+            elif self.last_topup is not None and topup > self.last_topup:
+                self.topup_base += topup - self.last_topup
+        self.last_used, self.last_topup = used, topup
+
+        plan = max(0.0, used - self.plan_base)
+        topups = (
+            max(0.0, self.topup_base - topup) if topup is not None else 0.0
+        )
+        return round(plan, 2), round(topups, 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the baseline as a dict for the restore state store."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, stored: dict[str, Any]) -> DailyBaseline | None:
+        """Return a baseline from restored state, if it is complete."""
+        try:
+            return cls(**stored)
+        except TypeError:
+            return None
+
+
+class AntelDailyConsumptionSensor(AntelEntity, RestoreEntity):
+    """Data used today, plan plus top-ups, reset at local midnight.
+
+    The baseline lives in the entity's restore data, so a restart in the
+    middle of the day keeps counting from the same point.
+    """
+
+    _attr_translation_key = "daily_consumption"
+    _attr_native_unit_of_measurement = UnitOfInformation.GIGABYTES
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_icon = "mdi:calendar-today"
+
+    def __init__(self, coordinator: AntelConsumoCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry, "daily_consumption")
+        self._baseline: DailyBaseline | None = None
+        self._plan = 0.0
+        self._topups = 0.0
+
+    async def async_added_to_hass(self) -> None:
+        """Restore today's baseline and compute the current value."""
+        await super().async_added_to_hass()
+        if (extra := await self.async_get_last_extra_data()) is not None:
+            self._baseline = DailyBaseline.from_dict(extra.as_dict())
+        self._track(self.coordinator.data)
+
+    @property
+    def extra_restore_state_data(self) -> DailyBaseline | None:
+        """Return the baseline to keep across restarts."""
+        return self._baseline
+
+    def _track(self, data: AntelConsumoData | None) -> None:
+        """Fold a reading into today's consumption."""
+        if data is None or data.used_data_gb is None:
+            return
+        today = self.coordinator.calendar.today()
+        if self._baseline is None or self._baseline.day != today.isoformat():
+            if self.coordinator.restored:
+                # A stale snapshot must not become the baseline of a new day
+                self._baseline = None
+                return
+            self._baseline = DailyBaseline.start(today, data.used_data_gb, data.topup_balance_gb)
+        self._plan, self._topups = self._baseline.update(
+            data.used_data_gb, data.topup_balance_gb
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Track the new reading before writing the state."""
+        self._track(self.coordinator.data)
+        super()._handle_coordinator_update()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return today's consumption."""
+        if self._baseline is None:
+            return None
+        return round(self._plan + self._topups, 2)
+
+    @property
+    def last_reset(self) -> datetime | None:
+        """Return local midnight of the baseline's day."""
+        if self._baseline is None:
+            return None
+        return datetime.combine(
+            date.fromisoformat(self._baseline.day),
+            datetime.min.time(),
+            self.coordinator.calendar.tz,
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the split between plan and top-ups."""
+        if self._baseline is None:
+            return None
+        return {"plan": self._plan, "topups": self._topups}
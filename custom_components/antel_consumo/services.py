@@ -0,0 +1,40 @@
+"""Services for the Antel Consumo integration."""
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import ATTR_CONFIG_ENTRY_ID, ATTR_MAX_AGE, DOMAIN, SERVICE_REFRESH
+from .coordinator import AntelConsumoCoordinator
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_MAX_AGE, default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+
+async def _async_refresh(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Make the data of one or all entries at most max_age seconds old."""
+    coordinators: dict[str, AntelConsumoCoordinator] = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id is not None:
+        if entry_id not in coordinators:
+            raise HomeAssistantError(f"Unknown Antel Consumo entry {entry_id}")
+        coordinators = {entry_id: coordinators[entry_id]}
+
+    for coordinator in coordinators.values():
+        await coordinator.async_refresh_max_age(call.data[ATTR_MAX_AGE])
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def refresh(call: ServiceCall) -> None:
+        await _async_refresh(hass, call)
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, refresh, schema=REFRESH_SCHEMA)
@@ -0,0 +1,57 @@
+"""Benchmark the Spanish date parser over strings seen on Mi Antel.
+
+Usage:
+  PYTHONPATH=antel_addon python scripts/bench_dates.py
+"""
+from __future__ import annotations
+
+import time
+from datetime import date
+
+from antel_pkg.dates import _parse_cycle_cached, _parse_date_cached, parse_cycle, parse_date
+
+TODAY = date(2025, 12, 20)
+
+DATES = (
+    "Vence el 15 de febrero 2026",
+    "Vence el 12 de marzo",
+    "Vence el 5 de enero",
+    "Vence el 15/02/2026",
+    "Fin de contrato: 26/11/2027",
+    "sábado 3 de enero",
+    "12 set.",
+    "2026-02-15",
+)
+CYCLES = (
+    "1 de enero al 31 de enero",
+    "15 de diciembre al 14 de enero",
+    "20 de noviembre al 19 de diciembre",
+    "del 1/12 al 31/12",
+)
+
+
+def bench(label: str, func, corpus: tuple[str, ...], clear, rounds: int = 2000) -> None:
+    for cached in (False, True):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            if not cached:
+                clear()
+            for text in corpus:
+                func(text, TODAY)
+        elapsed = time.perf_counter() - start
+        per_call = elapsed / (rounds * len(corpus)) * 1e6
+        print(f"{label} ({'cached' if cached else 'cold'}): {per_call:.2f} µs/string")
+
+
+def main() -> None:
+    for text in DATES:
+        print(f"{text!r:35} -> {parse_date(text, TODAY)}")
+    for text in CYCLES:
+        print(f"{text!r:35} -> {parse_cycle(text, TODAY)}")
+    print()
+    bench("parse_date", parse_date, DATES, _parse_date_cached.cache_clear)
+    bench("parse_cycle", parse_cycle, CYCLES, _parse_cycle_cached.cache_clear)
+
+
+if __name__ == "__main__":
+    main()
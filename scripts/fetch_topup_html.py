@@ -6,8 +6,6 @@ import re
 from antel_addon.antel_pkg.antel_scraper import AntelScraper
 from antel_addon.antel_pkg.const import ANTEL_CONSUMO_INTERNET_URL
 
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-
 
 def load_env(env_path: str):
     for line in Path(env_path).read_text().splitlines():
@@ -43,31 +41,28 @@ async def main():
         raise SystemExit("Missing ANTEL_USER/ANTEL_PASS in .env")
 
     scraper = AntelScraper(username, password, service_id=service_id)
-    browser = await scraper._ensure_browser()
-    # Use same context settings as production scraper
-    context = await browser.new_context(
-        viewport={"width": 1280, "height": 720},
-        user_agent=USER_AGENT,
-    )
-    page = await context.new_page()
-
+    # The backend releases the context; a persistent profile keeps it open
+    context_scope = scraper.browser_context(viewport={"width": 1280, "height": 720})
     try:
-        print("Logging in...")
-        await scraper._login(page)
-        print("Login OK. Navigating to consumo internet...")
-
-        await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="domcontentloaded", timeout=180000)
-        await page.wait_for_load_state("networkidle", timeout=180000)
-        scan_page("consumo/internet", await page.content())
-
-    except Exception as e:
-        print("ERROR:", e)
-        try:
-            print("Current URL:", page.url)
-        except Exception:
-            pass
+        async with context_scope as context:
+            page = await context.new_page()
+
+            try:
+                print("Logging in...")
+                await scraper._login(page)
+                print("Login OK. Navigating to consumo internet...")
+
+                await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="domcontentloaded", timeout=180000)
+                await page.wait_for_load_state("networkidle", timeout=180000)
+                scan_page("consumo/internet", await page.content())
+
+            except Exception as e:
+                print("ERROR:", e)
+                try:
+                    print("Current URL:", page.url)
+                except Exception:
+                    pass
     finally:
-        await context.close()
         await scraper.close()
 
 
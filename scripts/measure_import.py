@@ -0,0 +1,28 @@
+"""Measure import cost of the scraper package versus Playwright.
+
+Usage:
+  PYTHONPATH=antel_addon python scripts/measure_import.py
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+
+def timed_import(name: str) -> float:
+    start = time.perf_counter()
+    __import__(name)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    scraper_ms = timed_import("antel_pkg.antel_scraper")
+    print(f"antel_pkg.antel_scraper: {scraper_ms:.1f} ms")
+    print("playwright loaded at import:", "playwright" in sys.modules)
+
+    playwright_ms = timed_import("playwright.async_api")
+    print(f"playwright.async_api (deferred to first scrape): {playwright_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
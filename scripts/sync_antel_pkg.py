@@ -0,0 +1,60 @@
+"""Copy the shared scraper core into the add-on build context.
+
+The integration ships custom_components/antel_consumo/antel_pkg (the source
+of truth); the add-on image can only COPY from antel_addon/, so it gets a
+verbatim copy.
+
+Usage:
+  python scripts/sync_antel_pkg.py          # update the add-on copy
+  python scripts/sync_antel_pkg.py --check  # exit 1 if the copy drifted
+"""
+from __future__ import annotations
+
+import filecmp
+import shutil
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SOURCE = ROOT / "custom_components" / "antel_consumo" / "antel_pkg"
+TARGET = ROOT / "antel_addon" / "antel_pkg"
+
+
+def source_files() -> list[Path]:
+    return sorted(path.relative_to(SOURCE) for path in SOURCE.glob("*.py"))
+
+
+def drifted() -> list[str]:
+    problems = []
+    expected = set(source_files())
+    for rel in expected:
+        target = TARGET / rel
+        if not target.exists() or not filecmp.cmp(SOURCE / rel, target, shallow=False):
+            problems.append(str(rel))
+    for path in TARGET.glob("*.py"):
+        if path.relative_to(TARGET) not in expected:
+            problems.append(f"{path.name} (stale)")
+    return problems
+
+
+def main() -> None:
+    if "--check" in sys.argv:
+        problems = drifted()
+        if problems:
+            print("antel_addon/antel_pkg is out of sync:", ", ".join(problems))
+            sys.exit(1)
+        print("antel_addon/antel_pkg is in sync")
+        return
+
+    TARGET.mkdir(exist_ok=True)
+    expected = set(source_files())
+    for path in TARGET.glob("*.py"):
+        if path.relative_to(TARGET) not in expected:
+            path.unlink()
+    for rel in expected:
+        shutil.copy2(SOURCE / rel, TARGET / rel)
+    print(f"Copied {len(expected)} files to {TARGET.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
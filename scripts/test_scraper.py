@@ -10,7 +10,7 @@ import asyncio
 import os
 from pathlib import Path
 
-from custom_components.antel_consumo.antel_scraper import AntelScraper
+from custom_components.antel_consumo.antel_pkg.antel_scraper import AntelScraper
 
 
 def load_env_file(path: Path) -> None:
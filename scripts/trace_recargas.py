@@ -26,46 +26,45 @@ async def main():
         raise SystemExit("Missing ANTEL_USER/ANTEL_PASS in .env")
 
     scraper = AntelScraper(username, password)
-    browser = await scraper._ensure_browser()
-    context = await browser.new_context(viewport={"width": 1280, "height": 720})
-    page = await context.new_page()
-
-    hits = []
-
-    async def handle_response(response):
-        try:
-            ct = response.headers.get("content-type", "")
-            if "json" in ct or "text" in ct:
-                body = await response.text()
-                if re.search(r"recarg|saldo|me quedan", body, re.IGNORECASE):
-                    hits.append((response.url, body[:500]))
-        except Exception:
-            pass
-
-    page.on("response", lambda resp: asyncio.create_task(handle_response(resp)))
-
+    # The backend releases the context; a persistent profile keeps it open
+    context_scope = scraper.browser_context(viewport={"width": 1280, "height": 720})
     try:
-        print("Logging in...")
-        await scraper._login(page)
-        print("Login OK. Navigating to dashboard...")
-        await page.goto(f"{ANTEL_BASE_URL}/dashboard/inicio", wait_until="domcontentloaded", timeout=120000)
-        await asyncio.sleep(3)
-
-        print("Navigating to consumo internet...")
-        await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="domcontentloaded", timeout=120000)
-        await asyncio.sleep(5)
-
-        print("\nMatches (recarg/saldo/me quedan) from network responses:")
-        if hits:
-            for url, snippet in hits[:10]:
-                print("-", url)
-                print(snippet)
-                print("---")
-        else:
-            print("No matches found in network responses.")
-
+        async with context_scope as context:
+            page = await context.new_page()
+
+            hits = []
+
+            async def handle_response(response):
+                try:
+                    ct = response.headers.get("content-type", "")
+                    if "json" in ct or "text" in ct:
+                        body = await response.text()
+                        if re.search(r"recarg|saldo|me quedan", body, re.IGNORECASE):
+                            hits.append((response.url, body[:500]))
+                except Exception:
+                    pass
+
+            page.on("response", lambda resp: asyncio.create_task(handle_response(resp)))
+
+            print("Logging in...")
+            await scraper._login(page)
+            print("Login OK. Navigating to dashboard...")
+            await page.goto(f"{ANTEL_BASE_URL}/dashboard/inicio", wait_until="domcontentloaded", timeout=120000)
+            await asyncio.sleep(3)
+
+            print("Navigating to consumo internet...")
+            await page.goto(ANTEL_CONSUMO_INTERNET_URL, wait_until="domcontentloaded", timeout=120000)
+            await asyncio.sleep(5)
+
+            print("\nMatches (recarg/saldo/me quedan) from network responses:")
+            if hits:
+                for url, snippet in hits[:10]:
+                    print("-", url)
+                    print(snippet)
+                    print("---")
+            else:
+                print("No matches found in network responses.")
     finally:
-        await context.close()
         await scraper.close()
 
 
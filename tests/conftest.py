@@ -0,0 +1,5 @@
+"""Make the shared antel_pkg importable without Home Assistant."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "custom_components" / "antel_consumo"))
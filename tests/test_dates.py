@@ -0,0 +1,35 @@
+"""Year inference of the Spanish date parser."""
+from datetime import date
+
+from antel_pkg.dates import parse_cycle, parse_date, parse_date_after, parse_date_before
+
+
+def test_explicit_year_is_kept():
+    assert parse_date("Vence el 15 de febrero de 2026", date(2025, 1, 1)) == date(2026, 2, 15)
+    assert parse_date("15/02/26", date(2025, 1, 1)) == date(2026, 2, 15)
+    assert parse_date("2026-02-15", date(2025, 1, 1)) == date(2026, 2, 15)
+
+
+def test_missing_year_is_the_nearest_one():
+    assert parse_date("Vence el 5 de enero", date(2025, 12, 20)) == date(2026, 1, 5)
+    assert parse_date("31 de diciembre", date(2026, 1, 3)) == date(2025, 12, 31)
+    assert parse_date("12 set.", date(2026, 9, 1)) == date(2026, 9, 12)
+
+
+def test_cycle_spanning_the_new_year():
+    assert parse_cycle("15 de diciembre al 14 de enero", date(2026, 1, 3)) == (
+        date(2025, 12, 15),
+        date(2026, 1, 14),
+    )
+    assert parse_cycle("del 1/3 al 31/3", date(2026, 3, 10)) == (
+        date(2026, 3, 1),
+        date(2026, 3, 31),
+    )
+
+
+def test_anchored_dates_do_not_depend_on_today():
+    assert parse_date_after("20 de marzo", date(2026, 3, 1)) == date(2026, 3, 20)
+    assert parse_date_after("20 de marzo", date(2026, 3, 20)) == date(2026, 3, 20)
+    assert parse_date_after("5 de enero", date(2025, 12, 28)) == date(2026, 1, 5)
+    assert parse_date_before("28 de diciembre", date(2026, 1, 2)) == date(2025, 12, 28)
+    assert parse_date_before("29 de febrero", date(2026, 3, 1)) == date(2024, 2, 29)
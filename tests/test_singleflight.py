@@ -0,0 +1,87 @@
+"""Sharing and cancellation of in-flight calls."""
+import asyncio
+
+import pytest
+
+from antel_pkg.singleflight import SingleFlight
+
+
+class Call:
+    """A call that runs until released, recording whether it was cancelled."""
+
+    def __init__(self):
+        self.started = 0
+        self.cancelled = False
+        self.running = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.started += 1
+        self.running.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "data"
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flight, call = SingleFlight(), Call()
+        first = asyncio.ensure_future(flight.async_do("key", call))
+        second = asyncio.ensure_future(flight.async_do("key", call))
+        await call.running.wait()
+        call.release.set()
+        assert await first == ("data", False)
+        assert await second == ("data", True)
+        assert call.started == 1
+        assert flight.inflight("key") is None
+        assert flight.fresh("key", 60) == "data"
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_call_to_the_others():
+    async def scenario():
+        flight, call = SingleFlight(), Call()
+        first = asyncio.ensure_future(flight.async_do("key", call))
+        second = asyncio.ensure_future(flight.async_do("key", call))
+        await call.running.wait()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        call.release.set()
+        assert await second == ("data", True)
+        assert not call.cancelled
+
+    asyncio.run(scenario())
+
+
+def test_last_waiter_leaving_cancels_the_call():
+    async def scenario():
+        flight, call = SingleFlight(), Call()
+        waiter = asyncio.ensure_future(flight.async_do("key", call))
+        await call.running.wait()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+        assert call.cancelled
+        assert flight.inflight("key") is None
+
+    asyncio.run(scenario())
+
+
+def test_async_cancel_waits_for_the_call_to_stop():
+    async def scenario():
+        flight, call = SingleFlight(), Call()
+        waiter = asyncio.ensure_future(flight.async_do("key", call))
+        await call.running.wait()
+        await flight.async_cancel("key")
+        assert call.cancelled
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert flight.fresh("key", 60) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,41 @@
+"""Running sum of the hourly usage samples."""
+import asyncio
+
+from antel_pkg.antel_scraper import AntelConsumoData
+from antel_pkg.statistics import HOUR, UsageSamples
+
+START = 1_767_225_600  # 2026-01-01T00:00:00Z
+
+
+def record(samples, hour, used, topup=None):
+    data = AntelConsumoData(used_data_gb=used, topup_balance_gb=topup, fetched_at=START + hour * HOUR + 60)
+    asyncio.run(samples.async_record(data))
+
+
+def test_sum_grows_across_a_cycle_renewal():
+    samples = UsageSamples()
+    record(samples, 0, 10.0)
+    record(samples, 1, 15.0)
+    record(samples, 2, 2.0)  # renewed: the whole new value is usage
+    record(samples, 3, 4.0)
+    assert [sample["sum"] for sample in samples.samples] == [0.0, 5.0, 7.0, 9.0]
+
+
+def test_topup_decreases_count_as_usage():
+    samples = UsageSamples()
+    record(samples, 0, 10.0, topup=5.0)
+    record(samples, 1, 10.0, topup=3.5)
+    record(samples, 2, 11.0, topup=8.0)  # bought more: not usage
+    assert [sample["sum"] for sample in samples.samples] == [0.0, 1.5, 2.5]
+
+
+def test_same_hour_replaces_and_is_exported_again():
+    samples = UsageSamples()
+    record(samples, 0, 10.0)
+    record(samples, 1, 12.0)
+    asyncio.run(samples.async_mark_exported(samples.pending()))
+    assert samples.pending() == []
+
+    record(samples, 1, 13.0)
+    assert [sample["sum"] for sample in samples.samples] == [0.0, 3.0]
+    assert [sample["start"] for sample in samples.pending()] == [START + HOUR]
@@ -0,0 +1,78 @@
+"""Incremental top-up sync and expiry."""
+import asyncio
+from datetime import date
+
+from antel_pkg.antel_scraper import AntelConsumoData
+from antel_pkg.backends import FetchResult
+from antel_pkg.const import ANTEL_RECARGAS_URL
+from antel_pkg.topups import TopupStore, TopupSync
+
+
+def row(key, purchased, amount, remaining, expires):
+    return (
+        f'<tr data-rk="{key}"><td>{purchased}</td><td>{amount} GB</td>'
+        f"<td>Me quedan {remaining} GB</td><td>Vence el {expires}</td></tr>"
+    )
+
+
+class FakeBackend:
+    """Serve a fixed recargas view."""
+
+    def __init__(self, *rows):
+        self.html = "<table>" + "".join(rows) + "</table>"
+        self.fetches = 0
+
+    async def fetch(self, url, storage_state=None, timeout=30000, **kwargs):
+        self.fetches += 1
+        return FetchResult(200, ANTEL_RECARGAS_URL, self.html, {})
+
+
+def sync(topups, today):
+    data = AntelConsumoData(topup_balance_gb=1.0)
+    return asyncio.run(topups.async_sync({}, data, today))
+
+
+def test_new_rows_are_added_and_active_ones_refreshed():
+    backend = FakeBackend(
+        row("t2", "10 de marzo", 5, 3, "20 de marzo"),
+        row("t1", "1 de marzo", 2, 2, "15 de marzo"),
+    )
+    topups = TopupSync(backend, TopupStore(), max_age=-1)
+    assert [entry["id"] for entry in sync(topups, date(2026, 3, 12))] == ["t2", "t1"]
+    assert [entry["expires_on"] for entry in topups.active(date(2026, 3, 12))] == [
+        "2026-03-15",
+        "2026-03-20",
+    ]
+
+    backend.html = "<table>" + "".join(
+        [
+            row("t3", "16 de marzo", 10, 10, "16 de abril"),
+            row("t2", "10 de marzo", 5, 1, "20 de marzo"),
+            row("t1", "1 de marzo", 2, 0, "15 de marzo"),
+        ]
+    ) + "</table>"
+    assert [entry["id"] for entry in sync(topups, date(2026, 3, 16))] == ["t3"]
+    entries = {entry["id"]: entry for entry in topups.store.entries}
+    assert entries["t2"]["remaining_gb"] == 1.0
+    # Expired before this sync, so not refreshed
+    assert entries["t1"]["remaining_gb"] == 2.0
+    assert [entry["id"] for entry in topups.active(date(2026, 3, 16))] == ["t2", "t3"]
+
+
+def test_expired_topups_stay_expired():
+    backend = FakeBackend(row("t1", "1 de marzo", 2, 2, "15 de marzo"))
+    topups = TopupSync(backend, TopupStore(), max_age=-1)
+    sync(topups, date(2026, 3, 2))
+    assert topups.active(date(2026, 3, 15))
+    assert not topups.active(date(2026, 3, 16))
+    # A year-less expiry parsed against a later today would be next March
+    assert not topups.active(date(2026, 12, 1))
+
+
+def test_expiring_topups_are_alerted_once():
+    backend = FakeBackend(row("t1", "1 de marzo", 2, 2, "15 de marzo"))
+    topups = TopupSync(backend, TopupStore(), max_age=-1)
+    sync(topups, date(2026, 3, 2))
+    assert asyncio.run(topups.async_pop_expiring(date(2026, 3, 10))) == []
+    assert [entry["id"] for entry in asyncio.run(topups.async_pop_expiring(date(2026, 3, 13)))] == ["t1"]
+    assert asyncio.run(topups.async_pop_expiring(date(2026, 3, 14))) == []